@@ -0,0 +1,24 @@
+from django.contrib import admin
+from django.utils import timezone
+from .models import Task
+
+
+@admin.register(Task)
+class TaskAdmin(admin.ModelAdmin):
+    list_display = ['name', 'status', 'attempts', 'max_attempts', 'run_after', 'created_at', 'finished_at']
+    list_filter = ['status', 'name']
+    search_fields = ['name', 'idempotency_key']
+    readonly_fields = ['created_at', 'finished_at', 'locked_at', 'last_error']
+    ordering = ['-created_at']
+    show_full_result_count = False
+    actions = ['retry_tasks']
+
+    @admin.action(description='Повторити задачі')
+    def retry_tasks(self, request, queryset):
+        count = queryset.exclude(status=Task.RUNNING).update(
+            status=Task.PENDING,
+            attempts=0,
+            run_after=timezone.now(),
+            finished_at=None,
+        )
+        self.message_user(request, f'{count} задач повернуто в чергу')
@@ -0,0 +1,12 @@
+from django.apps import AppConfig
+
+
+class CoreConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.core'
+    verbose_name = 'Ядро'
+
+    def ready(self):
+        # Реєстрація фонових задач з модулів tasks.py усіх застосунків
+        from django.utils.module_loading import autodiscover_modules
+        autodiscover_modules('tasks')
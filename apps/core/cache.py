@@ -0,0 +1,237 @@
+"""
+Дворівневий кеш для даних форуму.
+
+Перший рівень - обмежений LRU у пам'яті процесу з коротким часом життя записів
+(LOCAL_CACHE_TIMEOUT): гарячі ключі читаються без звернення до мережі. Другий -
+спільний кеш Django (CACHES['default']: Redis, Memcached або файловий), один для всіх процесів.
+
+    category_cache = TieredCache('forum:categories', timeout=3600)
+    tree = category_cache.get_or_set('tree', build_category_tree)
+    category_cache.invalidate()
+
+Ключі версіонуються за простором імен: invalidate() змінює версію, і всі старі записи
+стають недосяжними без перебору ключів. Інші процеси бачать нову версію та видалені
+ключі не пізніше ніж через LOCAL_CACHE_TIMEOUT секунд (local_timeout=0 вимикає
+локальний рівень для даних, що мають оновлюватись одразу).
+
+get_or_set() захищає від "набігу" (stampede): при промаху значення обчислює один потік
+процесу, а між процесами - той, хто отримав короткий lock у спільному кеші; решта
+чекають на результат замість того, щоб одночасно рахувати те саме.
+
+Статистика влучань - get_stats() та лічильник метрик cache_requests_total.
+"""
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+
+from . import metrics
+
+_MISSING = object()
+
+# Скільки чекати на значення, яке обчислює інший процес, перш ніж рахувати самому
+LOCK_TIMEOUT = 10
+LOCK_POLL_INTERVAL = 0.05
+
+
+class LocalLRUCache:
+    """Потокобезпечний LRU з обмеженою кількістю записів і часом життя кожного запису"""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=_MISSING):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+            value, expires_at = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, timeout):
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + timeout)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+_local = None
+_local_lock = threading.Lock()
+# Смугасті блокування для single-flight у межах процесу (без словника блокувань на кожен ключ)
+_flight_locks = [threading.RLock() for _ in range(64)]
+_stats = {}
+_stats_lock = threading.Lock()
+
+
+def get_local_cache():
+    global _local
+    if _local is None:
+        with _local_lock:
+            if _local is None:
+                _local = LocalLRUCache(getattr(settings, 'LOCAL_CACHE_MAX_ENTRIES', 1000))
+    return _local
+
+
+def _record(namespace, result):
+    with _stats_lock:
+        counters = _stats.setdefault(namespace, {'local': 0, 'shared': 0, 'miss': 0})
+        counters[result] += 1
+    metrics.increment('cache_requests_total', namespace=namespace, result=result)
+
+
+def get_stats():
+    """{простір імен: {'local', 'shared', 'miss', 'hit_rate'}} для поточного процесу"""
+    with _stats_lock:
+        stats = {namespace: dict(counters) for namespace, counters in _stats.items()}
+    for counters in stats.values():
+        total = counters['local'] + counters['shared'] + counters['miss']
+        counters['hit_rate'] = (counters['local'] + counters['shared']) / total if total else 0.0
+    return stats
+
+
+def reset_stats():
+    with _stats_lock:
+        _stats.clear()
+
+
+class TieredCache:
+    """
+    Простір імен у дворівневому кеші.
+    timeout - час життя у спільному кеші, local_timeout - у пам'яті процесу
+    (за замовчуванням LOCAL_CACHE_TIMEOUT, 0 - без локального рівня).
+    """
+
+    def __init__(self, namespace, timeout=300, local_timeout=None):
+        self.namespace = namespace
+        self.timeout = timeout
+        self._local_timeout = local_timeout
+
+    @property
+    def local_timeout(self):
+        if self._local_timeout is not None:
+            return self._local_timeout
+        return getattr(settings, 'LOCAL_CACHE_TIMEOUT', 5)
+
+    @property
+    def version_key(self):
+        return f'{self.namespace}:version'
+
+    def get_version(self):
+        local = get_local_cache()
+        version = local.get(self.version_key)
+        if version is _MISSING:
+            version = cache.get(self.version_key)
+            if version is None:
+                # Версія - час у наносекундах: після витіснення з кешу не повториться стара
+                cache.add(self.version_key, time.time_ns(), None)
+                version = cache.get(self.version_key, 0)
+            local.set(self.version_key, version, getattr(settings, 'LOCAL_CACHE_TIMEOUT', 5))
+        return version
+
+    def make_key(self, key):
+        return f'{self.namespace}:{self.get_version()}:{key}'
+
+    def _get(self, full_key):
+        if self.local_timeout:
+            value = get_local_cache().get(full_key)
+            if value is not _MISSING:
+                _record(self.namespace, 'local')
+                return value
+        value = cache.get(full_key, _MISSING)
+        if value is not _MISSING:
+            _record(self.namespace, 'shared')
+            if self.local_timeout:
+                get_local_cache().set(full_key, value, self.local_timeout)
+        return value
+
+    def _set(self, full_key, value, timeout):
+        cache.set(full_key, value, self.timeout if timeout is None else timeout)
+        if self.local_timeout:
+            get_local_cache().set(full_key, value, self.local_timeout)
+
+    def get(self, key, default=None):
+        value = self._get(self.make_key(key))
+        if value is _MISSING:
+            _record(self.namespace, 'miss')
+            return default
+        return value
+
+    def set(self, key, value, timeout=None):
+        self._set(self.make_key(key), value, timeout)
+
+    def delete(self, key):
+        self.delete_many([key])
+
+    def delete_many(self, keys):
+        full_keys = [self.make_key(key) for key in keys]
+        if not full_keys:
+            return
+        cache.delete_many(full_keys)
+        local = get_local_cache()
+        for full_key in full_keys:
+            local.delete(full_key)
+
+    def invalidate(self):
+        """Скидає всі ключі простору імен (нова версія)"""
+        version = time.time_ns()
+        cache.set(self.version_key, version, None)
+        get_local_cache().set(self.version_key, version, getattr(settings, 'LOCAL_CACHE_TIMEOUT', 5))
+
+    def get_or_set(self, key, compute, timeout=None):
+        """Значення з кешу або compute(); при промаху обчислює лише один виконавець"""
+        full_key = self.make_key(key)
+        value = self._get(full_key)
+        if value is not _MISSING:
+            return value
+
+        with _flight_locks[zlib.crc32(full_key.encode()) % len(_flight_locks)]:
+            # Поки чекали на блокування, значення міг обчислити інший потік
+            value = self._get(full_key)
+            if value is not _MISSING:
+                return value
+            _record(self.namespace, 'miss')
+
+            lock_key = f'{full_key}:lock'
+            if not cache.add(lock_key, 1, LOCK_TIMEOUT):
+                value = self._wait_for(full_key)
+                if value is not _MISSING:
+                    return value
+            try:
+                value = compute()
+                self._set(full_key, value, timeout)
+            finally:
+                cache.delete(lock_key)
+            return value
+
+    def _wait_for(self, full_key):
+        """Чекає, поки інший процес запише значення; _MISSING, якщо не дочекались"""
+        deadline = time.monotonic() + LOCK_TIMEOUT
+        while time.monotonic() < deadline:
+            time.sleep(LOCK_POLL_INTERVAL)
+            value = cache.get(full_key, _MISSING)
+            if value is not _MISSING:
+                if self.local_timeout:
+                    get_local_cache().set(full_key, value, self.local_timeout)
+                return value
+        return _MISSING
@@ -0,0 +1,84 @@
+"""
+Обробка зображень (Pillow): мініатюри та зменшення завантажених картинок.
+
+Імена згенерованих файлів містять хеш вмісту, тому їх можна кешувати назавжди.
+Pillow імпортується при першій обробці: модуль завантажується під час старту процесу,
+а зображення обробляються лише при завантаженні файлу (зменшення в UploadImageStorage)
+та у фонових задачах (мініатюри аватарів).
+"""
+import hashlib
+import os
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+
+THUMBNAIL_QUALITY = 85
+# Формати, які downscale_image перекодовує без зміни формату (і розширення файлу)
+RESIZABLE_FORMATS = ('JPEG', 'PNG', 'WEBP')
+
+
+def get_thumbnail_format():
+    """WebP, якщо Pillow зібрано з його підтримкою, інакше JPEG"""
+    from PIL import features
+    return 'WEBP' if features.check('webp') else 'JPEG'
+
+
+def get_extension(image_format):
+    return {'WEBP': '.webp', 'JPEG': '.jpg', 'PNG': '.png', 'GIF': '.gif'}.get(image_format, '.jpg')
+
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()[:20]
+
+
+def hashed_name(directory, data, extension, suffix=''):
+    """directory/<хеш вмісту><suffix><extension>"""
+    return os.path.join(directory, f'{content_hash(data)}{suffix}{extension}')
+
+
+def _encode(image, image_format):
+    if image_format == 'JPEG' and image.mode not in ('RGB', 'L'):
+        image = image.convert('RGB')
+    buffer = BytesIO()
+    image.save(buffer, format=image_format, quality=THUMBNAIL_QUALITY, optimize=True)
+    return buffer.getvalue()
+
+
+def make_square_thumbnail(file, size, image_format=None):
+    """Квадратна мініатюра size x size з обрізанням по центру. Повертає байти"""
+    from PIL import Image, ImageOps
+    image_format = image_format or get_thumbnail_format()
+    file.seek(0)
+    with Image.open(file) as image:
+        image = ImageOps.exif_transpose(image)
+        if image.mode not in ('RGB', 'RGBA', 'L'):
+            image = image.convert('RGBA')
+        thumbnail = ImageOps.fit(image, (size, size), Image.Resampling.LANCZOS)
+        return _encode(thumbnail, image_format)
+
+
+def downscale_image(file, max_size):
+    """
+    Зменшує зображення до max_size по більшій стороні зі збереженням формату.
+    Повертає байти або None, якщо зменшувати не потрібно, зображення анімоване
+    або його формат не перекодовується (не JPEG/PNG/WEBP): інакше вміст
+    не відповідав би розширенню файлу.
+    """
+    from PIL import Image, ImageOps
+    file.seek(0)
+    with Image.open(file) as image:
+        if getattr(image, 'is_animated', False):
+            return None
+        image_format = image.format
+        if image_format not in RESIZABLE_FORMATS or max(image.size) <= max_size:
+            return None
+        image = ImageOps.exif_transpose(image)
+        image.thumbnail((max_size, max_size), Image.Resampling.LANCZOS)
+        return _encode(image, image_format)
+
+
+def save_bytes(storage, name, data):
+    """Зберігає байти під заданим (хешованим) ім'ям; однаковий вміст не записується вдруге"""
+    if storage.exists(name):
+        return name
+    return storage.save(name, ContentFile(data))
@@ -0,0 +1,111 @@
+import json
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Виконується в окремому процесі під "python -X importtime": завантаження WSGI-застосунку
+# (як воркер gunicorn без preload) і два запити до нього
+BOOT_SCRIPT = '''
+import io, json, os, sys, time
+from wsgiref.util import setup_testing_defaults
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+os.environ['WARMUP_ON_STARTUP'] = sys.argv[1]
+started = time.perf_counter()
+from config.wsgi import application
+loaded = time.perf_counter()
+
+def request():
+    environ = {'PATH_INFO': sys.argv[2], 'HTTP_HOST': sys.argv[3], 'wsgi.input': io.BytesIO()}
+    setup_testing_defaults(environ)
+    status = []
+    began = time.perf_counter()
+    body = application(environ, lambda code, headers: status.append(code))
+    for _ in body:
+        pass
+    getattr(body, 'close', lambda: None)()
+    return time.perf_counter() - began, status[0]
+
+first, status = request()
+second, _ = request()
+print(json.dumps({'load': loaded - started, 'first': first, 'second': second, 'status': status}))
+'''
+
+
+class Command(BaseCommand):
+    help = ('Час старту процесу: імпорти (python -X importtime), завантаження WSGI-застосунку '
+            'та перший запит, з прогрівом (apps.core.warmup) і без нього')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=3)
+        parser.add_argument('--path', default='/', help='URL першого запиту')
+        parser.add_argument('--top', type=int, default=15, help='Скільки модулів та пакетів показувати')
+
+    def get_host(self):
+        for host in settings.ALLOWED_HOSTS:
+            if host != '*':
+                return host.lstrip('.')
+        return 'localhost'
+
+    def boot(self, warm_up, path):
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', BOOT_SCRIPT, str(warm_up), path, self.get_host()],
+            cwd=settings.BASE_DIR, capture_output=True, text=True,
+        )
+        lines = result.stdout.strip().splitlines()
+        if result.returncode or not lines:
+            raise CommandError(f'Процес завершився з помилкою:\n{result.stderr[-2000:]}')
+        return json.loads(lines[-1]), self.parse_importtime(result.stderr)
+
+    def parse_importtime(self, stderr):
+        """[(модуль, власний час, сумарний час)] у мікросекундах"""
+        modules = []
+        for line in stderr.splitlines():
+            if not line.startswith('import time:') or 'self [us]' in line:
+                continue
+            self_us, cumulative_us, name = line[len('import time:'):].split('|')
+            modules.append((name.strip(), int(self_us), int(cumulative_us)))
+        return modules
+
+    def handle(self, *args, **options):
+        results = {}
+        modules = []
+        for warm_up in (False, True):
+            runs = []
+            for _ in range(options['runs']):
+                timings, modules = self.boot(warm_up, options['path'])
+                runs.append(timings)
+            results[warm_up] = {key: statistics.median(run[key] for run in runs)
+                                for key in ('load', 'first', 'second')}
+            results[warm_up]['status'] = runs[-1]['status']
+
+        total = sum(self_us for _, self_us, _ in modules)
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f'Імпорти: {len(modules)} модулів, {total / 1000:.0f} мс (останній запуск)'
+        ))
+        packages = defaultdict(int)
+        for name, self_us, _ in modules:
+            packages[name.split('.')[0]] += self_us
+        for package, self_us in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:options['top']]:
+            self.stdout.write(f'{self_us / 1000:8.1f} мс  {package}')
+
+        self.stdout.write(self.style.MIGRATE_HEADING('\nМодулі за власним часом імпорту'))
+        for name, self_us, cumulative_us in sorted(modules, key=lambda item: item[1], reverse=True)[:options['top']]:
+            self.stdout.write(f'{self_us / 1000:8.1f} мс (разом {cumulative_us / 1000:6.1f} мс)  {name}')
+
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f'\nСтарт і запити до {options["path"]} (медіана з {options["runs"]})'
+        ))
+        for warm_up, timings in results.items():
+            self.stdout.write(
+                f'{"з прогрівом" if warm_up else "без прогріву":>13}: завантаження {timings["load"] * 1000:.0f} мс, '
+                f'перший запит {timings["first"] * 1000:.0f} мс, другий {timings["second"] * 1000:.0f} мс '
+                f'(HTTP {timings["status"]})'
+            )
+        cold, warm = results[False], results[True]
+        self.stdout.write(self.style.SUCCESS(
+            f'Перший запит з прогрівом швидший на {(cold["first"] - warm["first"]) * 1000:.0f} мс'
+        ))
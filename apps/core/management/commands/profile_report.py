@@ -0,0 +1,105 @@
+import pstats
+import re
+import shutil
+import statistics
+from collections import Counter
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.profiling import get_profile_dir, short_path
+
+ELAPSED_RE = re.compile(r'-(\d+)ms\.')
+
+
+class Command(BaseCommand):
+    help = ('Зведення профілів запитів (ProfilingMiddleware): гарячі функції по кожному '
+            'представленню за всіма збереженими профілями')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--view', help='Лише представлення, назва яких містить цей рядок')
+        parser.add_argument('--limit', type=int, default=20, help='Скільки функцій показувати')
+        parser.add_argument('--sort', choices=['tottime', 'cumtime'], default='tottime',
+                            help='Сортування для cProfile: власний або сумарний час')
+        parser.add_argument('--flamegraph', metavar='PATH',
+                            help='Записати об\'єднані згорнуті стеки (sampling) для flamegraph.pl/speedscope')
+        parser.add_argument('--clear', action='store_true', help='Видалити вибрані профілі')
+
+    def handle(self, *args, **options):
+        root = get_profile_dir()
+        directories = sorted(path for path in root.glob('*') if path.is_dir()) if root.exists() else []
+        if options['view']:
+            directories = [path for path in directories if options['view'] in path.name]
+        if not directories:
+            raise CommandError(f'Профілів не знайдено у {root}')
+
+        if options['clear']:
+            for directory in directories:
+                shutil.rmtree(directory)
+            self.stdout.write(self.style.SUCCESS(f'Видалено профілі представлень: {len(directories)}'))
+            return
+
+        folded_total = Counter()
+        for directory in directories:
+            prof_files = sorted(directory.glob('*.prof'))
+            folded_files = sorted(directory.glob('*.folded'))
+            elapsed = [int(match.group(1)) for match in map(ELAPSED_RE.search, (
+                path.name for path in prof_files + folded_files)) if match]
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f'\n{directory.name}: профілів {len(prof_files) + len(folded_files)}'
+                + (f', медіана {statistics.median(elapsed):.0f} мс, макс. {max(elapsed)} мс' if elapsed else '')
+            ))
+            if prof_files:
+                self.report_cprofile(prof_files, options['sort'], options['limit'])
+            if folded_files:
+                stacks = self.read_folded(folded_files)
+                folded_total.update(stacks)
+                self.report_sampling(stacks, options['limit'])
+
+        if options['flamegraph']:
+            if not folded_total:
+                raise CommandError('Немає профілів режиму sampling для flamegraph')
+            with open(options['flamegraph'], 'w') as output:
+                for stack, count in folded_total.most_common():
+                    output.write(f'{stack} {count}\n')
+            self.stdout.write(self.style.SUCCESS(f'Згорнуті стеки записано у {options["flamegraph"]}'))
+
+    def report_cprofile(self, files, sort, limit):
+        stats = pstats.Stats(*map(str, files))
+        # stats.stats: (файл, рядок, функція) -> (примітивні виклики, виклики, tottime, cumtime, ...)
+        rows = sorted(
+            stats.stats.items(),
+            key=lambda item: item[1][2] if sort == 'tottime' else item[1][3],
+            reverse=True,
+        )[:limit]
+        per_request = len(files)
+        self.stdout.write(f'{"tottime, мс":>12} {"cumtime, мс":>12} {"викликів":>10}  функція (на запит)')
+        for (filename, line, name), (_, calls, tottime, cumtime, _) in rows:
+            # Вбудовані функції pstats позначає файлом "~"
+            label = name if filename == '~' else f'{name} ({short_path(filename)}:{line})'
+            self.stdout.write(
+                f'{tottime * 1000 / per_request:12.2f} {cumtime * 1000 / per_request:12.2f} '
+                f'{calls // per_request:10d}  {label}'
+            )
+
+    def read_folded(self, files):
+        stacks = Counter()
+        for path in files:
+            with open(path) as source:
+                for line in source:
+                    stack, _, count = line.rstrip('\n').rpartition(' ')
+                    if stack:
+                        stacks[stack] += int(count)
+        return stacks
+
+    def report_sampling(self, stacks, limit):
+        total = sum(stacks.values())
+        own, inclusive = Counter(), Counter()
+        for stack, count in stacks.items():
+            frames = stack.split(';')
+            own[frames[-1]] += count
+            # Рекурсивна функція рахується у стеку один раз
+            for frame in set(frames):
+                inclusive[frame] += count
+        self.stdout.write(f'{"власний, %":>10} {"сумарний, %":>12}  функція (семплів: {total})')
+        for frame, count in own.most_common(limit):
+            self.stdout.write(f'{count * 100 / total:10.1f} {inclusive[frame] * 100 / total:12.1f}  {frame}')
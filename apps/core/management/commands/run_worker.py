@@ -0,0 +1,65 @@
+import signal
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from apps.core import taskqueue
+
+
+class Command(BaseCommand):
+    help = 'Запуск воркера фонових задач (бекенд черги "database")'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=1, help='Кількість потоків виконання')
+        parser.add_argument('--batch-size', type=int, default=10, help='Скільки задач брати за раз')
+        parser.add_argument('--sleep', type=float, default=1.0, help='Пауза (с), коли черга порожня')
+        parser.add_argument('--stale-timeout', type=int, default=600,
+                            help='Через скільки секунд задача в статусі "running" вважається зависшою')
+        parser.add_argument('--once', action='store_true', help='Обробити готові задачі та вийти')
+
+    def handle(self, *args, **options):
+        self.running = True
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+        concurrency = max(1, options['concurrency'])
+        stale_timeout = timedelta(seconds=options['stale_timeout'])
+        executor = ThreadPoolExecutor(max_workers=concurrency) if concurrency > 1 else None
+
+        self.stdout.write(self.style.SUCCESS(f'Воркер запущено (потоків: {concurrency})'))
+        try:
+            while self.running:
+                close_old_connections()
+                requeued = taskqueue.requeue_stale_tasks(stale_timeout)
+                if requeued:
+                    self.stdout.write(self.style.WARNING(f'Повернуто в чергу зависших задач: {requeued}'))
+
+                tasks = taskqueue.claim_tasks(options['batch_size'])
+                if tasks:
+                    if executor:
+                        results = list(executor.map(self.run_claimed, tasks))
+                    else:
+                        results = [self.run_claimed(item) for item in tasks]
+                    failed = results.count(False)
+                    self.stdout.write(f'Виконано задач: {len(results) - failed}, з помилкою: {failed}')
+                elif options['once']:
+                    break
+                else:
+                    time.sleep(options['sleep'])
+        finally:
+            if executor:
+                executor.shutdown(wait=True)
+        self.stdout.write(self.style.SUCCESS('Воркер зупинено'))
+
+    def run_claimed(self, item):
+        try:
+            return taskqueue.execute_claimed(item)
+        finally:
+            close_old_connections()
+
+    def stop(self, signum, frame):
+        # Дочекатись завершення поточних задач і вийти
+        self.running = False
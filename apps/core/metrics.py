@@ -0,0 +1,215 @@
+"""
+Прості метрики процесу: лічильники та гістограми.
+
+Метрики зберігаються в пам'яті процесу та ідентифікуються назвою і набором міток.
+
+Кілька процесів (воркери gunicorn): якщо задано METRICS_DIR, кожен процес не частіше
+ніж раз на METRICS_FLUSH_INTERVAL секунд записує знімок своїх метрик у файл <pid>.json,
+а collect() підсумовує знімки всіх процесів. Знімки завершених процесів зливаються
+в archive.json, тож лічильники не зменшуються після перезапуску воркера.
+Каталог слід очищати при старті сервера, інакше лічильники продовжаться з минулого запуску.
+"""
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from pathlib import Path
+
+from django.conf import settings
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# Межі кошиків гістограм за замовчуванням (секунди)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+ARCHIVE_FILE = 'archive.json'
+
+_lock = threading.Lock()
+_counters = defaultdict(float)
+_histograms = {}
+_started_at = time.time()
+_last_flush = 0.0
+
+
+def _key(name, labels):
+    return name, tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def increment(name, value=1, **labels):
+    """Збільшує лічильник name з мітками labels"""
+    with _lock:
+        _counters[_key(name, labels)] += value
+
+
+def observe(name, value, buckets=DEFAULT_BUCKETS, **labels):
+    """Додає спостереження value до гістограми name з мітками labels"""
+    key = _key(name, labels)
+    with _lock:
+        histogram = _histograms.get(key)
+        if histogram is None:
+            # Лічильники по кошиках (останній - +Inf), сума та кількість спостережень
+            histogram = _histograms[key] = {'buckets': list(buckets), 'counts': [0] * (len(buckets) + 1),
+                                            'sum': 0.0, 'count': 0}
+        histogram['counts'][bisect_left(histogram['buckets'], value)] += 1
+        histogram['sum'] += value
+        histogram['count'] += 1
+
+
+def get_counters():
+    """Знімок лічильників: {(назва, ((мітка, значення), ...)): значення}"""
+    with _lock:
+        return dict(_counters)
+
+
+def get_histograms():
+    """Знімок гістограм: {(назва, мітки): {'buckets', 'counts', 'sum', 'count'}}"""
+    with _lock:
+        return {key: dict(histogram, counts=list(histogram['counts'])) for key, histogram in _histograms.items()}
+
+
+def reset():
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
+
+
+def _reset_after_fork():
+    """Дочірній процес (воркер після fork з preload_app) починає з власних порожніх метрик"""
+    global _lock, _started_at, _last_flush
+    _lock = threading.Lock()
+    _counters.clear()
+    _histograms.clear()
+    _started_at = time.time()
+    _last_flush = 0.0
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def get_max_rss():
+    """Пікове використання пам'яті процесом (байти) або None"""
+    if resource is None:
+        return None
+    # Linux повертає кілобайти
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def snapshot():
+    """Метрики процесу у вигляді, придатному для JSON"""
+    return {
+        'pid': os.getpid(),
+        'started_at': _started_at,
+        'max_rss': get_max_rss(),
+        'counters': [[name, list(labels), value] for (name, labels), value in get_counters().items()],
+        'histograms': [[name, list(labels), histogram] for (name, labels), histogram in get_histograms().items()],
+    }
+
+
+def get_metrics_dir():
+    directory = getattr(settings, 'METRICS_DIR', '')
+    return Path(directory) if directory else None
+
+
+def _write_json(path, data):
+    temporary = path.with_name(f'.{path.name}.{threading.get_ident()}.tmp')
+    with open(temporary, 'w') as output:
+        json.dump(data, output)
+    os.replace(temporary, path)
+
+
+def flush():
+    """Записує знімок процесу в METRICS_DIR/<pid>.json"""
+    global _last_flush
+    directory = get_metrics_dir()
+    if directory is None:
+        return
+    directory.mkdir(parents=True, exist_ok=True)
+    _write_json(directory / f'{os.getpid()}.json', snapshot())
+    _last_flush = time.monotonic()
+
+
+def maybe_flush():
+    """flush(), якщо з попереднього минуло METRICS_FLUSH_INTERVAL секунд"""
+    if time.monotonic() - _last_flush >= getattr(settings, 'METRICS_FLUSH_INTERVAL', 5):
+        flush()
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def merge(snapshots):
+    """Сума лічильників і гістограм кількох знімків у форматі snapshot()"""
+    counters = defaultdict(float)
+    histograms = {}
+    for data in snapshots:
+        for name, labels, value in data['counters']:
+            counters[(name, tuple(map(tuple, labels)))] += value
+        for name, labels, histogram in data['histograms']:
+            key = (name, tuple(map(tuple, labels)))
+            total = histograms.get(key)
+            if total is None or total['buckets'] != histogram['buckets']:
+                histograms[key] = dict(histogram, counts=list(histogram['counts']))
+                continue
+            total['counts'] = [a + b for a, b in zip(total['counts'], histogram['counts'])]
+            total['sum'] += histogram['sum']
+            total['count'] += histogram['count']
+    return {
+        'pid': None,
+        'counters': [[name, list(labels), value] for (name, labels), value in counters.items()],
+        'histograms': [[name, list(labels), histogram] for (name, labels), histogram in histograms.items()],
+    }
+
+
+def _archive_dead(directory):
+    """Зливає знімки завершених процесів у archive.json (під файловим блокуванням)"""
+    if fcntl is None:
+        return
+    with open(directory / '.lock', 'w') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        dead = [path for path in directory.glob('*.json')
+                if path.stem.isdigit() and int(path.stem) != os.getpid() and not _pid_alive(int(path.stem))]
+        if not dead:
+            return
+        archive_path = directory / ARCHIVE_FILE
+        snapshots = [json.loads(archive_path.read_text())] if archive_path.exists() else []
+        snapshots += [json.loads(path.read_text()) for path in dead]
+        _write_json(archive_path, merge(snapshots))
+        for path in dead:
+            path.unlink(missing_ok=True)
+
+
+def collect():
+    """
+    Знімки метрик усіх процесів: список snapshot() живих процесів та архіву
+    (без METRICS_DIR - лише поточного процесу).
+    """
+    directory = get_metrics_dir()
+    if directory is None:
+        return [snapshot()]
+    flush()
+    _archive_dead(directory)
+    snapshots = []
+    for path in sorted(directory.glob('*.json')):
+        try:
+            snapshots.append(json.loads(path.read_text()))
+        except (OSError, ValueError):
+            # Файл міг зникнути або бути перезаписаним між glob() та читанням
+            continue
+    return snapshots
@@ -0,0 +1,38 @@
+# Generated by Django 6.0 on 2026-10-19 04:20
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Task',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=200, verbose_name='Назва задачі')),
+                ('payload', models.JSONField(blank=True, default=dict, verbose_name='Параметри')),
+                ('status', models.CharField(choices=[('pending', 'Очікує'), ('running', 'Виконується'), ('done', 'Виконано'), ('failed', 'Помилка')], default='pending', max_length=20, verbose_name='Статус')),
+                ('idempotency_key', models.CharField(blank=True, max_length=255, null=True, unique=True, verbose_name='Ключ ідемпотентності')),
+                ('attempts', models.PositiveIntegerField(default=0, verbose_name='Спроб')),
+                ('max_attempts', models.PositiveIntegerField(default=5, verbose_name='Максимум спроб')),
+                ('run_after', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Виконати після')),
+                ('locked_at', models.DateTimeField(blank=True, null=True, verbose_name='Взято в роботу')),
+                ('last_error', models.TextField(blank=True, verbose_name='Остання помилка')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Створено')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Завершено')),
+            ],
+            options={
+                'verbose_name': 'Фонова задача',
+                'verbose_name_plural': 'Фонові задачі',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'run_after'], name='core_task_status_612c52_idx')],
+            },
+        ),
+    ]
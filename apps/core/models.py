@@ -0,0 +1,46 @@
+from django.db import models
+from django.utils import timezone
+
+
+class Task(models.Model):
+    """Фонова задача в черзі (див. apps.core.taskqueue)"""
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+
+    STATUS_CHOICES = [
+        (PENDING, 'Очікує'),
+        (RUNNING, 'Виконується'),
+        (DONE, 'Виконано'),
+        (FAILED, 'Помилка'),
+    ]
+
+    name = models.CharField(max_length=200, verbose_name="Назва задачі")
+    payload = models.JSONField(default=dict, blank=True, verbose_name="Параметри")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=PENDING, verbose_name="Статус")
+    idempotency_key = models.CharField(
+        max_length=255,
+        unique=True,
+        null=True,
+        blank=True,
+        verbose_name="Ключ ідемпотентності"
+    )
+    attempts = models.PositiveIntegerField(default=0, verbose_name="Спроб")
+    max_attempts = models.PositiveIntegerField(default=5, verbose_name="Максимум спроб")
+    run_after = models.DateTimeField(default=timezone.now, verbose_name="Виконати після")
+    locked_at = models.DateTimeField(null=True, blank=True, verbose_name="Взято в роботу")
+    last_error = models.TextField(blank=True, verbose_name="Остання помилка")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Створено")
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name="Завершено")
+
+    class Meta:
+        verbose_name = "Фонова задача"
+        verbose_name_plural = "Фонові задачі"
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'run_after']),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.get_status_display()})"
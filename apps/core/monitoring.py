@@ -0,0 +1,207 @@
+"""
+Перевірки стану та метрики процесу.
+
+HealthCheckMiddleware стоїть першим у MIDDLEWARE і відповідає сам, не передаючи запит
+далі (без сесій, автентифікації та перевірки ALLOWED_HOSTS):
+- /healthz - процес живий, без звернень до БД;
+- /readyz - доступні БД та кеш (503, якщо ні);
+- /metrics - метрики у форматі Prometheus, підсумовані по всіх воркерах (METRICS_DIR);
+  лише з METRICS_ENABLED=True та заголовком "Authorization: Bearer <METRICS_TOKEN>"
+  (без токена ендпоінт відкритий тільки при DEBUG=True).
+
+RequestMetricsMiddleware рахує для кожного запиту час відповіді та кількість SQL-запитів
+за іменем маршруту (forum:topic_detail).
+"""
+import json
+import logging
+import platform
+import time
+from hmac import compare_digest
+
+import django
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from django.http import HttpResponse
+
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+METRIC_PREFIX = 'forum_'
+QUERY_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+
+def check_database():
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT 1')
+
+
+def check_cache():
+    cache.set('readyz', 1, 10)
+    if cache.get('readyz') != 1:
+        raise RuntimeError('значення не прочиталось з кешу')
+
+
+READINESS_CHECKS = {
+    'database': check_database,
+    'cache': check_cache,
+}
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(labels, **extra):
+    pairs = [*labels, *extra.items()]
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in pairs) + '}'
+
+
+def _number(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+def render_prometheus(snapshots):
+    """Текстовий формат Prometheus для знімків metrics.collect()"""
+    totals = metrics.merge(snapshots)
+    lines = []
+
+    counters = {}
+    for name, labels, value in totals['counters']:
+        counters.setdefault(name, []).append((labels, value))
+    for name in sorted(counters):
+        lines.append(f'# TYPE {METRIC_PREFIX}{name} counter')
+        for labels, value in counters[name]:
+            lines.append(f'{METRIC_PREFIX}{name}{_labels(labels)} {_number(value)}')
+
+    histograms = {}
+    for name, labels, histogram in totals['histograms']:
+        histograms.setdefault(name, []).append((labels, histogram))
+    for name in sorted(histograms):
+        lines.append(f'# TYPE {METRIC_PREFIX}{name} histogram')
+        for labels, histogram in histograms[name]:
+            cumulative = 0
+            for bound, count in zip([*histogram['buckets'], float('inf')], histogram['counts']):
+                cumulative += count
+                lines.append(f'{METRIC_PREFIX}{name}_bucket{_labels(labels, le=_number(bound))} {cumulative}')
+            lines.append(f'{METRIC_PREFIX}{name}_sum{_labels(labels)} {_number(histogram["sum"])}')
+            lines.append(f'{METRIC_PREFIX}{name}_count{_labels(labels)} {histogram["count"]}')
+
+    # Частка влучань кешу по просторах імен (apps.core.cache) за всіма процесами
+    cache_requests = {}
+    for labels, value in counters.get('cache_requests_total', []):
+        labels = dict(labels)
+        hits, total = cache_requests.get(labels['namespace'], (0, 0))
+        cache_requests[labels['namespace']] = (hits + (value if labels['result'] != 'miss' else 0), total + value)
+    if cache_requests:
+        lines.append(f'# TYPE {METRIC_PREFIX}cache_hit_ratio gauge')
+        for namespace, (hits, total) in sorted(cache_requests.items()):
+            lines.append(f'{METRIC_PREFIX}cache_hit_ratio{_labels([("namespace", namespace)])} '
+                         f'{_number(hits / total if total else 0.0)}')
+
+    # Воркери: лише знімки живих процесів (архів завершених має pid None)
+    workers = [data for data in snapshots if data.get('pid')]
+    lines.append(f'# TYPE {METRIC_PREFIX}workers gauge')
+    lines.append(f'{METRIC_PREFIX}workers {len(workers)}')
+    lines.append(f'# TYPE {METRIC_PREFIX}worker_info gauge')
+    lines.append(f'{METRIC_PREFIX}worker_info' + _labels([], python=platform.python_version(),
+                                                           django=django.get_version()) + ' 1')
+    lines.append(f'# TYPE {METRIC_PREFIX}worker_start_time_seconds gauge')
+    for data in workers:
+        lines.append(f'{METRIC_PREFIX}worker_start_time_seconds{_labels([("pid", data["pid"])])} '
+                     f'{_number(data["started_at"])}')
+    lines.append(f'# TYPE {METRIC_PREFIX}worker_max_rss_bytes gauge')
+    for data in workers:
+        if data.get('max_rss') is not None:
+            lines.append(f'{METRIC_PREFIX}worker_max_rss_bytes{_labels([("pid", data["pid"])])} {data["max_rss"]}')
+    return '\n'.join(lines) + '\n'
+
+
+class HealthCheckMiddleware:
+    """Відповідає на /healthz, /readyz та /metrics; має бути першим у MIDDLEWARE"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.routes = {
+            '/healthz': self.healthz,
+            '/readyz': self.readyz,
+        }
+        if getattr(settings, 'METRICS_ENABLED', False):
+            self.routes['/metrics'] = self.metrics
+
+    def __call__(self, request):
+        handler = self.routes.get(request.path_info.rstrip('/'))
+        if handler is None or request.method not in ('GET', 'HEAD'):
+            return self.get_response(request)
+        response = handler(request)
+        response['Cache-Control'] = 'no-store'
+        return response
+
+    def healthz(self, request):
+        return HttpResponse('ok', content_type='text/plain')
+
+    def readyz(self, request):
+        checks = {}
+        for name, check in READINESS_CHECKS.items():
+            try:
+                check()
+            except Exception as error:
+                logger.warning('Readiness check %s failed: %s', name, error)
+                checks[name] = 'fail'
+            else:
+                checks[name] = 'ok'
+        ready = all(result == 'ok' for result in checks.values())
+        return HttpResponse(
+            json.dumps({'status': 'ok' if ready else 'fail', 'checks': checks}),
+            content_type='application/json',
+            status=200 if ready else 503,
+        )
+
+    def metrics(self, request):
+        # Запит сюди доходить до перевірки ALLOWED_HOSTS, тому поза DEBUG потрібен токен
+        token = getattr(settings, 'METRICS_TOKEN', '')
+        if token:
+            allowed = compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}')
+        else:
+            allowed = settings.DEBUG
+        if not allowed:
+            return HttpResponse('Forbidden', content_type='text/plain', status=403)
+        return HttpResponse(render_prometheus(metrics.collect()), content_type='text/plain; version=0.0.4')
+
+
+class RequestMetricsMiddleware:
+    """Гістограми часу відповіді та кількості SQL-запитів за іменем маршруту"""
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'METRICS_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        queries = 0
+
+        def count_query(execute, sql, params, many, context):
+            nonlocal queries
+            queries += 1
+            return execute(sql, params, many, context)
+
+        started = time.perf_counter()
+        with connection.execute_wrapper(count_query):
+            response = self.get_response(request)
+        elapsed = time.perf_counter() - started
+
+        match = getattr(request, 'resolver_match', None)
+        view = match.view_name if match and match.view_name else 'unresolved'
+        metrics.increment('http_requests_total', view=view, method=request.method,
+                          status=f'{response.status_code // 100}xx')
+        metrics.observe('http_request_duration_seconds', elapsed, view=view)
+        metrics.observe('db_queries_per_request', queries, buckets=QUERY_BUCKETS, view=view)
+        metrics.increment('db_queries_total', queries, view=view)
+        metrics.maybe_flush()
+        return response
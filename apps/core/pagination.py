@@ -0,0 +1,142 @@
+"""
+Пагінатори для великих querysets.
+
+Стандартний Paginator на кожній сторінці виконує точний COUNT(*) по всьому
+(часто DISTINCT та з JOIN) queryset, і саме він зазвичай найдорожчий у запиті.
+
+EstimatedCountPaginator спочатку рахує обмежений COUNT - не більше
+PAGINATION_EXACT_COUNT_LIMIT + 1 рядків. Якщо результатів менше за поріг, кількість
+точна; інакше на PostgreSQL береться оцінка планувальника (reltuples таблиці для
+нефільтрованого queryset або кількість рядків з EXPLAIN), і сторінки читаються
+з одним додатковим рядком, щоб "наступна" не залежала від точності оцінки.
+На інших БД понад поріг виконується звичайний COUNT.
+
+NextPreviousPaginator не рахує кількість зовсім: лише "попередня/наступна".
+"""
+import json
+
+from django.conf import settings
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger, Paginator
+from django.db import connections
+from django.db.models.query import QuerySet
+from django.utils.functional import cached_property
+
+
+def estimate_count(queryset):
+    """Оцінка кількості рядків від планувальника PostgreSQL або None"""
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+    query = queryset.query
+    with connection.cursor() as cursor:
+        if not query.where and not query.distinct and not query.combinator:
+            cursor.execute(
+                'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass',
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+            # -1 - таблицю ще не аналізували
+            if row and row[0] >= 0:
+                return row[0]
+    plan = json.loads(queryset.order_by().explain(format='json'))
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+class LookaheadPage(Page):
+    """Сторінка, для якої наявність наступної відома з прочитаного зайвого рядка"""
+
+    def __init__(self, object_list, number, paginator, has_next):
+        super().__init__(object_list, number, paginator)
+        self._has_next = has_next
+
+    def has_next(self):
+        return self._has_next
+
+    def start_index(self):
+        if not self.object_list:
+            return 0
+        return self.paginator.per_page * (self.number - 1) + 1
+
+    def end_index(self):
+        return self.start_index() + len(self.object_list) - 1 if self.object_list else 0
+
+
+class LookaheadPaginatorMixin:
+    def validate_page_number(self, number):
+        """Як Paginator.validate_number, але без перевірки верхньої межі"""
+        try:
+            if isinstance(number, float) and not number.is_integer():
+                raise ValueError
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger(self.error_messages['invalid_page'])
+        if number < 1:
+            raise EmptyPage(self.error_messages['min_page'])
+        return number
+
+    def lookahead_page(self, number):
+        bottom = (number - 1) * self.per_page
+        items = list(self.object_list[bottom:bottom + self.per_page + 1])
+        if not items and number > 1:
+            raise EmptyPage(self.error_messages['no_results'])
+        return LookaheadPage(items[:self.per_page], number, self, has_next=len(items) > self.per_page)
+
+    def get_page(self, number):
+        """Некоректний номер або сторінка за межами результатів - перша сторінка"""
+        try:
+            return self.page(number)
+        except (PageNotAnInteger, EmptyPage):
+            return self.page(1)
+
+
+class EstimatedCountPaginator(LookaheadPaginatorMixin, Paginator):
+    """Точна кількість до порогу, оцінка планувальника - понад нього (is_estimated)"""
+    is_estimated = False
+
+    @property
+    def exact_count_limit(self):
+        return getattr(settings, 'PAGINATION_EXACT_COUNT_LIMIT', 1000)
+
+    @cached_property
+    def count(self):
+        self.is_estimated = False
+        if not isinstance(self.object_list, QuerySet):
+            return super().count
+        limit = self.exact_count_limit
+        # COUNT по підзапиту з LIMIT: не дорожчий за читання limit + 1 рядків
+        bounded = self.object_list[:limit + 1].count()
+        if bounded <= limit:
+            return bounded
+        estimate = estimate_count(self.object_list)
+        if estimate is None:
+            return self.object_list.count()
+        self.is_estimated = True
+        return max(estimate, bounded)
+
+    def validate_number(self, number):
+        if self.count and self.is_estimated:
+            return self.validate_page_number(number)
+        return super().validate_number(number)
+
+    def page(self, number):
+        number = self.validate_number(number)
+        if self.is_estimated:
+            return self.lookahead_page(number)
+        return super().page(number)
+
+
+class NextPreviousPaginator(LookaheadPaginatorMixin, Paginator):
+    """Без COUNT: сторінка читає per_page + 1 рядків, загальна кількість невідома"""
+    count = None
+    num_pages = None
+    is_estimated = False
+
+    def validate_number(self, number):
+        return self.validate_page_number(number)
+
+    def page(self, number):
+        return self.lookahead_page(self.validate_number(number))
+
+    @property
+    def page_range(self):
+        return range(0)
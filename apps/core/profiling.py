@@ -0,0 +1,171 @@
+"""
+Профілювання запитів у продакшні.
+
+ProfilingMiddleware (PROFILING_ENABLED=True) профілює запити персоналу з параметром
+?profile=1 та випадкову частку всіх запитів (PROFILING_SAMPLE_RATE). Якщо профілювання
+вимкнене, middleware не підключається зовсім (MiddlewareNotUsed) і нічого не коштує.
+
+Режими (PROFILING_MODE):
+- cprofile - детерміністичний cProfile, результат у файлі .prof (pstats, snakeviz);
+- sampling - окремий потік кожні PROFILING_SAMPLE_INTERVAL мс знімає стек потоку запиту,
+  результат - згорнуті стеки .folded (flamegraph.pl, speedscope); накладні витрати
+  значно менші, ніж у cProfile.
+
+Профілі зберігаються у PROFILING_DIR/<назва представлення>/, для кожного представлення
+лишаються останні PROFILING_KEEP файлів. Зведення гарячих функцій - команда profile_report.
+"""
+import os
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from functools import lru_cache
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from . import metrics
+
+PROFILE_SUFFIXES = {'cprofile': '.prof', 'sampling': '.folded'}
+
+# cProfile (з Python 3.12 - через sys.monitoring) може бути активним лише один на процес:
+# запит, що прийшов під час профілювання іншого, обслуговується без профілю
+_cprofile_lock = threading.Lock()
+
+
+def get_profile_dir():
+    return Path(settings.PROFILING_DIR)
+
+
+def view_dir_name(request):
+    """Назва каталогу профілів: ім'я маршруту (forum:topic_detail -> forum.topic_detail)"""
+    match = getattr(request, 'resolver_match', None)
+    name = match.view_name if match and match.view_name else 'unresolved'
+    return re.sub(r'[^\w.-]', '_', name.replace(':', '.'))
+
+
+@lru_cache(maxsize=4096)
+def short_path(filename):
+    """Шлях до файлу відносно проєкту або каталогу з sys.path"""
+    for prefix in sorted((str(settings.BASE_DIR), *sys.path), key=len, reverse=True):
+        if prefix and filename.startswith(prefix + os.sep):
+            return filename[len(prefix) + 1:]
+    return filename
+
+
+def frame_label(code):
+    """Кадр стека у форматі "функція (файл:рядок)" """
+    return f'{code.co_name} ({short_path(code.co_filename)}:{code.co_firstlineno})'
+
+
+class StackSampler:
+    """Періодично знімає стек заданого потоку та рахує згорнуті стеки"""
+
+    def __init__(self, thread_id, interval):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='profiling-sampler', daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(frame_label(frame.f_code))
+                frame = frame.f_back
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def dump(self, path):
+        with open(path, 'w') as output:
+            for stack, count in self.stacks.most_common():
+                output.write(f'{stack} {count}\n')
+
+
+class ProfilingMiddleware:
+    """
+    Профілює запит, якщо його зробив персонал з ?profile=1 або він потрапив у вибірку.
+    Має стояти після AuthenticationMiddleware.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'PROFILING_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.mode = settings.PROFILING_MODE
+        if self.mode not in PROFILE_SUFFIXES:
+            raise ValueError(f'PROFILING_MODE: {self.mode} (очікується cprofile або sampling)')
+        self.sample_rate = settings.PROFILING_SAMPLE_RATE
+        self.interval = settings.PROFILING_SAMPLE_INTERVAL / 1000
+        self.keep = settings.PROFILING_KEEP
+        if self.mode == 'cprofile':
+            # Імпорт лише при увімкненому профілюванні: модуль middleware вантажиться завжди
+            import cProfile
+            self.profile_class = cProfile.Profile
+
+    def should_profile(self, request):
+        if 'profile' in request.GET and request.user.is_staff:
+            return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def __call__(self, request):
+        if not self.should_profile(request):
+            return self.get_response(request)
+
+        started = time.perf_counter()
+        if self.mode == 'cprofile':
+            if not _cprofile_lock.acquire(blocking=False):
+                return self.get_response(request)
+            try:
+                profiler = self.profile_class()
+                profiler.enable()
+                try:
+                    response = self.get_response(request)
+                finally:
+                    profiler.disable()
+            finally:
+                _cprofile_lock.release()
+        else:
+            profiler = StackSampler(threading.get_ident(), self.interval)
+            profiler.start()
+            try:
+                response = self.get_response(request)
+            finally:
+                profiler.stop()
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        view = view_dir_name(request)
+        self.save(profiler, view, elapsed_ms)
+        metrics.increment('profiled_requests_total', view=view, mode=self.mode)
+        return response
+
+    def save(self, profiler, view, elapsed_ms):
+        directory = get_profile_dir() / view
+        directory.mkdir(parents=True, exist_ok=True)
+        # Час запиту в імені файлу: звіт показує його без читання профілю
+        name = f'{time.time_ns()}-{os.getpid()}-{uuid.uuid4().hex[:6]}-{elapsed_ms:.0f}ms'
+        path = directory / (name + PROFILE_SUFFIXES[self.mode])
+        if self.mode == 'cprofile':
+            profiler.dump_stats(path)
+        else:
+            profiler.dump(path)
+        self.prune(directory)
+
+    def prune(self, directory):
+        """Лишає останні PROFILING_KEEP профілів представлення"""
+        files = sorted(directory.iterdir(), key=lambda path: path.name)
+        for path in files[:-self.keep] if self.keep else []:
+            path.unlink(missing_ok=True)
@@ -0,0 +1,192 @@
+"""
+Обмеження частоти запитів (rate limiting).
+
+Використовується лічильник ковзного вікна: кількість запитів у поточному вікні
+плюс зважена частка попереднього вікна. Лічильники зберігаються в кеші Django,
+а якщо кеш недоступний - у пам'яті процесу.
+
+Ліміти налаштовуються в settings.RATE_LIMITS окремо для кожної дії та ролі:
+
+    RATE_LIMITS = {
+        'search': {'anonymous': '10/m', 'default': '30/m', 'vip': '60/m', 'moderator': None},
+    }
+
+Ключ ролі - Role.name, 'default' - для авторизованих користувачів без окремого ліміту,
+'anonymous' - для анонімних. None означає відсутність обмеження.
+"""
+import logging
+import math
+import re
+import threading
+import time
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.cache import cache
+from django.shortcuts import render
+
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+ANONYMOUS = 'anonymous'
+DEFAULT = 'default'
+
+_PERIODS = {'s': 1, 'm': 60, 'h': 60 * 60, 'd': 24 * 60 * 60}
+_RATE_RE = re.compile(r'^(\d+)/(\d*)([smhd])$')
+
+
+@dataclass
+class RateLimitResult:
+    allowed: bool
+    limit: int = 0
+    period: int = 0
+    retry_after: int = 0
+
+
+def parse_rate(rate):
+    """'10/m' -> (10, 60), '5/10m' -> (5, 600)"""
+    match = _RATE_RE.match(rate.replace(' ', ''))
+    if not match:
+        raise ValueError(f'Некоректний формат ліміту: {rate!r}')
+    count, multiplier, unit = match.groups()
+    return int(count), int(multiplier or 1) * _PERIODS[unit]
+
+
+class LocalCounterStore:
+    """Лічильники в пам'яті процесу - запасний варіант, коли кеш недоступний"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+
+    def incr(self, key, timeout):
+        now = time.monotonic()
+        with self._lock:
+            value, expires = self._counters.get(key, (0, 0))
+            if expires <= now:
+                value = 0
+            value += 1
+            self._counters[key] = (value, now + timeout)
+            if len(self._counters) > 10000:
+                self._counters = {k: v for k, v in self._counters.items() if v[1] > now}
+            return value
+
+    def get(self, key):
+        with self._lock:
+            value, expires = self._counters.get(key, (0, 0))
+            return value if expires > time.monotonic() else 0
+
+
+local_store = LocalCounterStore()
+
+
+def _cache_incr(key, timeout):
+    if cache.add(key, 1, timeout):
+        return 1
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # Ключ встиг зникнути між add() та incr()
+        cache.set(key, 1, timeout)
+        return 1
+
+
+def _hit(key, previous_key, timeout):
+    """Рахує запит і повертає (кількість у поточному вікні, кількість у попередньому)"""
+    try:
+        current = _cache_incr(key, timeout)
+        previous = cache.get(previous_key) or 0
+    except Exception:
+        logger.warning('Кеш недоступний, ліміти рахуються в пам\'яті процесу', exc_info=True)
+        current = local_store.incr(key, timeout)
+        previous = local_store.get(previous_key)
+    return current, previous
+
+
+def get_client_ip(request):
+    if getattr(settings, 'RATE_LIMIT_TRUST_X_FORWARDED_FOR', False):
+        forwarded = request.META.get('HTTP_X_FORWARDED_FOR', '')
+        if forwarded:
+            return forwarded.split(',')[0].strip()
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def get_role_key(user):
+    if not user.is_authenticated:
+        return ANONYMOUS
+    profile = getattr(user, 'profile', None)
+    if profile is not None and profile.role:
+        return profile.role.name
+    return DEFAULT
+
+
+def get_rate(scope, role_key):
+    """Повертає ліміт для дії та ролі або None, якщо обмеження немає"""
+    limits = getattr(settings, 'RATE_LIMITS', {}).get(scope)
+    if not limits:
+        return None
+    if role_key in limits:
+        return limits[role_key]
+    if role_key == ANONYMOUS:
+        return limits.get(ANONYMOUS, limits.get(DEFAULT))
+    return limits.get(DEFAULT)
+
+
+def check_rate_limit(request, scope):
+    """Рахує запит для дії scope та перевіряє, чи не перевищено ліміт"""
+    role_key = get_role_key(request.user)
+    rate = get_rate(scope, role_key)
+    if rate is None:
+        return RateLimitResult(allowed=True)
+
+    limit, period = parse_rate(rate)
+    if request.user.is_authenticated:
+        ident = f'user:{request.user.pk}'
+    else:
+        ident = f'ip:{get_client_ip(request)}'
+
+    now = time.time()
+    window = int(now // period)
+    elapsed = now - window * period
+    key = f'ratelimit:{scope}:{ident}:{window}'
+    previous_key = f'ratelimit:{scope}:{ident}:{window - 1}'
+
+    current, previous = _hit(key, previous_key, period * 2)
+    estimated = current + previous * (period - elapsed) / period
+    if estimated <= limit:
+        return RateLimitResult(allowed=True, limit=limit, period=period)
+
+    metrics.increment('ratelimit_rejected_total', scope=scope, role=role_key)
+    logger.info('Rate limit exceeded: scope=%s ident=%s role=%s', scope, ident, role_key)
+    return RateLimitResult(
+        allowed=False,
+        limit=limit,
+        period=period,
+        retry_after=max(1, math.ceil(period - elapsed)),
+    )
+
+
+def rate_limited_response(request, result):
+    response = render(request, '429.html', {'retry_after': result.retry_after}, status=429)
+    response['Retry-After'] = str(result.retry_after)
+    return response
+
+
+class RateLimitMixin:
+    """
+    Міксин для class-based views.
+    ratelimit_scope - ключ у settings.RATE_LIMITS, ratelimit_methods - HTTP-методи, що рахуються.
+    """
+    ratelimit_scope = None
+    ratelimit_methods = ('POST',)
+
+    def should_rate_limit(self, request):
+        return request.method in self.ratelimit_methods
+
+    def dispatch(self, request, *args, **kwargs):
+        if self.ratelimit_scope and self.should_rate_limit(request):
+            result = check_rate_limit(request, self.ratelimit_scope)
+            if not result.allowed:
+                return rate_limited_response(request, result)
+        return super().dispatch(request, *args, **kwargs)
@@ -0,0 +1,155 @@
+"""
+Статичні файли: зберігання з хешами в іменах та стисненими копіями,
+а також роздача самим застосунком для розгортання в одному контейнері.
+
+collectstatic з CompressedManifestStaticFilesStorage записує поряд з кожним
+хешованим текстовим файлом копії .gz та .br (якщо встановлено пакет brotli).
+StaticFilesMiddleware (SERVE_STATIC=True) віддає ці файли через FileResponse
+(sendfile через wsgi.file_wrapper) із заголовками immutable для хешованих імен.
+"""
+import gzip
+import json
+import mimetypes
+import os
+import posixpath
+from email.utils import formatdate
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import FileResponse, HttpResponse, HttpResponseNotModified
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = {'.css', '.js', '.mjs', '.map', '.svg', '.json', '.txt', '.xml', '.html', '.ico', '.ttf', '.eot'}
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+DEFAULT_CACHE_CONTROL = 'public, max-age=60'
+
+# Суфікс файлу -> значення Content-Encoding, у порядку переваги
+ENCODINGS = [('.br', 'br'), ('.gz', 'gzip')]
+
+
+def compress_file(path):
+    """
+    Записує path.gz та path.br, якщо стиснена копія помітно менша за оригінал.
+    Повертає список створених файлів.
+    """
+    with open(path, 'rb') as source:
+        data = source.read()
+    variants = [('.gz', gzip.compress(data, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        variants.append(('.br', brotli.compress(data)))
+
+    created = []
+    for suffix, compressed in variants:
+        if len(compressed) >= len(data) * 0.95:
+            continue
+        with open(path + suffix, 'wb') as target:
+            target.write(compressed)
+        created.append(path + suffix)
+    return created
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """ManifestStaticFilesStorage, що додатково стискає хешовані файли при collectstatic"""
+
+    def post_process(self, *args, **kwargs):
+        yield from super().post_process(*args, **kwargs)
+        if kwargs.get('dry_run'):
+            return
+        for hashed_name in set(self.hashed_files.values()):
+            if os.path.splitext(hashed_name)[1].lower() not in COMPRESSIBLE_EXTENSIONS:
+                continue
+            for created in compress_file(self.path(hashed_name)):
+                yield hashed_name, os.path.relpath(created, self.location), True
+
+
+class StaticFile:
+    """Файл у STATIC_ROOT з наявними стисненими варіантами"""
+
+    def __init__(self, path, immutable):
+        stat = os.stat(path)
+        self.content_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+        self.last_modified = formatdate(stat.st_mtime, usegmt=True)
+        self.cache_control = IMMUTABLE_CACHE_CONTROL if immutable else DEFAULT_CACHE_CONTROL
+        tag = f'{int(stat.st_mtime):x}-{stat.st_size:x}'
+        # (шлях, Content-Encoding, розмір, ETag); оригінал - останній
+        self.variants = [
+            (path + suffix, encoding, os.path.getsize(path + suffix), f'"{tag}-{encoding}"')
+            for suffix, encoding in ENCODINGS if os.path.exists(path + suffix)
+        ]
+        self.variants.append((path, None, stat.st_size, f'"{tag}"'))
+
+    def select(self, accept_encoding):
+        """Найкращий варіант, який приймає клієнт"""
+        for variant in self.variants:
+            if variant[1] is None or variant[1] in accept_encoding:
+                return variant
+
+
+def build_static_index(root):
+    """
+    Індекс STATIC_ROOT: відносний URL-шлях -> StaticFile.
+    Будується один раз при старті, тому на запит немає звернень до файлової системи, крім open().
+    """
+    immutable = set()
+    manifest_path = os.path.join(root, ManifestStaticFilesStorage.manifest_name)
+    if os.path.exists(manifest_path):
+        with open(manifest_path, encoding='utf-8') as manifest:
+            immutable = set(json.load(manifest).get('paths', {}).values())
+
+    index = {}
+    for directory, _, filenames in os.walk(root):
+        for filename in filenames:
+            if filename.endswith(('.gz', '.br')):
+                continue
+            path = os.path.join(directory, filename)
+            name = os.path.relpath(path, root).replace(os.sep, '/')
+            index[name] = StaticFile(path, name in immutable)
+    return index
+
+
+class StaticFilesMiddleware:
+    """
+    Роздача статичних файлів застосунком (SERVE_STATIC=True).
+    Має стояти одразу після SecurityMiddleware, щоб запити до статики не проходили
+    через сесії та автентифікацію.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'SERVE_STATIC', False) or not settings.STATIC_ROOT:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.prefix = '/' + settings.STATIC_URL.lstrip('/')
+        self.index = build_static_index(str(settings.STATIC_ROOT))
+
+    def __call__(self, request):
+        if request.path.startswith(self.prefix) and request.method in ('GET', 'HEAD'):
+            name = posixpath.normpath(request.path[len(self.prefix):]).lstrip('/')
+            static_file = self.index.get(name)
+            if static_file is not None:
+                return self.serve(request, static_file)
+        return self.get_response(request)
+
+    def serve(self, request, static_file):
+        path, encoding, size, etag = static_file.select(request.headers.get('Accept-Encoding', ''))
+        if request.headers.get('If-None-Match') == etag:
+            response = HttpResponseNotModified()
+        elif request.method == 'HEAD':
+            response = HttpResponse(content_type=static_file.content_type)
+            response.headers['Content-Length'] = size
+        else:
+            response = FileResponse(open(path, 'rb'), content_type=static_file.content_type)
+            # FileResponse підставляє ім'я файлу (з .gz/.br), воно тут не потрібне
+            del response.headers['Content-Disposition']
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        response.headers['ETag'] = etag
+        response.headers['Last-Modified'] = static_file.last_modified
+        response.headers['Cache-Control'] = static_file.cache_control
+        if len(static_file.variants) > 1:
+            response.headers['Vary'] = 'Accept-Encoding'
+        return response
@@ -0,0 +1,48 @@
+import hashlib
+import os
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+
+from .images import downscale_image
+
+
+class UploadImageStorage(FileSystemStorage):
+    """
+    Сховище для завантажень CKEditor (CKEDITOR_5_FILE_STORAGE).
+    Великі зображення зменшуються до UPLOAD_IMAGE_MAX_SIZE ще до збереження, і файл
+    отримує ім'я за хешем уже остаточного вмісту: вміст під цим ім'ям ніколи не змінюється,
+    тому його можна кешувати назавжди.
+    """
+
+    def __init__(self, **kwargs):
+        upload_path = getattr(settings, 'CKEDITOR_5_UPLOAD_PATH', 'uploads/')
+        kwargs.setdefault('location', os.path.join(settings.MEDIA_ROOT, upload_path))
+        kwargs.setdefault('base_url', f'{settings.MEDIA_URL}{upload_path}')
+        super().__init__(**kwargs)
+
+    def downscale(self, content):
+        """Зменшений вміст завеликого зображення або content без змін"""
+        from PIL import Image
+        try:
+            data = downscale_image(content, getattr(settings, 'UPLOAD_IMAGE_MAX_SIZE', 1600))
+        except (OSError, Image.DecompressionBombError):
+            # Не зображення, пошкоджений файл або завелике для декодування - зберігаємо як є
+            data = None
+        content.seek(0)
+        return content if data is None else ContentFile(data)
+
+    def _save(self, name, content):
+        content = self.downscale(content)
+        digest = hashlib.sha256()
+        content.seek(0)
+        for chunk in content.chunks():
+            digest.update(chunk)
+        content.seek(0)
+        extension = os.path.splitext(name)[1].lower()
+        name = f'{digest.hexdigest()[:20]}{extension}'
+        if self.exists(name):
+            return name
+        return super()._save(name, content)
+
@@ -0,0 +1,189 @@
+"""
+Легка черга фонових задач.
+
+Задачі реєструються декоратором @task у модулях tasks.py застосунків
+(вони імпортуються автоматично при старті) і ставляться в чергу через enqueue():
+
+    @task('forum.create_first_post')
+    def create_first_post(topic_id, author_id, content):
+        ...
+
+    enqueue_on_commit(create_first_post, {'topic_id': topic.pk, ...}, key=f'first-post:{topic.pk}')
+
+Бекенд вибирається налаштуванням TASK_QUEUE_BACKEND:
+    'database'  - задачі зберігаються в таблиці Task і виконуються командою run_worker
+                  (повторні спроби з експоненційною затримкою, ключі ідемпотентності);
+    'thread'    - пул потоків у процесі застосунку, без повторних спроб;
+    'immediate' - синхронне виконання (для розробки та налагодження).
+
+Задачі мають бути ідемпотентними: при повторній спробі вони можуть виконатись ще раз.
+"""
+import logging
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections, transaction
+from django.utils import timezone
+
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+DATABASE = 'database'
+THREAD = 'thread'
+IMMEDIATE = 'immediate'
+
+_registry = {}
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def task(name, max_attempts=5):
+    """Реєструє функцію як фонову задачу з назвою name"""
+    def decorator(func):
+        func.task_name = name
+        func.max_attempts = max_attempts
+        _registry[name] = func
+        return func
+    return decorator
+
+
+def get_task(name):
+    try:
+        return _registry[name]
+    except KeyError:
+        raise LookupError(f'Невідома фонова задача: {name}')
+
+
+def get_backend():
+    return getattr(settings, 'TASK_QUEUE_BACKEND', THREAD)
+
+
+def run_task(name, payload):
+    """Виконує зареєстровану задачу в поточному потоці"""
+    get_task(name)(**(payload or {}))
+    metrics.increment('tasks_completed_total', task=name)
+
+
+def _run_in_thread(name, payload):
+    try:
+        run_task(name, payload)
+    except Exception:
+        metrics.increment('tasks_failed_total', task=name)
+        logger.exception('Фонова задача %s завершилась з помилкою', name)
+    finally:
+        close_old_connections()
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, 'TASK_QUEUE_THREADS', 4),
+                thread_name_prefix='taskqueue',
+            )
+        return _executor
+
+
+def enqueue(func, payload=None, key=None, delay=None):
+    """
+    Ставить задачу в чергу.
+    func - зареєстрована функція або її назва, payload - JSON-серіалізовані аргументи,
+    key - ключ ідемпотентності (повторний enqueue з тим самим ключем ігнорується
+    бекендом 'database'), delay - timedelta, через яку задачу можна виконувати.
+    """
+    name = func if isinstance(func, str) else func.task_name
+    payload = payload or {}
+    backend = get_backend()
+    metrics.increment('tasks_enqueued_total', task=name)
+
+    if backend == IMMEDIATE:
+        run_task(name, payload)
+        return None
+    if backend == THREAD:
+        return _get_executor().submit(_run_in_thread, name, payload)
+
+    from .models import Task
+    run_after = timezone.now() + (delay or timedelta())
+    fields = {
+        'name': name,
+        'payload': payload,
+        'run_after': run_after,
+        'max_attempts': get_task(name).max_attempts,
+    }
+    if key is None:
+        return Task.objects.create(**fields)
+    try:
+        with transaction.atomic():
+            return Task.objects.create(idempotency_key=key, **fields)
+    except IntegrityError:
+        logger.debug('Задача з ключем %s вже в черзі', key)
+        return None
+
+
+def enqueue_on_commit(func, payload=None, key=None, delay=None):
+    """Ставить задачу в чергу після успішного коміту поточної транзакції"""
+    transaction.on_commit(lambda: enqueue(func, payload, key=key, delay=delay))
+
+
+def get_retry_delay(attempts):
+    """Експоненційна затримка між спробами: 30с, 1хв, 2хв, ... але не більше години"""
+    base = getattr(settings, 'TASK_QUEUE_RETRY_DELAY', 30)
+    return timedelta(seconds=min(base * 2 ** (attempts - 1), 60 * 60))
+
+
+def claim_tasks(limit):
+    """Бере в роботу до limit готових задач (SELECT ... FOR UPDATE SKIP LOCKED)"""
+    from .models import Task
+    now = timezone.now()
+    with transaction.atomic():
+        tasks = list(
+            Task.objects.select_for_update(skip_locked=True)
+            .filter(status=Task.PENDING, run_after__lte=now)
+            .order_by('run_after')[:limit]
+        )
+        for item in tasks:
+            item.status = Task.RUNNING
+            item.attempts += 1
+            item.locked_at = now
+        Task.objects.bulk_update(tasks, ['status', 'attempts', 'locked_at'])
+    return tasks
+
+
+def execute_claimed(item):
+    """Виконує взяту в роботу задачу та зберігає результат або планує повтор"""
+    from .models import Task
+    try:
+        run_task(item.name, item.payload)
+    except Exception:
+        metrics.increment('tasks_failed_total', task=item.name)
+        logger.exception('Фонова задача %s (#%s) завершилась з помилкою', item.name, item.pk)
+        item.last_error = traceback.format_exc()
+        if item.attempts < item.max_attempts:
+            item.status = Task.PENDING
+            item.run_after = timezone.now() + get_retry_delay(item.attempts)
+        else:
+            item.status = Task.FAILED
+            item.finished_at = timezone.now()
+        item.locked_at = None
+        item.save(update_fields=['status', 'run_after', 'last_error', 'locked_at', 'finished_at'])
+        return False
+
+    item.status = Task.DONE
+    item.locked_at = None
+    item.finished_at = timezone.now()
+    item.save(update_fields=['status', 'locked_at', 'finished_at'])
+    return True
+
+
+def requeue_stale_tasks(timeout):
+    """Повертає в чергу задачі, що зависли в статусі 'running' (наприклад, після падіння воркера)"""
+    from .models import Task
+    return Task.objects.filter(
+        status=Task.RUNNING,
+        locked_at__lt=timezone.now() - timeout,
+    ).update(status=Task.PENDING, locked_at=None)
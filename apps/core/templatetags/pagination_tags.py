@@ -0,0 +1,13 @@
+from django import template
+
+register = template.Library()
+
+
+@register.simple_tag(takes_context=True)
+def page_url(context, number):
+    """
+    Посилання на сторінку number зі збереженням інших параметрів запиту (наприклад, ?q= пошуку)
+    """
+    params = context['request'].GET.copy()
+    params['page'] = number
+    return f'?{params.urlencode()}'
@@ -0,0 +1,61 @@
+"""
+Прогрів процесу перед обслуговуванням запитів.
+
+Без прогріву перший запит кожного воркера імпортує URLconf з усіма представленнями
+та формами, компілює шаблони і вантажить важкі модулі (Pillow, віджет CKEditor).
+warm_up() робить це заздалегідь. Під gunicorn з preload_app (gunicorn.conf.py) він
+виконується один раз у майстер-процесі, і воркери після fork отримують готовий стан
+у спільній (copy-on-write) пам'яті.
+
+Прогрів не звертається до БД: відкрите до fork з'єднання було б спільним для воркерів.
+"""
+import logging
+import time
+from importlib import import_module
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections
+from django.template import TemplateDoesNotExist, TemplateSyntaxError, engines
+from django.urls import get_resolver
+
+logger = logging.getLogger(__name__)
+
+
+def load_urlconf():
+    """Імпорт ROOT_URLCONF (і через нього всіх представлень) та побудова таблиць reverse()"""
+    resolver = get_resolver()
+    resolver.url_patterns
+    resolver.reverse_dict
+    for namespace in resolver.namespace_dict:
+        resolver.namespace_dict[namespace][1].reverse_dict
+
+
+def compile_templates():
+    """Компілює шаблони проєкту (TEMPLATES['DIRS']) у кеш завантажувача; повертає їх кількість"""
+    compiled = 0
+    for engine in engines.all():
+        for directory in getattr(engine, 'dirs', []):
+            directory = Path(directory)
+            for path in sorted(directory.rglob('*.html')):
+                try:
+                    engine.get_template(path.relative_to(directory).as_posix())
+                except (TemplateDoesNotExist, TemplateSyntaxError) as error:
+                    logger.warning('Warm-up: template %s not compiled: %s', path, error)
+                else:
+                    compiled += 1
+    return compiled
+
+
+def warm_up():
+    """Імпортує WARMUP_IMPORTS, URLconf та компілює шаблони; повертає тривалість (с)"""
+    started = time.perf_counter()
+    for module in getattr(settings, 'WARMUP_IMPORTS', []):
+        import_module(module)
+    load_urlconf()
+    templates = compile_templates()
+    # Про всяк випадок: жодне з'єднання з БД не має пережити fork
+    connections.close_all()
+    elapsed = time.perf_counter() - started
+    logger.info('Warm-up finished in %.0f ms (%d templates)', elapsed * 1000, templates)
+    return elapsed
@@ -1,42 +1,116 @@
 from django.contrib import admin
+from django.db.models import Count, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
 from django.utils import timezone
-from .models import Category, Topic, Post, ModerationAction
+from apps.core.taskqueue import enqueue_on_commit
+from apps.users.stats import recount_profile_stats
+from .models import Category, Topic, Post, ModerationAction, Subscription, Notification
+from .categories import get_category_tree, get_category_levels, get_category_paths, format_category_label
+from .search import get_post_search_filter
+from .tasks import record_moderation_actions, delete_category_task
+
+
+def count_subquery(queryset, field):
+    """Підзапит з кількістю рядків queryset, що посилаються на поточний об'єкт через field"""
+    counts = queryset.filter(**{field: OuterRef('pk')}).order_by().values(field).annotate(c=Count('pk')).values('c')
+    return Coalesce(Subquery(counts), 0)
+
+
+class ParentCategoryFilter(admin.SimpleListFilter):
+    """Фільтр за батьківською категорією на основі закешованого дерева"""
+    title = 'Батьківська категорія'
+    parameter_name = 'parent'
+
+    def lookups(self, request, model_admin):
+        tree = get_category_tree()
+        parent_ids = {node['parent_id'] for node in tree}
+        return [
+            (node['pk'], format_category_label(node['name'], node['level']))
+            for node in tree if node['pk'] in parent_ids
+        ]
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(parent_id=self.value())
+        return queryset
 
 
 @admin.register(Category)
 class CategoryAdmin(admin.ModelAdmin):
-    list_display = ['get_hierarchy_name', 'parent', 'subcategories_count', 'topics_count', 'created_at']
-    list_filter = ['parent', 'created_at']
+    list_display = ['get_hierarchy_name', 'parent_path', 'subcategories_count', 'topics_count', 'created_at']
+    list_filter = [ParentCategoryFilter, 'created_at']
     search_fields = ['name', 'description']
     ordering = ['parent__name', 'name']
+    # __str__ категорії використовує батьківську (наприклад, у чекбоксі дій)
     list_select_related = ['parent']
+    autocomplete_fields = ['parent']
+    show_full_result_count = False
+    actions = ['delete_with_content']
+
+    def get_queryset(self, request):
+        # Кількості рахуються корельованими підзапитами в одному SELECT, а не запитом на рядок
+        return super().get_queryset(request).annotate(
+            subcategories_total=count_subquery(Category.objects.all(), 'parent'),
+            topics_total=count_subquery(Topic.objects.all(), 'category'),
+        )
 
     def get_hierarchy_name(self, obj):
         """Показує назву з відступом згідно з рівнем вкладеності"""
-        level = obj.get_level()
-        indent = '—' * level
-        return f"{indent} {obj.name}" if level > 0 else obj.name
+        level = get_category_levels().get(obj.pk, 0)
+        return format_category_label(obj.name, level)
     get_hierarchy_name.short_description = 'Назва категорії'
 
+    def parent_path(self, obj):
+        if obj.parent_id is None:
+            return '-'
+        return get_category_paths().get(obj.parent_id, '-')
+    parent_path.short_description = 'Батьківська категорія'
+    parent_path.admin_order_field = 'parent__name'
+
     def subcategories_count(self, obj):
         """Кількість прямих підкатегорій"""
-        return obj.subcategories.count()
+        return obj.subcategories_total
     subcategories_count.short_description = 'Підкатегорій'
+    subcategories_count.admin_order_field = 'subcategories_total'
 
     def topics_count(self, obj):
         """Кількість тем в категорії"""
-        return obj.topics.count()
+        return obj.topics_total
     topics_count.short_description = 'Тем'
+    topics_count.admin_order_field = 'topics_total'
+
+    @admin.action(description='Видалити з усім вмістом (у фоні, пакетами)', permissions=['delete'])
+    def delete_with_content(self, request, queryset):
+        # Каскадне видалення великої категорії блокувало б таблиці однією довгою транзакцією
+        category_ids = list(queryset.values_list('pk', flat=True))
+        for category_id in category_ids:
+            enqueue_on_commit(delete_category_task, {'category_id': category_id}, key=f'delete-category:{category_id}')
+        self.message_user(request, f'{len(category_ids)} категорій поставлено в чергу на видалення')
 
 
 @admin.register(Topic)
 class TopicAdmin(admin.ModelAdmin):
-    list_display = ['title', 'category', 'author', 'status', 'moderated_by', 'created_at', 'is_pinned', 'is_closed', 'views']
-    list_filter = ['category', 'status', 'is_pinned', 'is_closed', 'created_at']
+    list_display = ['title', 'category_path', 'author', 'status', 'moderated_by', 'created_at', 'is_pinned', 'is_closed', 'is_deleted', 'views']
+    list_filter = ['category', 'status', 'is_pinned', 'is_closed', 'is_deleted', 'is_archived', 'created_at']
     search_fields = ['title', 'author__username']
-    readonly_fields = ['views', 'created_at', 'updated_at', 'moderated_at']
+    readonly_fields = ['views', 'created_at', 'updated_at', 'moderated_at', 'deleted_at', 'is_archived']
     ordering = ['-created_at']
-    actions = ['pin_topics', 'unpin_topics', 'close_topics', 'open_topics', 'approve_topics', 'reject_topics']
+    list_select_related = ['category', 'author', 'moderated_by']
+    autocomplete_fields = ['category', 'author', 'moderated_by']
+    # Не рахуємо COUNT(*) по всій таблиці на кожній сторінці списку
+    show_full_result_count = False
+    actions = ['pin_topics', 'unpin_topics', 'close_topics', 'open_topics', 'approve_topics', 'reject_topics',
+               'soft_delete_topics', 'restore_topics']
+
+    def get_queryset(self, request):
+        # В адмінці видно і м'яко видалені теми
+        return Topic.all_objects.all()
+
+    def category_path(self, obj):
+        """Шлях категорії з закешованого дерева, без запитів по батьківських категоріях"""
+        return get_category_paths().get(obj.category_id, obj.category.name)
+    category_path.short_description = 'Категорія'
+    category_path.admin_order_field = 'category__name'
 
     @admin.action(description='Закріпити теми')
     def pin_topics(self, request, queryset):
@@ -60,56 +134,105 @@ class TopicAdmin(admin.ModelAdmin):
 
     @admin.action(description='Схвалити теми')
     def approve_topics(self, request, queryset):
+        topic_ids = list(queryset.values_list('pk', flat=True))
         count = queryset.update(
             status=Topic.APPROVED,
             moderated_by=request.user,
             moderated_at=timezone.now()
         )
-        # Створити історію модерації для кожної теми
-        for topic in queryset:
-            ModerationAction.objects.create(
-                topic=topic,
-                moderator=request.user,
-                action=ModerationAction.APPROVE,
-                comment='Схвалено через адмін-панель'
-            )
+        # Історія модерації для всіх тем створюється одним INSERT у фоні
+        enqueue_on_commit(record_moderation_actions, {
+            'topic_ids': topic_ids,
+            'moderator_id': request.user.pk,
+            'action': ModerationAction.APPROVE,
+            'comment': 'Схвалено через адмін-панель',
+        })
         self.message_user(request, f'{count} тем схвалено')
 
     @admin.action(description='Відхилити теми')
     def reject_topics(self, request, queryset):
+        topic_ids = list(queryset.values_list('pk', flat=True))
         count = queryset.update(
             status=Topic.REJECTED,
             moderated_by=request.user,
             moderated_at=timezone.now(),
             moderation_comment='Відхилено через адмін-панель'
         )
-        # Створити історію модерації для кожної теми
-        for topic in queryset:
-            ModerationAction.objects.create(
-                topic=topic,
-                moderator=request.user,
-                action=ModerationAction.REJECT,
-                comment='Відхилено через адмін-панель'
-            )
+        # Історія модерації для всіх тем створюється одним INSERT у фоні
+        enqueue_on_commit(record_moderation_actions, {
+            'topic_ids': topic_ids,
+            'moderator_id': request.user.pk,
+            'action': ModerationAction.REJECT,
+            'comment': 'Відхилено через адмін-панель',
+        })
         self.message_user(request, f'{count} тем відхилено')
 
+    @admin.action(description="Видалити теми (м'яко)")
+    def soft_delete_topics(self, request, queryset):
+        author_ids = list(queryset.values_list('author_id', flat=True).distinct())
+        count = queryset.soft_delete()
+        recount_profile_stats(author_ids)
+        self.message_user(request, f'{count} тем видалено')
+
+    @admin.action(description='Відновити теми')
+    def restore_topics(self, request, queryset):
+        author_ids = list(queryset.values_list('author_id', flat=True).distinct())
+        count = queryset.restore()
+        recount_profile_stats(author_ids)
+        self.message_user(request, f'{count} тем відновлено')
+
 
 @admin.register(Post)
 class PostAdmin(admin.ModelAdmin):
-    list_display = ['topic', 'author', 'created_at']
-    list_filter = ['created_at', 'topic__category']
+    list_display = ['topic', 'author', 'created_at', 'is_deleted']
+    list_filter = ['is_deleted', 'created_at', 'topic__category']
     search_fields = ['content', 'author__username', 'topic__title']
-    readonly_fields = ['created_at', 'updated_at']
+    search_help_text = 'Пошук за вмістом повідомлень (повнотекстовий), автором та назвою теми'
+    readonly_fields = ['created_at', 'updated_at', 'deleted_at']
     ordering = ['-created_at']
+    list_select_related = ['topic', 'author']
+    autocomplete_fields = ['topic', 'author']
+    show_full_result_count = False
+    actions = ['soft_delete_posts', 'restore_posts']
+
+    def get_queryset(self, request):
+        return Post.all_objects.all()
+
+    @admin.action(description="Видалити повідомлення (м'яко)")
+    def soft_delete_posts(self, request, queryset):
+        author_ids = list(queryset.values_list('author_id', flat=True).distinct())
+        count = queryset.soft_delete()
+        recount_profile_stats(author_ids)
+        self.message_user(request, f'{count} повідомлень видалено')
+
+    @admin.action(description='Відновити повідомлення')
+    def restore_posts(self, request, queryset):
+        author_ids = list(queryset.values_list('author_id', flat=True).distinct())
+        count = queryset.restore()
+        recount_profile_stats(author_ids)
+        self.message_user(request, f'{count} повідомлень відновлено')
+
+    def get_search_results(self, request, queryset, search_term):
+        # Пошук по вмісту йде через індексований повнотекстовий пошук замість icontains,
+        # решта полів search_fields - звичайний icontains
+        if not search_term:
+            return queryset, False
+        filters = get_post_search_filter(search_term)
+        for field in self.search_fields:
+            if field != 'content':
+                filters |= Q(**{f'{field}__icontains': search_term})
+        return queryset.filter(filters), False
 
 
 @admin.register(ModerationAction)
 class ModerationActionAdmin(admin.ModelAdmin):
-    list_display = ['topic', 'moderator', 'action', 'created_at']
+    list_display = ['topic', 'target_user', 'moderator', 'action', 'created_at']
     list_filter = ['action', 'created_at', 'moderator']
-    search_fields = ['topic__title', 'moderator__username', 'comment']
+    search_fields = ['topic__title', 'target_user__username', 'moderator__username', 'comment']
     readonly_fields = ['created_at']
     ordering = ['-created_at']
+    list_select_related = ['topic', 'target_user', 'moderator']
+    show_full_result_count = False
 
     def has_add_permission(self, request):
         # Заборонити ручне створення через адмінку
@@ -118,3 +241,25 @@ class ModerationActionAdmin(admin.ModelAdmin):
     def has_change_permission(self, request, obj=None):
         # Заборонити редагування через адмінку
         return False
+
+
+@admin.register(Subscription)
+class SubscriptionAdmin(admin.ModelAdmin):
+    list_display = ['user', 'topic', 'category', 'created_at']
+    search_fields = ['user__username', 'topic__title', 'category__name']
+    list_select_related = ['user', 'topic', 'category__parent']
+    autocomplete_fields = ['user', 'topic', 'category']
+    ordering = ['-created_at']
+    show_full_result_count = False
+
+
+@admin.register(Notification)
+class NotificationAdmin(admin.ModelAdmin):
+    list_display = ['user', 'topic', 'posts_count', 'is_read', 'updated_at']
+    list_filter = ['is_read', 'updated_at']
+    search_fields = ['user__username', 'topic__title']
+    list_select_related = ['user', 'topic']
+    readonly_fields = ['created_at', 'updated_at']
+    raw_id_fields = ['user', 'topic', 'last_post']
+    ordering = ['-updated_at']
+    show_full_result_count = False
@@ -0,0 +1,258 @@
+"""
+JSON API лише для читання: категорії, теми, повідомлення та профілі.
+
+- ?fields=id,title - вибір полів (sparse fieldsets); невідоме поле - 400
+- ?cursor=<id>&limit=<n> - пагінація по курсору (keyset по id), відповідь
+  містить next_cursor для наступної сторінки або null
+- рядки читаються через values() без створення екземплярів моделей
+- ETag за вмістом відповіді: If-None-Match повертає 304 без тіла
+
+Видимість тем - Topic.objects.visible_to, як і в HTML-представленнях.
+"""
+import hashlib
+import json
+
+from django.contrib.auth.models import User
+from django.core.files.storage import default_storage
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse, JsonResponse
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.views import View
+
+from apps.core.ratelimit import RateLimitMixin
+from .models import Category, Topic
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+def media_url(name):
+    return default_storage.url(name) if name else None
+
+
+class ApiError(Exception):
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+
+
+class ApiView(RateLimitMixin, View):
+    """
+    Базове представлення. fields - словник "публічна назва -> шлях ORM",
+    default_fields - поля за замовчуванням, converters - перетворення значень
+    (наприклад, ім'я файлу в URL).
+    """
+    fields = {}
+    default_fields = None
+    converters = {}
+    ratelimit_scope = 'api'
+    ratelimit_methods = ('GET', 'HEAD')
+
+    def get_queryset(self):
+        raise NotImplementedError
+
+    def get_fields(self):
+        requested = self.request.GET.get('fields')
+        if not requested:
+            return list(self.default_fields or self.fields)
+        names = [name.strip() for name in requested.split(',') if name.strip()]
+        unknown = [name for name in names if name not in self.fields]
+        if unknown:
+            raise ApiError(f"Невідомі поля: {', '.join(unknown)}")
+        return names
+
+    def get_rows(self, queryset, names):
+        """values() по вибраних полях; id читається завжди (потрібен для курсора)"""
+        lookups = list(dict.fromkeys(['id', *(self.fields[name] for name in names)]))
+        rows = []
+        for values in queryset.values(*lookups):
+            row = {name: values[self.fields[name]] for name in names}
+            for name, convert in self.converters.items():
+                if name in row:
+                    row[name] = convert(row[name])
+            rows.append((values['id'], row))
+        return rows
+
+    def get_data(self):
+        raise NotImplementedError
+
+    def get(self, request, *args, **kwargs):
+        try:
+            data = self.get_data()
+        except ApiError as error:
+            return JsonResponse(
+                {'error': error.message}, status=error.status, json_dumps_params={'ensure_ascii': False}
+            )
+
+        body = json.dumps(data, cls=DjangoJSONEncoder, ensure_ascii=False).encode()
+        etag = '"%s"' % hashlib.md5(body).hexdigest()
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = HttpResponse(body, content_type='application/json')
+        response['ETag'] = etag
+        # Відповідь залежить від користувача: кешувати лише з перевіркою ETag
+        patch_vary_headers(response, ['Cookie'])
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+
+class ApiListView(ApiView):
+    """Список з пагінацією по курсору; ordering - 'id' або '-id'"""
+    ordering = '-id'
+
+    def get_limit(self):
+        try:
+            limit = int(self.request.GET.get('limit', DEFAULT_PAGE_SIZE))
+        except ValueError:
+            raise ApiError('limit має бути числом')
+        return max(1, min(limit, MAX_PAGE_SIZE))
+
+    def get_data(self):
+        names = self.get_fields()
+        limit = self.get_limit()
+        queryset = self.get_queryset().order_by(self.ordering)
+
+        cursor = self.request.GET.get('cursor')
+        if cursor:
+            try:
+                cursor = int(cursor)
+            except ValueError:
+                raise ApiError('Некоректний курсор')
+            lookup = 'pk__lt' if self.ordering.startswith('-') else 'pk__gt'
+            queryset = queryset.filter(**{lookup: cursor})
+
+        rows = self.get_rows(queryset[:limit + 1], names)
+        next_cursor = rows[limit - 1][0] if len(rows) > limit else None
+        return {'results': [row for _, row in rows[:limit]], 'next_cursor': next_cursor}
+
+
+class ApiDetailView(ApiView):
+    lookup_field = 'pk'
+
+    def get_data(self):
+        names = self.get_fields()
+        queryset = self.get_queryset().filter(**{self.lookup_field: self.kwargs[self.lookup_field]})
+        rows = self.get_rows(queryset[:1], names)
+        if not rows:
+            raise ApiError('Не знайдено', status=404)
+        return rows[0][1]
+
+
+CATEGORY_FIELDS = {
+    'id': 'id',
+    'name': 'name',
+    'description': 'description',
+    'parent_id': 'parent_id',
+    'created_at': 'created_at',
+}
+
+TOPIC_FIELDS = {
+    'id': 'id',
+    'title': 'title',
+    'category_id': 'category_id',
+    'author': 'author__username',
+    'status': 'status',
+    'is_pinned': 'is_pinned',
+    'is_closed': 'is_closed',
+    'is_archived': 'is_archived',
+    'views': 'views',
+    'created_at': 'created_at',
+    'updated_at': 'updated_at',
+}
+
+# Post та ArchivedPost мають однакові поля, тому обслуговуються одним описом
+POST_FIELDS = {
+    'id': 'id',
+    'topic_id': 'topic_id',
+    'author': 'author__username',
+    'content': 'content',
+    'created_at': 'created_at',
+    'updated_at': 'updated_at',
+}
+
+PROFILE_FIELDS = {
+    'username': 'username',
+    'date_joined': 'date_joined',
+    'role': 'profile__role__name',
+    'avatar': 'profile__avatar_small',
+    'location': 'profile__location',
+    'website': 'profile__website',
+    'bio': 'profile__bio',
+    'posts_count': 'profile__posts_count',
+    'topics_count': 'profile__topics_count',
+    'first_post_at': 'profile__first_post_at',
+    'last_active_at': 'profile__last_active_at',
+}
+
+
+class CategoryListView(ApiListView):
+    fields = CATEGORY_FIELDS
+    ordering = 'id'
+
+    def get_queryset(self):
+        queryset = Category.objects.all()
+        parent = self.request.GET.get('parent')
+        if parent == 'root':
+            queryset = queryset.filter(parent=None)
+        elif parent:
+            if not parent.isdigit():
+                raise ApiError("parent має бути числом або 'root'")
+            queryset = queryset.filter(parent_id=parent)
+        return queryset
+
+
+class CategoryDetailView(ApiDetailView):
+    fields = CATEGORY_FIELDS
+
+    def get_queryset(self):
+        return Category.objects.all()
+
+
+class TopicListView(ApiListView):
+    fields = TOPIC_FIELDS
+
+    def get_queryset(self):
+        queryset = Topic.objects.visible_to(self.request.user)
+        category = self.request.GET.get('category')
+        if category:
+            if not category.isdigit():
+                raise ApiError('category має бути числом')
+            queryset = queryset.filter(category_id=category)
+        author = self.request.GET.get('author')
+        if author:
+            queryset = queryset.filter(author__username=author)
+        status = self.request.GET.get('status')
+        if status:
+            queryset = queryset.filter(status=status)
+        return queryset
+
+
+class TopicDetailView(ApiDetailView):
+    fields = TOPIC_FIELDS
+
+    def get_queryset(self):
+        return Topic.objects.visible_to(self.request.user)
+
+
+class TopicPostListView(ApiListView):
+    """Повідомлення теми в хронологічному порядку (для архівних тем - з ArchivedPost)"""
+    fields = POST_FIELDS
+    ordering = 'id'
+
+    def get_queryset(self):
+        topic = Topic.objects.visible_to(self.request.user).filter(
+            pk=self.kwargs['pk']
+        ).only('pk', 'is_archived').first()
+        if topic is None:
+            raise ApiError('Не знайдено', status=404)
+        return topic.get_posts()
+
+
+class ProfileDetailView(ApiDetailView):
+    fields = PROFILE_FIELDS
+    converters = {'avatar': media_url}
+    lookup_field = 'username'
+
+    def get_queryset(self):
+        return User.objects.filter(is_active=True)
@@ -5,3 +5,7 @@ class ForumConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.forum'
     verbose_name = 'Форум'
+
+    def ready(self):
+        import apps.forum.models
+        import apps.forum.checks
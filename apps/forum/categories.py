@@ -0,0 +1,90 @@
+from apps.core.cache import TieredCache
+
+CATEGORY_TREE_CACHE_TIMEOUT = 60 * 60
+
+category_cache = TieredCache('forum:categories', timeout=CATEGORY_TREE_CACHE_TIMEOUT)
+
+
+def build_category_tree():
+    """
+    Будує дерево категорій одним запитом.
+    Повертає список словників (pk, name, parent_id, level) у порядку обходу в глибину,
+    діти кожної категорії відсортовані за назвою.
+    """
+    from .models import Category
+
+    children = {}
+    for pk, name, parent_id in Category.objects.order_by('name').values_list('pk', 'name', 'parent_id'):
+        children.setdefault(parent_id, []).append((pk, name))
+
+    tree = []
+    # Ітеративний обхід в глибину, щоб не впертися в ліміт рекурсії на глибоких деревах
+    stack = [(pk, name, None, 0) for pk, name in reversed(children.get(None, []))]
+    while stack:
+        pk, name, parent_id, level = stack.pop()
+        tree.append({'pk': pk, 'name': name, 'parent_id': parent_id, 'level': level})
+        for child_pk, child_name in reversed(children.get(pk, [])):
+            stack.append((child_pk, child_name, pk, level + 1))
+    return tree
+
+
+def get_category_tree():
+    """Повертає закешоване дерево категорій (див. build_category_tree)"""
+    return category_cache.get_or_set('tree', build_category_tree)
+
+
+def invalidate_category_tree():
+    category_cache.invalidate()
+
+
+def format_category_label(name, level):
+    """Назва з відступом згідно з рівнем вкладеності"""
+    indent = '—' * level
+    return f"{indent} {name}" if level > 0 else name
+
+
+def get_category_choices():
+    """Список (pk, назва з відступом) для полів вибору категорії"""
+    return [(node['pk'], format_category_label(node['name'], node['level'])) for node in get_category_tree()]
+
+
+def get_category_levels():
+    """Словник pk -> рівень вкладеності"""
+    return {node['pk']: node['level'] for node in get_category_tree()}
+
+
+def get_category_paths():
+    """Словник pk -> повний шлях категорії ("Батьківська → Дочірня"), як у Category.__str__"""
+    paths = {}
+    for node in get_category_tree():
+        parent_path = paths.get(node['parent_id'])
+        paths[node['pk']] = f"{parent_path} → {node['name']}" if parent_path else node['name']
+    return paths
+
+
+def get_category_ancestor_ids(pk):
+    """id категорії та всіх її батьківських категорій (від поточної до кореневої)"""
+    parents = {node['pk']: node['parent_id'] for node in get_category_tree()}
+    ids = []
+    while pk is not None and pk not in ids:
+        ids.append(pk)
+        pk = parents.get(pk)
+    return ids
+
+
+def get_category_descendant_ids(pk):
+    """id категорії та всіх її підкатегорій"""
+    ids = []
+    inside = False
+    level = 0
+    # Дерево впорядковане обходом в глибину: нащадки йдуть одразу за категорією
+    for node in get_category_tree():
+        if node['pk'] == pk:
+            inside = True
+            level = node['level']
+            ids.append(pk)
+        elif inside:
+            if node['level'] <= level:
+                break
+            ids.append(node['pk'])
+    return ids
@@ -0,0 +1,23 @@
+"""
+Системні перевірки форуму (python manage.py check).
+"""
+from django.core import checks
+from django.core.exceptions import FieldError
+
+
+@checks.register()
+def check_post_search(app_configs, **kwargs):
+    """
+    Повнотекстова умова пошуку повідомлень будується без помилок. Гілка PostgreSQL
+    перевіряється на будь-якій БД; на PostgreSQL запит додатково компілюється в SQL.
+    """
+    from .models import Post
+    from .search import get_post_search_filter, uses_full_text_search
+
+    try:
+        queryset = Post.objects.filter(get_post_search_filter('check', full_text=True))
+        if uses_full_text_search():
+            str(queryset.query)
+    except FieldError as error:
+        return [checks.Error(f'Повнотекстовий пошук повідомлень не працює: {error}', id='forum.E001')]
+    return []
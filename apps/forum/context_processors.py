@@ -0,0 +1,9 @@
+from .notifications import get_unread_count
+
+
+def notifications(request):
+    """Кількість непрочитаних сповіщень для навбару (з кешу, без COUNT на кожній сторінці)"""
+    user = getattr(request, 'user', None)
+    if user is None or not user.is_authenticated:
+        return {}
+    return {'unread_notifications_count': get_unread_count(user)}
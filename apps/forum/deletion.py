@@ -0,0 +1,125 @@
+"""
+Пакетне видалення великих обсягів вмісту: піддерева категорій та всього вмісту користувача.
+
+Замість каскадного видалення Django (яке завантажує всі пов'язані об'єкти в пам'ять
+і видаляє їх однією довгою транзакцією) записи видаляються знизу вгору невеликими
+пакетами, кожен у своїй транзакції. Перерваний процес можна просто запустити знову:
+кожен крок продовжує з тих записів, що залишились.
+
+progress - необов'язкова функція progress(stage, deleted, total), що викликається після кожного пакета.
+"""
+from django.contrib.auth.models import User
+from django.db import transaction
+
+from apps.users.stats import recount_profile_stats
+from .categories import build_category_tree
+from .models import ArchivedPost, Category, Post, Topic
+
+
+def delete_in_batches(queryset, batch_size=500, progress=None, stage=''):
+    """Видаляє записи queryset пакетами по batch_size; повертає кількість видалених"""
+    queryset = queryset.order_by('pk')
+    total = queryset.count() if progress else None
+    deleted = 0
+    while True:
+        ids = list(queryset.values_list('pk', flat=True)[:batch_size])
+        if not ids:
+            return deleted
+        with transaction.atomic():
+            queryset.model._base_manager.filter(pk__in=ids).delete()
+        deleted += len(ids)
+        if progress:
+            progress(stage, deleted, total)
+
+
+def get_author_ids(*querysets):
+    """id авторів записів querysets (без повторів)"""
+    author_ids = set()
+    for queryset in querysets:
+        author_ids.update(queryset.order_by().values_list('author_id', flat=True).distinct())
+    author_ids.discard(None)
+    return author_ids
+
+
+def recount_authors(author_ids, batch_size=500):
+    """
+    Перераховує агрегати профілів авторів пакетами: фізичне видалення не зменшує
+    лічильники інкрементно (як м'яке), тож їх треба перерахувати з нуля
+    """
+    author_ids = sorted(author_ids)
+    for start in range(0, len(author_ids), batch_size):
+        recount_profile_stats(author_ids[start:start + batch_size])
+
+
+def get_subtree_ids(category_id):
+    """id категорії та всіх її нащадків, від найглибших до кореня (порядок видалення)"""
+    tree = build_category_tree()
+    levels = {node['pk']: node['level'] for node in tree}
+    children = {}
+    for node in tree:
+        children.setdefault(node['parent_id'], []).append(node['pk'])
+    ids, stack = [], [category_id]
+    while stack:
+        pk = stack.pop()
+        ids.append(pk)
+        stack.extend(children.get(pk, []))
+    return sorted(ids, key=lambda pk: levels.get(pk, 0), reverse=True)
+
+
+def delete_category(category_id, batch_size=500, progress=None):
+    """
+    Видаляє категорію з усіма підкатегоріями, темами та повідомленнями
+    і перераховує агрегати профілів усіх авторів видаленого вмісту.
+    """
+    category_ids = get_subtree_ids(category_id)
+    topics = Topic.all_objects.filter(category_id__in=category_ids)
+    posts = Post.all_objects.filter(topic__category_id__in=category_ids)
+    archived_posts = ArchivedPost.objects.filter(topic__category_id__in=category_ids)
+    author_ids = get_author_ids(topics, posts, archived_posts)
+    deleted = {
+        'posts': delete_in_batches(posts, batch_size, progress, 'posts'),
+        'archived_posts': delete_in_batches(archived_posts, batch_size, progress, 'archived_posts'),
+        'topics': delete_in_batches(topics, batch_size, progress, 'topics'),
+        'categories': 0,
+    }
+    # Категорії - від листків до кореня, щоб кожне видалення не зачіпало підкатегорій
+    for pk in category_ids:
+        deleted['categories'] += Category.objects.filter(pk=pk).delete()[1].get('forum.Category', 0)
+    if progress:
+        progress('categories', deleted['categories'], len(category_ids))
+    recount_authors(author_ids, batch_size)
+    return deleted
+
+
+def delete_user_content(user_id, batch_size=500, progress=None, delete_user=False):
+    """
+    Видаляє всі теми та повідомлення користувача (включно з повідомленнями інших
+    користувачів у його темах); з delete_user=True - і сам обліковий запис.
+    Агрегати профілів перераховуються для всіх авторів видалених повідомлень.
+    """
+    user_topics = Topic.all_objects.filter(author_id=user_id)
+    author_ids = get_author_ids(
+        Post.all_objects.filter(topic__author_id=user_id),
+        ArchivedPost.objects.filter(topic__author_id=user_id),
+    )
+    author_ids.add(user_id)
+    deleted = {
+        'posts': delete_in_batches(
+            Post.all_objects.filter(author_id=user_id), batch_size, progress, 'posts'
+        ),
+        'archived_posts': delete_in_batches(
+            ArchivedPost.objects.filter(author_id=user_id), batch_size, progress, 'archived_posts'
+        ),
+    }
+    deleted['posts'] += delete_in_batches(
+        Post.all_objects.filter(topic__author_id=user_id), batch_size, progress, 'topic_posts'
+    )
+    deleted['archived_posts'] += delete_in_batches(
+        ArchivedPost.objects.filter(topic__author_id=user_id), batch_size, progress, 'topic_archived_posts'
+    )
+    deleted['topics'] = delete_in_batches(user_topics, batch_size, progress, 'topics')
+    if delete_user:
+        deleted['users'] = User.objects.filter(pk=user_id).delete()[1].get('auth.User', 0)
+        author_ids.discard(user_id)
+    recount_authors(author_ids, batch_size)
+    return deleted
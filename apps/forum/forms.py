@@ -1,15 +1,10 @@
 from django import forms
-from .models import Topic, Post, Category
+from .models import Topic, Post
+from .categories import get_category_choices
 from django_ckeditor_5.widgets import CKEditor5Widget
 
 
-class TopicCreateForm(forms.ModelForm):
-    content = forms.CharField(
-        label='Перше повідомлення (необов\'язково)',
-        widget=CKEditor5Widget(config_name='default'),
-        required=False
-    )
-
+class TopicUpdateForm(forms.ModelForm):
     class Meta:
         model = Topic
         fields = ['title', 'category']
@@ -25,18 +20,16 @@ class TopicCreateForm(forms.ModelForm):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        # Сортуємо категорії для правильного відображення ієрархії
-        categories = list(Category.objects.all().order_by('parent__name', 'name'))
+        # Закешоване дерево категорій з відступами для візуалізації ієрархії
+        self.fields['category'].choices = get_category_choices()
 
-        # Створюємо список choices з відступами для візуалізації ієрархії
-        category_choices = []
-        for category in categories:
-            level = category.get_level()
-            indent = '—' * level
-            label = f"{indent} {category.name}" if level > 0 else category.name
-            category_choices.append((category.pk, label))
 
-        self.fields['category'].choices = category_choices
+class TopicCreateForm(TopicUpdateForm):
+    content = forms.CharField(
+        label='Перше повідомлення (необов\'язково)',
+        widget=CKEditor5Widget(config_name='default'),
+        required=False
+    )
 
 
 class PostCreateForm(forms.ModelForm):
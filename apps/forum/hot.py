@@ -0,0 +1,101 @@
+"""
+Рейтинг "гарячих" тем.
+
+Topic.hot_score - логарифм суми подій теми (створення, повідомлення, перегляди),
+де кожна подія має вагу weight * exp(t / tau): нова подія важить більше за стару,
+а різниця у віці на HOT_SCORE_HALF_LIFE_HOURS зменшує її вагу вдвічі.
+Оскільки "старіють" лише відносні ваги, накопичений рейтинг не потрібно
+зменшувати з часом - нова подія просто додається до нього:
+
+    hot_score = log(exp(hot_score) + weight * exp(t / tau))
+
+Це обчислюється в самому UPDATE (стійкий log-sum-exp), тому інкрементне
+оновлення - один запит без читання рядка. Список гарячих тем - ORDER BY
+hot_score DESC по індексу. Команда refresh_hot_scores перераховує рейтинг
+активних тем з нуля (наприклад, після видалення повідомлень).
+"""
+import math
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db.models import F, Q, Value
+from django.db.models.functions import Abs, Exp, Greatest, Ln
+from django.utils import timezone
+
+# Точка відліку часу: ваги рахуються від неї, щоб значення залишались невеликими
+HOT_SCORE_EPOCH = datetime(2025, 1, 1, tzinfo=dt_timezone.utc)
+
+TOPIC_WEIGHT = 10.0
+POST_WEIGHT = 5.0
+VIEW_WEIGHT = 1.0
+
+
+def get_tau():
+    """Часова стала в секундах (вага події зменшується вдвічі за період напіврозпаду)"""
+    half_life = getattr(settings, 'HOT_SCORE_HALF_LIFE_HOURS', 24) * 3600
+    return half_life / math.log(2)
+
+
+def event_score(weight, when=None):
+    """log(weight * exp(t / tau)) для події в момент when"""
+    when = when or timezone.now()
+    return math.log(weight) + (when - HOT_SCORE_EPOCH).total_seconds() / get_tau()
+
+
+def log_sum_exp(scores):
+    scores = list(scores)
+    if not scores:
+        return 0.0
+    top = max(scores)
+    return top + math.log(sum(math.exp(score - top) for score in scores))
+
+
+def bump_expression(weight, when=None):
+    """Вираз для UPDATE: додає подію з вагою weight до поточного hot_score"""
+    event = Value(event_score(weight, when))
+    return Greatest(F('hot_score'), event) + Ln(1 + Exp(-Abs(F('hot_score') - event)))
+
+
+def initial_score(topic):
+    return event_score(TOPIC_WEIGHT, topic.created_at)
+
+
+def compute_score(topic, post_dates):
+    """Повний рейтинг теми: створення, повідомлення та перегляди (прив'язані до останньої активності)"""
+    scores = [event_score(TOPIC_WEIGHT, topic.created_at)]
+    scores.extend(event_score(POST_WEIGHT, created_at) for created_at in post_dates)
+    if topic.views:
+        last_activity = max([topic.created_at, *post_dates])
+        scores.append(event_score(VIEW_WEIGHT * topic.views, last_activity))
+    return log_sum_exp(scores)
+
+
+def refresh_hot_scores(days=None, batch_size=500):
+    """
+    Перераховує hot_score тем з активністю за останні days днів
+    (за замовчуванням HOT_SCORE_REFRESH_DAYS). Старіші теми мають настільки
+    малу вагу, що їх рейтинг не впливає на список. Повертає кількість тем.
+    """
+    from .models import Post, Topic
+
+    days = days if days is not None else getattr(settings, 'HOT_SCORE_REFRESH_DAYS', 7)
+    cutoff = timezone.now() - timedelta(days=days)
+    topics = Topic.objects.filter(
+        Q(created_at__gte=cutoff) | Q(pk__in=Post.objects.filter(created_at__gte=cutoff).values('topic_id'))
+    ).only('pk', 'created_at', 'views', 'hot_score')
+    updated = 0
+    last_pk = 0
+    while True:
+        batch = list(topics.filter(pk__gt=last_pk).order_by('pk')[:batch_size])
+        if not batch:
+            return updated
+        post_dates = {}
+        for topic_id, created_at in Post.objects.filter(
+            topic__in=batch, created_at__gte=cutoff
+        ).values_list('topic_id', 'created_at'):
+            post_dates.setdefault(topic_id, []).append(created_at)
+        for topic in batch:
+            topic.hot_score = compute_score(topic, post_dates.get(topic.pk, []))
+        Topic.objects.bulk_update(batch, ['hot_score'])
+        updated += len(batch)
+        last_pk = batch[-1].pk
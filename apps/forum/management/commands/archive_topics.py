@@ -0,0 +1,21 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from apps.forum.retention import archive_topics
+
+
+class Command(BaseCommand):
+    help = 'Перенесення повідомлень старих закритих тем в архівну таблицю'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, help='Архівувати теми без активності більше N днів '
+                                                     '(за замовчуванням ARCHIVE_TOPICS_AFTER_DAYS)')
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--limit', type=int, help='Максимальна кількість тем за запуск')
+
+    def handle(self, *args, **options):
+        older_than = timedelta(days=options['days']) if options['days'] is not None else None
+        topics, posts = archive_topics(older_than, batch_size=options['batch_size'], limit=options['limit'])
+        self.stdout.write(
+            self.style.SUCCESS(f'Архівовано тем: {topics}, повідомлень: {posts}')
+        )
@@ -0,0 +1,105 @@
+import logging
+import threading
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connection, connections
+from django.test import Client
+from django.test.utils import override_settings
+from apps.forum.deletion import delete_user_content
+from apps.forum.models import Category
+
+WRITER_PREFIX = 'benchmark-writer-'
+
+
+class Command(BaseCommand):
+    help = ('Пропускна здатність створення тем (POST /topic/create/) кількома потоками '
+            'з ATOMIC_REQUESTS вимкненим та увімкненим. Створені теми потім видаляються.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=4)
+        parser.add_argument('--topics', type=int, default=25, help='Тем на потік')
+        parser.add_argument('--modes', default='off,on', help='Режими ATOMIC_REQUESTS через кому: off,on')
+        parser.add_argument('--keep', action='store_true', help='Не видаляти створені теми')
+
+    def get_writers(self, count):
+        writers = []
+        for index in range(count):
+            user, created = User.objects.get_or_create(username=f'{WRITER_PREFIX}{index}')
+            if created:
+                user.set_unusable_password()
+                user.save()
+            writers.append(user)
+        return writers
+
+    def write_topics(self, user, category, count, results):
+        client = Client(raise_request_exception=False)
+        client.force_login(user)
+        ok = failed = 0
+        try:
+            for index in range(count):
+                response = client.post('/topic/create/', {
+                    'title': f'Benchmark write {user.pk}-{index}',
+                    'category': category.pk,
+                    'content': f'<p>Benchmark post {index}</p>',
+                })
+                if response.status_code == 302:
+                    ok += 1
+                else:
+                    failed += 1
+        finally:
+            connection.close()
+        results.append((ok, failed))
+
+    def run_mode(self, atomic, writers, category, topics):
+        db_settings = connections.settings[DEFAULT_DB_ALIAS]
+        previous = db_settings.get('ATOMIC_REQUESTS', False)
+        db_settings['ATOMIC_REQUESTS'] = atomic
+        results = []
+        threads = [
+            threading.Thread(target=self.write_topics, args=(writer, category, topics, results))
+            for writer in writers
+        ]
+        try:
+            started = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            elapsed = time.perf_counter() - started
+        finally:
+            db_settings['ATOMIC_REQUESTS'] = previous
+        ok = sum(result[0] for result in results)
+        failed = sum(result[1] for result in results)
+        return ok, failed, elapsed
+
+    def handle(self, *args, **options):
+        modes = [mode.strip() for mode in options['modes'].split(',') if mode.strip()]
+        if not modes or any(mode not in ('off', 'on') for mode in modes):
+            raise CommandError('--modes: off, on або off,on')
+        category = Category.objects.order_by('pk').first()
+        if category is None:
+            raise CommandError('Немає жодної категорії')
+        writers = self.get_writers(options['threads'])
+
+        # Ліміти частоти для створення тем вимкнені, щоб вимірювати сам запис;
+        # помилки (наприклад, блокування SQLite) рахуються, а не логуються кожна окремо
+        request_logger = logging.getLogger('django.request')
+        previous_level = request_logger.level
+        request_logger.setLevel(logging.CRITICAL)
+        try:
+            with override_settings(ALLOWED_HOSTS=['*'], RATE_LIMITS={}):
+                for mode in modes:
+                    ok, failed, elapsed = self.run_mode(mode == 'on', writers, category, options['topics'])
+                    self.stdout.write(
+                        f'ATOMIC_REQUESTS={mode}: {ok} тем за {elapsed:.2f} с '
+                        f'({ok / elapsed:.1f} тем/с), помилок: {failed}'
+                    )
+        finally:
+            request_logger.setLevel(previous_level)
+
+        if not options['keep']:
+            for writer in writers:
+                delete_user_content(writer.pk)
+        self.stdout.write(self.style.SUCCESS('Готово'))
@@ -0,0 +1,92 @@
+import random
+import statistics
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+from apps.forum.models import Category, Topic
+
+BENCHMARK_CATEGORY = 'Benchmark'
+
+
+class Command(BaseCommand):
+    help = ('Порівняння фільтра видимості тем: OR-предикат проти Topic.objects.visible_to. '
+            'Виводить плани запитів та медіанний час сторінки списку і COUNT для звичайного користувача.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=0,
+                            help='Спочатку створити стільки тем у категорії "Benchmark"')
+        parser.add_argument('--user', help="Ім'я користувача (за замовчуванням - будь-який не модератор)")
+        parser.add_argument('--runs', type=int, default=20)
+        parser.add_argument('--explain', action='store_true', help='Вивести плани запитів')
+
+    def seed(self, count):
+        authors = list(User.objects.values_list('pk', flat=True)[:100])
+        if not authors:
+            raise CommandError('Немає користувачів для авторства тем')
+        category, _ = Category.objects.get_or_create(name=BENCHMARK_CATEGORY, parent=None)
+        # Приблизно як на живому форумі: переважна більшість тем схвалена
+        statuses = [Topic.APPROVED] * 18 + [Topic.PENDING, Topic.REJECTED]
+        batch = []
+        for index in range(count):
+            batch.append(Topic(
+                title=f'Benchmark topic {index}',
+                category=category,
+                author_id=random.choice(authors),
+                status=random.choice(statuses),
+            ))
+            if len(batch) >= 1000:
+                Topic.objects.bulk_create(batch)
+                batch = []
+        Topic.objects.bulk_create(batch)
+        self.stdout.write(f'Створено тем: {count}')
+
+    def get_user(self, username):
+        users = User.objects.select_related('profile__role')
+        if username:
+            user = users.filter(username=username).first()
+            if user is None:
+                raise CommandError(f'Користувача {username} не знайдено')
+            return user
+        user = users.exclude(profile__role__can_moderate_topics=True).first()
+        if user is None:
+            raise CommandError('Немає користувача без права модерації')
+        return user
+
+    def measure(self, build_queryset, runs):
+        """Медіани (мс) для першої сторінки списку та COUNT; queryset будується в кожному запуску"""
+        page, count = [], []
+        for _ in range(runs):
+            started = time.perf_counter()
+            list(build_queryset().order_by('-created_at').values_list('pk', flat=True)[:20])
+            page.append((time.perf_counter() - started) * 1000)
+            started = time.perf_counter()
+            build_queryset().count()
+            count.append((time.perf_counter() - started) * 1000)
+        return statistics.median(page), statistics.median(count)
+
+    def handle(self, *args, **options):
+        if options['seed']:
+            self.seed(options['seed'])
+        user = self.get_user(options['user'])
+
+        variants = [
+            ('OR', lambda: Topic.objects.filter(Q(status=Topic.APPROVED) | Q(author=user))),
+            ('visible_to', lambda: Topic.objects.visible_to(user)),
+        ]
+        hidden = Topic.objects.filter(author=user).exclude(status=Topic.APPROVED).count()
+        self.stdout.write(
+            f'Користувач: {user.username} (неопублікованих тем: {hidden}), '
+            f'тем: {Topic.objects.count()}, запусків: {options["runs"]}'
+        )
+        results = {}
+        for name, build_queryset in variants:
+            if options['explain']:
+                self.stdout.write(f'\n{name}:\n{build_queryset().order_by("-created_at")[:20].explain()}\n')
+            results[name] = self.measure(build_queryset, options['runs'])
+        for name, (page, count) in results.items():
+            self.stdout.write(f'{name}: сторінка {page:.2f} мс, COUNT {count:.2f} мс')
+        self.stdout.write(self.style.SUCCESS(
+            f'Сторінка visible_to відносно OR: {results["OR"][0] / results["visible_to"][0]:.2f}x'
+        ))
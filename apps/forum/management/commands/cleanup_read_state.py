@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+from apps.forum.readstate import cleanup_read_state
+
+
+class Command(BaseCommand):
+    help = 'Видалення застарілих записів про прочитані теми'
+
+    def handle(self, *args, **options):
+        deleted = cleanup_read_state()
+        self.stdout.write(
+            self.style.SUCCESS(f'Видалено записів: {deleted}')
+        )
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandError
+from apps.forum.deletion import delete_category, delete_user_content
+from apps.forum.models import Category
+from django.contrib.auth.models import User
+
+
+class Command(BaseCommand):
+    help = ('Пакетне видалення категорії з підкатегоріями або всього вмісту користувача. '
+            'Кожен пакет комітиться окремо, тому перервану команду можна запустити знову.')
+
+    def add_arguments(self, parser):
+        target = parser.add_mutually_exclusive_group(required=True)
+        target.add_argument('--category', type=int, help='id категорії')
+        target.add_argument('--user', help="Ім'я користувача")
+        parser.add_argument('--delete-user', action='store_true', help='Видалити також обліковий запис')
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def progress(self, stage, deleted, total):
+        suffix = f' / {total}' if total is not None else ''
+        self.stdout.write(f'  {stage}: {deleted}{suffix}')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        if options['category'] is not None:
+            if not Category.objects.filter(pk=options['category']).exists():
+                raise CommandError(f'Категорію {options["category"]} не знайдено')
+            deleted = delete_category(options['category'], batch_size, self.progress)
+        else:
+            user = User.objects.filter(username=options['user']).first()
+            if user is None:
+                raise CommandError(f'Користувача {options["user"]} не знайдено')
+            deleted = delete_user_content(user.pk, batch_size, self.progress, delete_user=options['delete_user'])
+
+        summary = ', '.join(f'{name}: {count}' for name, count in deleted.items())
+        self.stdout.write(self.style.SUCCESS(f'Видалено - {summary}'))
@@ -0,0 +1,20 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from apps.forum.retention import purge_deleted
+
+
+class Command(BaseCommand):
+    help = "Фізичне видалення м'яко видалених тем і повідомлень (пакетами)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, help='Видаляти записи, видалені більше ніж N днів тому '
+                                                     '(за замовчуванням PURGE_DELETED_AFTER_DAYS)')
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        older_than = timedelta(days=options['days']) if options['days'] is not None else None
+        posts, topics = purge_deleted(older_than, batch_size=options['batch_size'])
+        self.stdout.write(
+            self.style.SUCCESS(f'Видалено повідомлень: {posts}, тем: {topics}')
+        )
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from apps.forum.hot import refresh_hot_scores
+
+
+class Command(BaseCommand):
+    help = 'Перерахунок рейтингу гарячих тем для тем з недавньою активністю'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, help='Період активності (за замовчуванням HOT_SCORE_REFRESH_DAYS)')
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        updated = refresh_hot_scores(options['days'], batch_size=options['batch_size'])
+        self.stdout.write(
+            self.style.SUCCESS(f'Оновлено рейтинг тем: {updated}')
+        )
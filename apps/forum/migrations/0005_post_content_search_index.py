@@ -0,0 +1,29 @@
+from django.db import migrations
+
+
+def create_search_index(apps, schema_editor):
+    """GIN-індекс для повнотекстового пошуку (тільки PostgreSQL)"""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    from apps.forum.search import get_post_content_index
+    Post = apps.get_model('forum', 'Post')
+    schema_editor.add_index(Post, get_post_content_index())
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    from apps.forum.search import get_post_content_index
+    Post = apps.get_model('forum', 'Post')
+    schema_editor.remove_index(Post, get_post_content_index())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forum', '0004_moderationaction_topic_moderated_at_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, reverse_code=drop_search_index),
+    ]
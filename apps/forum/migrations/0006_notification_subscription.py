@@ -0,0 +1,52 @@
+# Generated by Django 6.0 on 2026-10-19 05:02
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forum', '0005_post_content_search_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Notification',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('posts_count', models.PositiveIntegerField(default=1, verbose_name='Нових повідомлень')),
+                ('is_read', models.BooleanField(default=False, verbose_name='Прочитано')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Створено')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Оновлено')),
+                ('last_post', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='forum.post', verbose_name='Останнє повідомлення')),
+                ('topic', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='notifications', to='forum.topic', verbose_name='Тема')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='notifications', to=settings.AUTH_USER_MODEL, verbose_name='Користувач')),
+            ],
+            options={
+                'verbose_name': 'Сповіщення',
+                'verbose_name_plural': 'Сповіщення',
+                'ordering': ['-updated_at'],
+                'indexes': [models.Index(fields=['user', 'is_read', '-updated_at'], name='forum_notif_user_id_5fd691_idx')],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('is_read', False)), fields=('user', 'topic'), name='unique_unread_notification')],
+            },
+        ),
+        migrations.CreateModel(
+            name='Subscription',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Створено')),
+                ('category', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='subscriptions', to='forum.category', verbose_name='Категорія')),
+                ('topic', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='subscriptions', to='forum.topic', verbose_name='Тема')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='subscriptions', to=settings.AUTH_USER_MODEL, verbose_name='Користувач')),
+            ],
+            options={
+                'verbose_name': 'Підписка',
+                'verbose_name_plural': 'Підписки',
+                'ordering': ['-created_at'],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('topic__isnull', False)), fields=('user', 'topic'), name='unique_topic_subscription'), models.UniqueConstraint(condition=models.Q(('category__isnull', False)), fields=('user', 'category'), name='unique_category_subscription'), models.CheckConstraint(condition=models.Q(models.Q(('category__isnull', True), ('topic__isnull', False)), models.Q(('category__isnull', False), ('topic__isnull', True)), _connector='OR'), name='subscription_single_target')],
+            },
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 6.0 on 2026-10-19 05:31
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forum', '0006_notification_subscription'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CategoryReadMark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('last_read_post_id', models.PositiveBigIntegerField(default=0, verbose_name='Останнє прочитане повідомлення')),
+                ('marked_at', models.DateTimeField(auto_now=True, verbose_name='Позначено')),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='read_marks', to='forum.category', verbose_name='Категорія')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='category_read_marks', to=settings.AUTH_USER_MODEL, verbose_name='Користувач')),
+            ],
+            options={
+                'verbose_name': 'Позначка прочитання категорії',
+                'verbose_name_plural': 'Позначки прочитання категорій',
+                'constraints': [models.UniqueConstraint(fields=('user', 'category'), name='unique_category_read_mark')],
+            },
+        ),
+        migrations.CreateModel(
+            name='TopicReadState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('last_read_post_id', models.PositiveBigIntegerField(default=0, verbose_name='Останнє прочитане повідомлення')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Оновлено')),
+                ('topic', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='read_states', to='forum.topic', verbose_name='Тема')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='topic_read_states', to=settings.AUTH_USER_MODEL, verbose_name='Користувач')),
+            ],
+            options={
+                'verbose_name': 'Стан прочитання теми',
+                'verbose_name_plural': 'Стани прочитання тем',
+                'indexes': [models.Index(fields=['updated_at'], name='forum_topic_updated_1a0c8b_idx')],
+                'constraints': [models.UniqueConstraint(fields=('user', 'topic'), name='unique_topic_read_state')],
+            },
+        ),
+    ]
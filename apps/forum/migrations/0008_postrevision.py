@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:28
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forum', '0007_categoryreadmark_topicreadstate'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostRevision',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('number', models.PositiveIntegerField(verbose_name='Номер версії')),
+                ('is_snapshot', models.BooleanField(default=False, verbose_name='Повна копія')),
+                ('data', models.JSONField(verbose_name='Дані')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Створено')),
+                ('editor', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='Редактор')),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='revisions', to='forum.post', verbose_name='Повідомлення')),
+            ],
+            options={
+                'verbose_name': 'Версія повідомлення',
+                'verbose_name_plural': 'Версії повідомлень',
+                'ordering': ['post', 'number'],
+                'constraints': [models.UniqueConstraint(fields=('post', 'number'), name='unique_post_revision')],
+            },
+        ),
+    ]
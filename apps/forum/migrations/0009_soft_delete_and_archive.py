@@ -0,0 +1,59 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:29
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forum', '0008_postrevision'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Дата видалення'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='is_deleted',
+            field=models.BooleanField(default=False, verbose_name='Видалено'),
+        ),
+        migrations.AddField(
+            model_name='topic',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Дата видалення'),
+        ),
+        migrations.AddField(
+            model_name='topic',
+            name='is_archived',
+            field=models.BooleanField(default=False, verbose_name='В архіві'),
+        ),
+        migrations.AddField(
+            model_name='topic',
+            name='is_deleted',
+            field=models.BooleanField(default=False, verbose_name='Видалено'),
+        ),
+        migrations.CreateModel(
+            name='ArchivedPost',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('content', models.TextField(verbose_name='Повідомлення')),
+                ('created_at', models.DateTimeField(verbose_name='Створено')),
+                ('updated_at', models.DateTimeField(verbose_name='Оновлено')),
+                ('archived_at', models.DateTimeField(auto_now_add=True, verbose_name='Архівовано')),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_posts', to=settings.AUTH_USER_MODEL, verbose_name='Автор')),
+                ('topic', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_posts', to='forum.topic', verbose_name='Тема')),
+            ],
+            options={
+                'verbose_name': 'Архівне повідомлення',
+                'verbose_name_plural': 'Архівні повідомлення',
+                'ordering': ['created_at'],
+                'indexes': [models.Index(fields=['topic', 'created_at'], name='forum_archi_topic_i_b274a8_idx')],
+            },
+        ),
+    ]
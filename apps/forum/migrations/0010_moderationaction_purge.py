@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:31
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forum', '0009_soft_delete_and_archive'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='moderationaction',
+            name='target_user',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='moderation_targets', to=settings.AUTH_USER_MODEL, verbose_name='Користувач'),
+        ),
+        migrations.AlterField(
+            model_name='moderationaction',
+            name='action',
+            field=models.CharField(choices=[('approve', 'Схвалено'), ('reject', 'Відхилено'), ('purge', 'Блокування з видаленням вмісту')], max_length=20, verbose_name='Дія'),
+        ),
+        migrations.AlterField(
+            model_name='moderationaction',
+            name='topic',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='moderation_history', to='forum.topic', verbose_name='Тема'),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:32
+
+import math
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.db import migrations, models
+
+# Значення apps.forum.hot на момент міграції: вона не залежить від поточного коду
+# та налаштувань (рейтинг за актуальними параметрами перераховує refresh_hot_scores)
+HOT_SCORE_EPOCH = datetime(2025, 1, 1, tzinfo=timezone.utc)
+HOT_SCORE_HALF_LIFE_HOURS = 24
+TOPIC_WEIGHT = 10.0
+
+
+def set_initial_hot_scores(apps, schema_editor):
+    """Початковий рейтинг існуючих тем - за датою створення: log(weight) + t / tau"""
+    tau = HOT_SCORE_HALF_LIFE_HOURS * 3600 / math.log(2)
+    Topic = apps.get_model('forum', 'Topic')
+    batch = []
+    for topic in Topic.objects.only('pk', 'created_at').iterator(chunk_size=1000):
+        topic.hot_score = math.log(TOPIC_WEIGHT) + (topic.created_at - HOT_SCORE_EPOCH).total_seconds() / tau
+        batch.append(topic)
+        if len(batch) >= 1000:
+            Topic.objects.bulk_update(batch, ['hot_score'])
+            batch = []
+    Topic.objects.bulk_update(batch, ['hot_score'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forum', '0010_moderationaction_purge'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='topic',
+            name='hot_score',
+            field=models.FloatField(default=0, verbose_name='Рейтинг активності'),
+        ),
+        migrations.AddIndex(
+            model_name='topic',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['status', '-hot_score'], name='forum_topic_hot_idx'),
+        ),
+        migrations.RunPython(set_initial_hot_scores, migrations.RunPython.noop),
+    ]
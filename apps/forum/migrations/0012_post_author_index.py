@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:34
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forum', '0011_topic_hot_score'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['author', '-id'], name='forum_post_author__f6fd30_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-19 05:02
+
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forum', '0012_post_author_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedpost',
+            name='revisions',
+            field=models.JSONField(blank=True, default=list, encoder=django.core.serializers.json.DjangoJSONEncoder, verbose_name='Версії'),
+        ),
+    ]
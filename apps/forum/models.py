@@ -1,6 +1,10 @@
 from django.db import models
+from django.core.serializers.json import DjangoJSONEncoder
 from django.contrib.auth.models import User
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
 from django.urls import reverse
+from django.utils import timezone
 from django_ckeditor_5.fields import CKEditor5Field
 
 
@@ -65,6 +69,60 @@ class Category(models.Model):
         return level
 
 
+class SoftDeleteQuerySet(models.QuerySet):
+    def soft_delete(self):
+        """М'яке видалення одним UPDATE; рядки фізично видаляє purge_deleted"""
+        return self.update(is_deleted=True, deleted_at=timezone.now())
+
+    def restore(self):
+        return self.update(is_deleted=False, deleted_at=None)
+
+
+class SoftDeleteManager(models.Manager.from_queryset(SoftDeleteQuerySet)):
+    """Менеджер за замовчуванням: приховує м'яко видалені записи"""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(is_deleted=False)
+
+
+# Скільки власних неопублікованих тем підставляти в запит списком
+VISIBLE_HIDDEN_IDS_LIMIT = 500
+
+
+def can_see_all_topics(user):
+    """Модератори бачать теми з будь-яким статусом"""
+    return (user.is_authenticated and hasattr(user, 'profile')
+            and user.profile.has_permission('can_moderate_topics'))
+
+
+class TopicQuerySet(SoftDeleteQuerySet):
+    def visible_to(self, user):
+        """
+        Теми, доступні користувачу: анонімним - схвалені, модераторам - всі,
+        іншим - схвалені та власні.
+
+        Для звичайних користувачів множина - об'єднання схвалених тем і власних
+        неопублікованих. Друга частина зазвичай порожня або з кількох рядків, тому
+        спочатку читається окремо по індексу автора: тоді основний запит - лише
+        status = 'approved', і список з ORDER BY ... LIMIT читається по індексу
+        (status, -created_at) без сортування всіх тем, як з OR-предикатом.
+        """
+        if not user.is_authenticated:
+            return self.filter(status=Topic.APPROVED)
+        if can_see_all_topics(user):
+            return self
+        hidden = Topic.all_objects.filter(author=user).exclude(
+            status=Topic.APPROVED
+        ).values_list('pk', flat=True)
+        hidden_ids = list(hidden[:VISIBLE_HIDDEN_IDS_LIMIT + 1])
+        if not hidden_ids:
+            return self.filter(status=Topic.APPROVED)
+        if len(hidden_ids) > VISIBLE_HIDDEN_IDS_LIMIT:
+            # Завеликий список для IN (...) - підзапит
+            hidden_ids = hidden
+        return self.filter(models.Q(status=Topic.APPROVED) | models.Q(pk__in=hidden_ids))
+
+
 class Topic(models.Model):
     # Статуси модерації
     PENDING = 'pending'
@@ -111,12 +169,28 @@ class Topic(models.Model):
         verbose_name="Коментар модератора"
     )
 
+    is_deleted = models.BooleanField(default=False, verbose_name="Видалено")
+    deleted_at = models.DateTimeField(null=True, blank=True, verbose_name="Дата видалення")
+    # Повідомлення архівної теми перенесені в ArchivedPost
+    is_archived = models.BooleanField(default=False, verbose_name="В архіві")
+
+    # Рейтинг "гарячих" тем, див. apps.forum.hot
+    hot_score = models.FloatField(default=0, verbose_name="Рейтинг активності")
+
+    objects = SoftDeleteManager.from_queryset(TopicQuerySet)()
+    all_objects = TopicQuerySet.as_manager()
+
     class Meta:
         verbose_name = "Тема"
         verbose_name_plural = "Теми"
         ordering = ['-is_pinned', '-updated_at']
         indexes = [
             models.Index(fields=['status', '-created_at']),
+            models.Index(
+                fields=['status', '-hot_score'],
+                condition=models.Q(is_deleted=False),
+                name='forum_topic_hot_idx'
+            ),
         ]
 
     def __str__(self):
@@ -125,11 +199,21 @@ class Topic(models.Model):
     def get_absolute_url(self):
         return reverse('forum:topic_detail', kwargs={'pk': self.pk})
 
+    def is_visible_to(self, user):
+        """Перевірка для вже завантаженої теми (ті ж правила, що й Topic.objects.visible_to)"""
+        if self.status == Topic.APPROVED:
+            return True
+        return user.is_authenticated and (user.pk == self.author_id or can_see_all_topics(user))
+
+    def get_posts(self):
+        """Повідомлення теми з робочої або архівної таблиці"""
+        return self.archived_posts.all() if self.is_archived else self.posts.all()
+
     def get_posts_count(self):
-        return self.posts.count()
+        return self.get_posts().count()
 
     def get_last_post(self):
-        return self.posts.order_by('-created_at').first()
+        return self.get_posts().order_by('-created_at').first()
 
 
 class Post(models.Model):
@@ -138,11 +222,20 @@ class Post(models.Model):
     content = CKEditor5Field(verbose_name="Повідомлення", config_name='default')
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Створено")
     updated_at = models.DateTimeField(auto_now=True, verbose_name="Оновлено")
+    is_deleted = models.BooleanField(default=False, verbose_name="Видалено")
+    deleted_at = models.DateTimeField(null=True, blank=True, verbose_name="Дата видалення")
+
+    objects = SoftDeleteManager()
+    all_objects = SoftDeleteQuerySet.as_manager()
 
     class Meta:
         verbose_name = "Повідомлення"
         verbose_name_plural = "Повідомлення"
         ordering = ['created_at']
+        indexes = [
+            # Останні повідомлення користувача та стрічка активності (keyset по id)
+            models.Index(fields=['author', '-id']),
+        ]
 
     def __str__(self):
         return f"{self.author.username} - {self.topic.title[:50]}"
@@ -150,23 +243,72 @@ class Post(models.Model):
     def get_absolute_url(self):
         return reverse('forum:topic_detail', kwargs={'pk': self.topic.pk})
 
+    def soft_delete(self):
+        from apps.users.stats import record_post_removed
+        if Post.all_objects.filter(pk=self.pk, is_deleted=False).soft_delete():
+            record_post_removed(self.author_id)
+
+
+class ArchivedPost(models.Model):
+    """
+    Повідомлення архівної теми. Переносяться з Post командою archive_topics,
+    щоб робоча таблиця forum_post залишалась невеликою; id зберігаються.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    topic = models.ForeignKey(Topic, on_delete=models.CASCADE, related_name='archived_posts', verbose_name="Тема")
+    author = models.ForeignKey(User, on_delete=models.CASCADE, related_name='archived_posts', verbose_name="Автор")
+    content = models.TextField(verbose_name="Повідомлення")
+    created_at = models.DateTimeField(verbose_name="Створено")
+    updated_at = models.DateTimeField(verbose_name="Оновлено")
+    archived_at = models.DateTimeField(auto_now_add=True, verbose_name="Архівовано")
+    # Історія редагувань (PostRevision) на момент архівування: список словників
+    # number, editor_id, is_snapshot, data, created_at у порядку номерів версій
+    revisions = models.JSONField(default=list, blank=True, encoder=DjangoJSONEncoder, verbose_name="Версії")
+
+    class Meta:
+        verbose_name = "Архівне повідомлення"
+        verbose_name_plural = "Архівні повідомлення"
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['topic', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.author.username} - {self.topic.title[:50]}"
+
+    def get_absolute_url(self):
+        return reverse('forum:topic_detail', kwargs={'pk': self.topic_id})
+
 
 class ModerationAction(models.Model):
     """Історія дій модерації"""
     APPROVE = 'approve'
     REJECT = 'reject'
+    PURGE = 'purge'
 
     ACTION_CHOICES = [
         (APPROVE, 'Схвалено'),
         (REJECT, 'Відхилено'),
+        (PURGE, 'Блокування з видаленням вмісту'),
     ]
 
+    # Для дій над темою - тема; для дій над користувачем (PURGE) - target_user
     topic = models.ForeignKey(
         Topic,
         on_delete=models.CASCADE,
+        null=True,
+        blank=True,
         related_name='moderation_history',
         verbose_name="Тема"
     )
+    target_user = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='moderation_targets',
+        verbose_name="Користувач"
+    )
     moderator = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
@@ -193,4 +335,199 @@ class ModerationAction(models.Model):
         ordering = ['-created_at']
 
     def __str__(self):
-        return f"{self.get_action_display()} - {self.topic.title} ({self.moderator.username})"
+        target = self.topic.title if self.topic_id else getattr(self.target_user, 'username', '-')
+        return f"{self.get_action_display()} - {target} ({self.moderator.username})"
+
+
+
+class Subscription(models.Model):
+    """Підписка користувача на тему або категорію (включно з підкатегоріями)"""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='subscriptions', verbose_name="Користувач")
+    topic = models.ForeignKey(
+        Topic,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='subscriptions',
+        verbose_name="Тема"
+    )
+    category = models.ForeignKey(
+        Category,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='subscriptions',
+        verbose_name="Категорія"
+    )
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Створено")
+
+    class Meta:
+        verbose_name = "Підписка"
+        verbose_name_plural = "Підписки"
+        ordering = ['-created_at']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'topic'],
+                condition=models.Q(topic__isnull=False),
+                name='unique_topic_subscription'
+            ),
+            models.UniqueConstraint(
+                fields=['user', 'category'],
+                condition=models.Q(category__isnull=False),
+                name='unique_category_subscription'
+            ),
+            models.CheckConstraint(
+                condition=(
+                    models.Q(topic__isnull=False, category__isnull=True) |
+                    models.Q(topic__isnull=True, category__isnull=False)
+                ),
+                name='subscription_single_target'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} → {self.topic or self.category}"
+
+
+class Notification(models.Model):
+    """
+    Сповіщення про нові повідомлення в темі.
+    Непрочитане сповіщення одне на (користувач, тема): нові повідомлення
+    збільшують posts_count замість створення нових записів.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='notifications', verbose_name="Користувач")
+    topic = models.ForeignKey(Topic, on_delete=models.CASCADE, related_name='notifications', verbose_name="Тема")
+    last_post = models.ForeignKey(
+        Post,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+        verbose_name="Останнє повідомлення"
+    )
+    posts_count = models.PositiveIntegerField(default=1, verbose_name="Нових повідомлень")
+    is_read = models.BooleanField(default=False, verbose_name="Прочитано")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Створено")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Оновлено")
+
+    class Meta:
+        verbose_name = "Сповіщення"
+        verbose_name_plural = "Сповіщення"
+        ordering = ['-updated_at']
+        indexes = [
+            models.Index(fields=['user', 'is_read', '-updated_at']),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'topic'],
+                condition=models.Q(is_read=False),
+                name='unique_unread_notification'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username}: {self.topic.title} (+{self.posts_count})"
+
+
+class TopicReadState(models.Model):
+    """Останнє прочитане повідомлення теми для користувача"""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='topic_read_states', verbose_name="Користувач")
+    topic = models.ForeignKey(Topic, on_delete=models.CASCADE, related_name='read_states', verbose_name="Тема")
+    last_read_post_id = models.PositiveBigIntegerField(default=0, verbose_name="Останнє прочитане повідомлення")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Оновлено")
+
+    class Meta:
+        verbose_name = "Стан прочитання теми"
+        verbose_name_plural = "Стани прочитання тем"
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'topic'], name='unique_topic_read_state'),
+        ]
+        indexes = [
+            models.Index(fields=['updated_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username}: {self.topic.title} ({self.last_read_post_id})"
+
+
+class CategoryReadMark(models.Model):
+    """
+    Позначка "все прочитано" для категорії: всі повідомлення з id <= last_read_post_id
+    в темах категорії вважаються прочитаними
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='category_read_marks', verbose_name="Користувач")
+    category = models.ForeignKey(Category, on_delete=models.CASCADE, related_name='read_marks', verbose_name="Категорія")
+    last_read_post_id = models.PositiveBigIntegerField(default=0, verbose_name="Останнє прочитане повідомлення")
+    marked_at = models.DateTimeField(auto_now=True, verbose_name="Позначено")
+
+    class Meta:
+        verbose_name = "Позначка прочитання категорії"
+        verbose_name_plural = "Позначки прочитання категорій"
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'category'], name='unique_category_read_mark'),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username}: {self.category.name} ({self.last_read_post_id})"
+
+
+class PostRevision(models.Model):
+    """
+    Версія повідомлення. Зберігається або повний текст (snapshot), або дельта
+    відносно попередньої версії; відновлення - див. apps.forum.revisions
+    """
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='revisions', verbose_name="Повідомлення")
+    number = models.PositiveIntegerField(verbose_name="Номер версії")
+    editor = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+        verbose_name="Редактор"
+    )
+    is_snapshot = models.BooleanField(default=False, verbose_name="Повна копія")
+    data = models.JSONField(verbose_name="Дані")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Створено")
+
+    class Meta:
+        verbose_name = "Версія повідомлення"
+        verbose_name_plural = "Версії повідомлень"
+        ordering = ['post', 'number']
+        constraints = [
+            models.UniqueConstraint(fields=['post', 'number'], name='unique_post_revision'),
+        ]
+
+    def __str__(self):
+        return f"#{self.post_id} v{self.number}"
+
+
+@receiver(post_save, sender=Post)
+def update_author_post_stats(sender, instance, created, **kwargs):
+    """Лічильник повідомлень та остання активність автора - одним UPDATE профілю"""
+    if created:
+        from apps.users.stats import record_post
+        record_post(instance.author_id, instance.created_at)
+
+
+@receiver(post_save, sender=Topic)
+def update_author_topic_stats(sender, instance, created, **kwargs):
+    if created:
+        from apps.users.stats import record_topic
+        record_topic(instance.author_id, instance.created_at)
+
+
+@receiver(pre_save, sender=Topic)
+def set_initial_hot_score(sender, instance, **kwargs):
+    """Початковий рейтинг нової теми - вага події створення"""
+    if instance._state.adding and not instance.hot_score:
+        from .hot import initial_score
+        instance.hot_score = initial_score(instance)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_category_tree_cache(sender, **kwargs):
+    """Скидає кеш дерева категорій при будь-якій зміні категорій"""
+    from .categories import invalidate_category_tree
+    invalidate_category_tree()
@@ -0,0 +1,43 @@
+"""
+Масові дії модерації над вмістом користувача.
+"""
+from django.db import transaction
+from django.db.models import Q
+
+from apps.users.models import Profile, Role
+from apps.users.services import assign_role
+from apps.users.stats import recount_profile_stats
+from .models import ModerationAction, Notification, Post, Topic
+from .notifications import invalidate_unread_counts
+
+
+def ban_and_purge(target_user, moderator, comment=''):
+    """
+    Блокує користувача та м'яко видаляє всі його теми й повідомлення.
+    Кілька UPDATE в одній транзакції незалежно від обсягу вмісту; фізично
+    записи пізніше видаляє purge_deleted. Записує одну зведену ModerationAction.
+    Повертає (тем, повідомлень).
+    """
+    with transaction.atomic():
+        assign_role(Profile.objects.filter(user=target_user), Role.BANNED)
+        posts = Post.objects.filter(author=target_user).soft_delete()
+        topics = Topic.objects.filter(author=target_user).soft_delete()
+
+        # Непрочитані сповіщення про приховані теми та повідомлення більше не актуальні
+        stale_notifications = Notification.objects.filter(
+            Q(topic__author=target_user) | Q(last_post__author=target_user),
+            is_read=False,
+        )
+        affected_user_ids = list(stale_notifications.values_list('user_id', flat=True).distinct())
+        stale_notifications.update(is_read=True)
+
+        summary = f'Приховано тем: {topics}, повідомлень: {posts}'
+        ModerationAction.objects.create(
+            action=ModerationAction.PURGE,
+            target_user=target_user,
+            moderator=moderator,
+            comment=f'{summary}. {comment}' if comment else summary,
+        )
+        recount_profile_stats([target_user.pk])
+        transaction.on_commit(lambda: invalidate_unread_counts(affected_user_ids))
+    return topics, posts
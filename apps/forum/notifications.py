@@ -0,0 +1,89 @@
+"""
+Сповіщення про нові повідомлення для підписників.
+
+Розсилка (fanout) виконується фоновою задачею пачками: для кожної пачки підписників
+непрочитані сповіщення по темі оновлюються одним UPDATE, відсутні створюються
+одним bulk_create. Кількість непрочитаних сповіщень кешується для навбару.
+"""
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from apps.core.cache import TieredCache
+from .categories import get_category_ancestor_ids
+from .models import Notification, Subscription, Topic
+
+FANOUT_BATCH_SIZE = 500
+UNREAD_COUNT_CACHE_TIMEOUT = 60 * 60
+
+# Без локального рівня: лічильник має змінюватись одразу після прочитання сповіщень
+unread_count_cache = TieredCache('forum:notifications:unread', timeout=UNREAD_COUNT_CACHE_TIMEOUT, local_timeout=0)
+
+
+def get_unread_count(user):
+    """Кількість непрочитаних сповіщень (з кешу, COUNT тільки при промаху)"""
+    return unread_count_cache.get_or_set(
+        user.pk, lambda: Notification.objects.filter(user=user, is_read=False).count()
+    )
+
+
+def invalidate_unread_counts(user_ids):
+    unread_count_cache.delete_many(user_ids)
+
+
+def mark_read(user, topic=None):
+    """Позначає прочитаними сповіщення користувача (по темі або всі)"""
+    notifications = Notification.objects.filter(user=user, is_read=False)
+    if topic is not None:
+        notifications = notifications.filter(topic=topic)
+    updated = notifications.update(is_read=True)
+    if updated:
+        invalidate_unread_counts([user.pk])
+    return updated
+
+
+def get_subscriber_ids(topic, exclude_user_id=None):
+    """Підписники теми та її категорії (включно з батьківськими), відсортовані за id"""
+    subscribers = Subscription.objects.filter(
+        Q(topic_id=topic.pk) | Q(category_id__in=get_category_ancestor_ids(topic.category_id))
+    )
+    if exclude_user_id is not None:
+        subscribers = subscribers.exclude(user_id=exclude_user_id)
+    return subscribers.order_by('user_id').values_list('user_id', flat=True).distinct()
+
+
+def notify_batch(post, user_ids):
+    """Оновлює або створює сповіщення про post для пачки користувачів"""
+    with transaction.atomic():
+        unread = Notification.objects.filter(user_id__in=user_ids, topic_id=post.topic_id, is_read=False)
+        existing_ids = set(unread.values_list('user_id', flat=True))
+        # Коалесинг: одне непрочитане сповіщення на тему, повторна спроба задачі не рахує пост двічі
+        unread.filter(Q(last_post_id__lt=post.pk) | Q(last_post__isnull=True)).update(
+            posts_count=F('posts_count') + 1,
+            last_post_id=post.pk,
+            updated_at=timezone.now(),
+        )
+        new_ids = [user_id for user_id in user_ids if user_id not in existing_ids]
+        Notification.objects.bulk_create(
+            [Notification(user_id=user_id, topic_id=post.topic_id, last_post_id=post.pk) for user_id in new_ids],
+            ignore_conflicts=True,
+        )
+    invalidate_unread_counts(new_ids)
+
+
+def fanout_post(post, batch_size=FANOUT_BATCH_SIZE):
+    """Розсилає сповіщення про нове повідомлення всім підписникам пачками"""
+    if post.topic.status != Topic.APPROVED:
+        return 0
+    subscriber_ids = get_subscriber_ids(post.topic, exclude_user_id=post.author_id)
+    total = 0
+    last_id = 0
+    while True:
+        # Keyset-пагінація по user_id, щоб не тримати всіх підписників у пам'яті
+        batch = list(subscriber_ids.filter(user_id__gt=last_id)[:batch_size])
+        if not batch:
+            break
+        notify_batch(post, batch)
+        total += len(batch)
+        last_id = batch[-1]
+    return total
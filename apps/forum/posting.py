@@ -0,0 +1,20 @@
+"""
+Створення тем.
+
+Тема, її перше повідомлення, підписка автора та лічильники профілю (сигнали post_save)
+записуються однією транзакцією: або все, або нічого, і один COMMIT замість кількох.
+"""
+from django.db import transaction
+
+from .models import Post, Subscription, Topic
+
+
+def create_topic(author, category, title, content='', status=Topic.PENDING):
+    """Створює тему з першим повідомленням (якщо content не порожній) та підписує автора"""
+    with transaction.atomic():
+        topic = Topic.objects.create(author=author, category=category, title=title, status=status)
+        if content:
+            Post.objects.create(topic=topic, author=author, content=content)
+        # Автор автоматично підписується на свою тему
+        Subscription.objects.create(user=author, topic=topic)
+    return topic
@@ -0,0 +1,95 @@
+"""
+Відстеження прочитаних тем ("нові повідомлення з моменту останнього візиту").
+
+Для кожної пари (користувач, тема) зберігається id останнього прочитаного повідомлення,
+а "позначити все прочитаним" у категорії записує одну позначку на категорію
+з поточним максимальним id повідомлення. Повідомлення, старші за READ_TRACKING_DAYS,
+завжди вважаються прочитаними, тому старі записи можна видаляти без втрати стану.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+
+from .categories import get_category_descendant_ids
+from .models import CategoryReadMark, Post, TopicReadState
+
+
+def get_tracking_cutoff():
+    return timezone.now() - timedelta(days=getattr(settings, 'READ_TRACKING_DAYS', 30))
+
+
+def annotate_unread(queryset, user):
+    """
+    Додає до queryset тем поле is_unread.
+    Обчислюється корельованими підзапитами в тому ж SELECT, що й список тем.
+    """
+    if not user.is_authenticated:
+        return queryset
+    read_post_id = TopicReadState.objects.filter(
+        user=user, topic=OuterRef('pk')
+    ).values('last_read_post_id')[:1]
+    category_watermark = CategoryReadMark.objects.filter(
+        user=user, category=OuterRef('category_id')
+    ).values('last_read_post_id')[:1]
+    return queryset.annotate(
+        read_marker=Greatest(Coalesce(Subquery(read_post_id), 0), Coalesce(Subquery(category_watermark), 0)),
+    ).annotate(
+        is_unread=Exists(Post.objects.filter(
+            topic=OuterRef('pk'),
+            pk__gt=OuterRef('read_marker'),
+            created_at__gte=get_tracking_cutoff(),
+        )),
+    )
+
+
+def mark_topic_read(user, topic, last_post_id):
+    """Запам'ятовує останнє прочитане повідомлення теми (один upsert)"""
+    if not user.is_authenticated or not last_post_id:
+        return
+    TopicReadState.objects.bulk_create(
+        [TopicReadState(user=user, topic=topic, last_read_post_id=last_post_id)],
+        update_conflicts=True,
+        unique_fields=['user', 'topic'],
+        update_fields=['last_read_post_id', 'updated_at'],
+    )
+
+
+def mark_category_read(user, category):
+    """Позначає прочитаними всі теми категорії та її підкатегорій"""
+    watermark = Post.objects.aggregate(max_id=Max('pk'))['max_id'] or 0
+    category_ids = get_category_descendant_ids(category.pk)
+    with transaction.atomic():
+        CategoryReadMark.objects.bulk_create(
+            [CategoryReadMark(user=user, category_id=pk, last_read_post_id=watermark) for pk in category_ids],
+            update_conflicts=True,
+            unique_fields=['user', 'category'],
+            update_fields=['last_read_post_id', 'marked_at'],
+        )
+        # Стани окремих тем тепер покриті позначкою категорії
+        TopicReadState.objects.filter(
+            user=user,
+            topic__category_id__in=category_ids,
+            last_read_post_id__lte=watermark,
+        ).delete()
+
+
+def cleanup_read_state():
+    """
+    Видаляє записи, що більше не впливають на позначки "нове":
+    старші за READ_TRACKING_DAYS та стани тем, покриті позначкою категорії.
+    Повертає кількість видалених записів.
+    """
+    cutoff = get_tracking_cutoff()
+    deleted = TopicReadState.objects.filter(updated_at__lt=cutoff).delete()[0]
+    deleted += CategoryReadMark.objects.filter(marked_at__lt=cutoff).delete()[0]
+    covered = CategoryReadMark.objects.filter(
+        user=OuterRef('user'),
+        category=OuterRef('topic__category'),
+        last_read_post_id__gte=OuterRef('last_read_post_id'),
+    )
+    deleted += TopicReadState.objects.filter(Exists(covered)).delete()[0]
+    return deleted
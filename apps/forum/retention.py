@@ -0,0 +1,111 @@
+"""
+Фізичне видалення м'яко видаленого вмісту та архівування старих закритих тем.
+
+Обидві операції працюють невеликими пакетами, кожен у власній транзакції,
+тому не тримають довгих блокувань і можуть бути безпечно перервані та запущені знову.
+"""
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .deletion import delete_in_batches, get_author_ids, recount_authors
+from .models import ArchivedPost, Post, PostRevision, Topic
+
+ARCHIVED_POST_FIELDS = ['id', 'topic_id', 'author_id', 'content', 'created_at', 'updated_at']
+ARCHIVED_REVISION_FIELDS = ['post_id', 'number', 'editor_id', 'is_snapshot', 'data', 'created_at']
+
+
+def purge_deleted(older_than=None, batch_size=500):
+    """
+    Фізично видаляє м'яко видалені повідомлення та теми, старші за older_than
+    (за замовчуванням PURGE_DELETED_AFTER_DAYS). Повертає (повідомлень, тем).
+    Разом з темою видаляються і її не видалені повідомлення інших авторів, тому їхні
+    агрегати профілів перераховуються (м'яко видалені повідомлення в них уже не враховані).
+    """
+    if older_than is None:
+        older_than = timedelta(days=getattr(settings, 'PURGE_DELETED_AFTER_DAYS', 30))
+    cutoff = timezone.now() - older_than
+
+    posts = delete_in_batches(Post.all_objects.filter(is_deleted=True, deleted_at__lt=cutoff), batch_size)
+    topics = 0
+    topic_ids = list(Topic.all_objects.filter(is_deleted=True, deleted_at__lt=cutoff).values_list('pk', flat=True))
+    for topic_id in topic_ids:
+        live_posts = Post.objects.filter(topic_id=topic_id)
+        archived_posts = ArchivedPost.objects.filter(topic_id=topic_id)
+        author_ids = get_author_ids(live_posts, archived_posts)
+        # Спочатку повідомлення теми пакетами, потім сама тема (каскад лише по дрібних таблицях)
+        posts += delete_in_batches(Post.all_objects.filter(topic_id=topic_id), batch_size)
+        delete_in_batches(archived_posts, batch_size)
+        Topic.all_objects.filter(pk=topic_id).delete()
+        recount_authors(author_ids, batch_size)
+        topics += 1
+    return posts, topics
+
+
+def get_archivable_topics(older_than=None):
+    """Закриті теми без активності довше older_than (за замовчуванням ARCHIVE_TOPICS_AFTER_DAYS)"""
+    if older_than is None:
+        older_than = timedelta(days=getattr(settings, 'ARCHIVE_TOPICS_AFTER_DAYS', 365))
+    return Topic.objects.filter(
+        is_closed=True,
+        is_archived=False,
+        updated_at__lt=timezone.now() - older_than,
+    )
+
+
+def get_revisions_by_post(post_ids):
+    """Версії повідомлень post_ids для архіву: {id повідомлення: [версія, ...]}"""
+    revisions = defaultdict(list)
+    rows = (PostRevision.objects.filter(post_id__in=post_ids)
+            .order_by('post_id', 'number').values(*ARCHIVED_REVISION_FIELDS))
+    for row in rows:
+        revisions[row.pop('post_id')].append(row)
+    return revisions
+
+
+def archive_topic(topic_id, batch_size=500):
+    """
+    Переносить повідомлення теми в ArchivedPost та позначає тему архівною.
+    Одна транзакція на тему: читачі бачать або всі повідомлення в робочій таблиці,
+    або всі в архіві. М'яко видалені повідомлення не архівуються.
+    Історія редагувань (PostRevision) копіюється в ArchivedPost.revisions, бо видалення
+    повідомлень з робочої таблиці каскадно видаляє і їхні версії.
+    """
+    with transaction.atomic():
+        topic = Topic.objects.select_for_update().filter(pk=topic_id, is_archived=False).first()
+        if topic is None:
+            return 0
+        moved = 0
+        last_id = 0
+        while True:
+            rows = list(
+                Post.objects.filter(topic_id=topic_id, pk__gt=last_id)
+                .order_by('pk').values(*ARCHIVED_POST_FIELDS)[:batch_size]
+            )
+            if not rows:
+                break
+            revisions = get_revisions_by_post([row['id'] for row in rows])
+            ArchivedPost.objects.bulk_create(
+                [ArchivedPost(**row, revisions=revisions.get(row['id'], [])) for row in rows],
+                ignore_conflicts=True,
+            )
+            last_id = rows[-1]['id']
+            moved += len(rows)
+        Post.all_objects.filter(topic_id=topic_id).delete()
+        Topic.all_objects.filter(pk=topic_id).update(is_archived=True)
+    return moved
+
+
+def archive_topics(older_than=None, batch_size=500, limit=None):
+    """Архівує старі закриті теми; повертає (тем, повідомлень)"""
+    topic_ids = get_archivable_topics(older_than).order_by('pk').values_list('pk', flat=True)
+    if limit:
+        topic_ids = topic_ids[:limit]
+    topics = posts = 0
+    for topic_id in list(topic_ids):
+        posts += archive_topic(topic_id, batch_size)
+        topics += 1
+    return topics, posts
@@ -0,0 +1,151 @@
+"""
+Історія редагувань повідомлень.
+
+Кожна версія зберігається як дельта відносно попередньої, а кожна
+POST_REVISION_SNAPSHOT_EVERY-та (і перша) - як повна копія, тому для відновлення
+будь-якої версії достатньо останньої копії та не більше N-1 дельт.
+
+Дельта - список операцій над токенами попередньої версії (теги, слова, пробіли):
+    ціле n > 0  - залишити n токенів,
+    ціле n < 0  - пропустити -n токенів,
+    рядок       - вставити текст.
+"""
+import re
+from difflib import SequenceMatcher
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max, Subquery
+from django.utils.html import escape
+
+from .models import Post, PostRevision
+
+# Остання альтернатива - одиночний '<' без '>' ("x <3 you"): без неї він випадав би з токенів
+TOKEN_RE = re.compile(r'<[^>]*>|[^<\s]+|\s+|<')
+
+
+def get_snapshot_interval():
+    return getattr(settings, 'POST_REVISION_SNAPSHOT_EVERY', 10)
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(text or '')
+
+
+def make_delta(old, new):
+    """Дельта, що перетворює old на new"""
+    old_tokens, new_tokens = tokenize(old), tokenize(new)
+    # Токени мають покривати текст повністю, інакше apply_delta втрачав би символи
+    assert ''.join(old_tokens) == (old or '') and ''.join(new_tokens) == (new or '')
+    delta = []
+    matcher = SequenceMatcher(None, old_tokens, new_tokens, autojunk=False)
+    for op, i1, i2, j1, j2 in matcher.get_opcodes():
+        if op == 'equal':
+            delta.append(i2 - i1)
+            continue
+        if i2 > i1:
+            delta.append(i1 - i2)
+        if j2 > j1:
+            delta.append(''.join(new_tokens[j1:j2]))
+    return delta
+
+
+def apply_delta(text, delta):
+    tokens = tokenize(text)
+    position = 0
+    result = []
+    for op in delta:
+        if isinstance(op, str):
+            result.append(op)
+        elif op > 0:
+            result.extend(tokens[position:position + op])
+            position += op
+        else:
+            position -= op
+    return ''.join(result)
+
+
+def save_post_edit(post, content, editor):
+    """
+    Зберігає новий текст повідомлення та його версію в одній транзакції.
+    Рядок повідомлення блокується до збереження, і дельта рахується від тексту,
+    прочитаного під блокуванням: одночасні редагування впорядковуються, а кожна
+    дельта будується від версії, яка вже є в історії.
+    """
+    with transaction.atomic():
+        old_content = Post.objects.select_for_update().values_list('content', flat=True).get(pk=post.pk)
+        post.content = content
+        post.save()
+        return record_revision(post, old_content, editor)
+
+
+def record_revision(post, old_content, editor):
+    """
+    Зберігає нову версію після редагування post (post.content - вже новий текст).
+    old_content - текст до редагування; при першому редагуванні він стає версією 1.
+    Викликається під блокуванням рядка повідомлення (save_post_edit).
+    """
+    if old_content == post.content:
+        return None
+    with transaction.atomic():
+        last_number = post.revisions.aggregate(number=Max('number'))['number']
+        revisions = []
+        if last_number is None:
+            last_number = 1
+            revisions.append(PostRevision(
+                post=post, number=1, editor=post.author, is_snapshot=True, data=old_content,
+            ))
+        number = last_number + 1
+        is_snapshot = (number - 1) % get_snapshot_interval() == 0
+        revisions.append(PostRevision(
+            post=post,
+            number=number,
+            editor=editor,
+            is_snapshot=is_snapshot,
+            data=post.content if is_snapshot else make_delta(old_content, post.content),
+        ))
+        PostRevision.objects.bulk_create(revisions)
+    return revisions[-1]
+
+
+def get_revision_history(post):
+    """
+    Відновлює всі версії повідомлення одним запитом.
+    Повертає список (revision, content) від найновішої до першої.
+    """
+    history = []
+    content = ''
+    for revision in post.revisions.select_related('editor').order_by('number'):
+        content = revision.data if revision.is_snapshot else apply_delta(content, revision.data)
+        history.append((revision, content))
+    history.reverse()
+    return history
+
+
+def get_revision_content(post, number):
+    """Текст версії number: найближча попередня повна копія + дельти після неї (один запит)"""
+    snapshot_number = post.revisions.filter(
+        number__lte=number, is_snapshot=True
+    ).order_by('-number').values('number')[:1]
+    content = None
+    for revision in post.revisions.filter(
+        number__lte=number, number__gte=Subquery(snapshot_number)
+    ).order_by('number'):
+        content = revision.data if revision.is_snapshot else apply_delta(content, revision.data)
+    return content
+
+
+def render_diff(old, new):
+    """HTML-порівняння двох версій (вихідний HTML екранується, зміни - у <ins>/<del>)"""
+    old_tokens, new_tokens = tokenize(old), tokenize(new)
+    parts = []
+    matcher = SequenceMatcher(None, old_tokens, new_tokens, autojunk=False)
+    for op, i1, i2, j1, j2 in matcher.get_opcodes():
+        if op == 'equal':
+            parts.append(escape(''.join(old_tokens[i1:i2])))
+            continue
+        if i2 > i1:
+            parts.append(f'<del>{escape("".join(old_tokens[i1:i2]))}</del>')
+        if j2 > j1:
+            parts.append(f'<ins>{escape("".join(new_tokens[j1:j2]))}</ins>')
+    return ''.join(parts)
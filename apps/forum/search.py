@@ -0,0 +1,50 @@
+"""
+Пошук по вмісту повідомлень.
+
+На PostgreSQL використовується повнотекстовий пошук по GIN-індексу
+(див. міграцію 0005_post_content_search_index), на інших БД - icontains.
+"""
+from django.db import connection
+from django.db.models import Q
+
+# Конфігурація без стемінгу: вміст форуму багатомовний
+SEARCH_CONFIG = 'simple'
+POST_CONTENT_INDEX_NAME = 'forum_post_content_fts'
+
+
+def uses_full_text_search():
+    return connection.vendor == 'postgresql'
+
+
+def get_post_content_vector():
+    """Вираз tsvector, ідентичний виразу GIN-індексу forum_post_content_fts"""
+    from django.contrib.postgres.search import SearchVector
+    return SearchVector('content', config=SEARCH_CONFIG)
+
+
+def get_post_content_index():
+    from django.contrib.postgres.indexes import GinIndex
+    return GinIndex(get_post_content_vector(), name=POST_CONTENT_INDEX_NAME)
+
+
+def get_post_search_filter(query, full_text=None):
+    """
+    Умова Q для пошуку query у вмісті повідомлень. full_text=None - за типом БД;
+    True примусово будує повнотекстову умову (перевірка forum.E001 на будь-якій БД).
+    """
+    if full_text is None:
+        full_text = uses_full_text_search()
+    if full_text:
+        from django.contrib.postgres.search import SearchQuery, SearchVectorExact
+        # Явний вираз замість лукапу content__search: той існує лише з django.contrib.postgres
+        # в INSTALLED_APPS, а вираз збігається з виразом GIN-індексу forum_post_content_fts
+        return Q(SearchVectorExact(
+            get_post_content_vector(),
+            SearchQuery(query, config=SEARCH_CONFIG, search_type='websearch'),
+        ))
+    return Q(content__icontains=query)
+
+
+def search_posts(queryset, query):
+    """Фільтрує queryset повідомлень за пошуковим запитом"""
+    return queryset.filter(get_post_search_filter(query))
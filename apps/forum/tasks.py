@@ -0,0 +1,48 @@
+from apps.core.taskqueue import task
+from .models import Topic, Post, ModerationAction
+from .notifications import fanout_post
+from .deletion import delete_category, delete_user_content
+
+
+@task('forum.create_first_post')
+def create_first_post(topic_id, author_id, content):
+    """
+    Створює перше повідомлення нової теми (якщо його ще немає).
+    Нові теми створюються разом з першим повідомленням (apps.forum.posting.create_topic);
+    задача залишена для завдань, що вже стоять у черзі.
+    """
+    if Post.objects.filter(topic_id=topic_id).exists():
+        return
+    if not Topic.objects.filter(pk=topic_id).exists():
+        return
+    Post.objects.create(topic_id=topic_id, author_id=author_id, content=content)
+
+
+@task('forum.record_moderation_actions')
+def record_moderation_actions(topic_ids, moderator_id, action, comment=''):
+    """Записує історію модерації для групи тем одним INSERT"""
+    existing_ids = set(Topic.objects.filter(pk__in=topic_ids).values_list('pk', flat=True))
+    ModerationAction.objects.bulk_create([
+        ModerationAction(topic_id=topic_id, moderator_id=moderator_id, action=action, comment=comment)
+        for topic_id in topic_ids if topic_id in existing_ids
+    ])
+
+
+@task('forum.fanout_post_notifications')
+def fanout_post_notifications(post_id):
+    """Розсилає підписникам сповіщення про нове повідомлення"""
+    post = Post.objects.select_related('topic').filter(pk=post_id).first()
+    if post is not None:
+        fanout_post(post)
+
+
+@task('forum.delete_category', max_attempts=3)
+def delete_category_task(category_id):
+    """Пакетне видалення категорії з усім вмістом (повторний запуск продовжує роботу)"""
+    delete_category(category_id)
+
+
+@task('forum.delete_user_content', max_attempts=3)
+def delete_user_content_task(user_id, delete_user=False):
+    """Пакетне видалення вмісту користувача (дія адмінки "Видалити з усім вмістом")"""
+    delete_user_content(user_id, delete_user=delete_user)
@@ -1,18 +1,33 @@
 from django.urls import path
-from . import views
+from . import api, views
 
 app_name = 'forum'
 
 urlpatterns = [
     path('', views.HomeView.as_view(), name='home'),
+    path('hot/', views.HotTopicsView.as_view(), name='hot'),
     path('category/<int:pk>/', views.CategoryDetailView.as_view(), name='category_detail'),
     path('topic/<int:pk>/', views.TopicDetailView.as_view(), name='topic_detail'),
     path('topic/create/', views.TopicCreateView.as_view(), name='topic_create'),
     path('topic/<int:pk>/edit/', views.TopicUpdateView.as_view(), name='topic_update'),
     path('topic/<int:topic_pk>/reply/', views.PostCreateView.as_view(), name='post_create'),
     path('post/<int:pk>/edit/', views.PostUpdateView.as_view(), name='post_update'),
+    path('post/<int:pk>/history/', views.PostHistoryView.as_view(), name='post_history'),
     path('post/<int:pk>/delete/', views.PostDeleteView.as_view(), name='post_delete'),
     path('search/', views.SearchView.as_view(), name='search'),
+    # Підписки та сповіщення
+    path('topic/<int:pk>/subscribe/', views.SubscriptionToggleView.as_view(target='topic'), name='topic_subscribe'),
+    path('category/<int:pk>/mark-read/', views.CategoryMarkReadView.as_view(), name='category_mark_read'),
+    path('category/<int:pk>/subscribe/', views.SubscriptionToggleView.as_view(target='category'), name='category_subscribe'),
+    path('notifications/', views.NotificationListView.as_view(), name='notifications'),
+    path('notifications/read-all/', views.NotificationReadAllView.as_view(), name='notifications_read_all'),
+    # JSON API (лише читання)
+    path('api/categories/', api.CategoryListView.as_view(), name='api_categories'),
+    path('api/categories/<int:pk>/', api.CategoryDetailView.as_view(), name='api_category'),
+    path('api/topics/', api.TopicListView.as_view(), name='api_topics'),
+    path('api/topics/<int:pk>/', api.TopicDetailView.as_view(), name='api_topic'),
+    path('api/topics/<int:pk>/posts/', api.TopicPostListView.as_view(), name='api_topic_posts'),
+    path('api/users/<str:username>/', api.ProfileDetailView.as_view(), name='api_profile'),
     # Маршрути модерації
     path('moderation/', views.ModerationQueueView.as_view(), name='moderation_queue'),
     path('moderation/topic/<int:pk>/approve/', views.TopicApproveView.as_view(), name='topic_approve'),
@@ -2,10 +2,22 @@ from django.shortcuts import render, get_object_or_404, redirect
 from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView, View
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.urls import reverse_lazy
-from django.db.models import Count, Q
+from django.db import transaction
+from django.db.models import Count, F, Q
 from django.utils import timezone
-from .models import Category, Topic, Post, ModerationAction
-from .forms import TopicCreateForm, PostCreateForm
+from django.utils.safestring import mark_safe
+from apps.core.cache import TieredCache
+from apps.core.pagination import EstimatedCountPaginator, NextPreviousPaginator
+from apps.core.ratelimit import RateLimitMixin
+from apps.core.taskqueue import enqueue_on_commit
+from .models import Category, Topic, Post, ModerationAction, Subscription, Notification
+from .forms import TopicCreateForm, TopicUpdateForm, PostCreateForm
+from .tasks import record_moderation_actions, fanout_post_notifications
+from .notifications import get_unread_count, mark_read
+from .readstate import annotate_unread, mark_topic_read, mark_category_read
+from .posting import create_topic
+from .hot import bump_expression, POST_WEIGHT, VIEW_WEIGHT
+from .revisions import save_post_edit, get_revision_history, render_diff
 
 
 class HomeView(ListView):
@@ -22,52 +34,64 @@ class HomeView(ListView):
 
         # Фільтрація топіків за статусом
         user = self.request.user
-        recent_topics_qs = Topic.objects.select_related('author', 'category').prefetch_related('posts')
+        recent_topics_qs = Topic.objects.visible_to(user).select_related('author', 'category').prefetch_related('posts')
 
-        if user.is_authenticated:
-            # Показуємо approved + власні топіки або всі якщо модератор
-            if hasattr(user, 'profile') and user.profile.has_permission('can_moderate_topics'):
-                # Модератори бачать всі топіки
-                recent_topics_qs = recent_topics_qs
-            else:
-                # Звичайні користувачі бачать approved + свої
-                recent_topics_qs = recent_topics_qs.filter(
-                    Q(status=Topic.APPROVED) | Q(author=user)
-                )
-        else:
-            # Анонімні користувачі бачать тільки approved
-            recent_topics_qs = recent_topics_qs.filter(status=Topic.APPROVED)
-
-        context['recent_topics'] = recent_topics_qs[:10]
-        context['total_topics'] = Topic.objects.filter(status=Topic.APPROVED).count()
-        context['total_posts'] = Post.objects.count()
+        context['recent_topics'] = annotate_unread(recent_topics_qs, user)[:10]
+        context['hot_topics'] = get_hot_topics()[:5]
+        context.update(get_forum_stats())
         return context
 
 
+# Загальна статистика на головній: невелике відставання не помітне, COUNT по всіх таблицях - помітний
+stats_cache = TieredCache('forum:stats', timeout=60)
+
+
+def get_forum_stats():
+    return stats_cache.get_or_set('totals', lambda: {
+        'total_topics': Topic.objects.filter(status=Topic.APPROVED).count(),
+        'total_posts': Post.objects.count(),
+    })
+
+
+def get_hot_topics():
+    """Схвалені теми за рейтингом активності (читається по індексу forum_topic_hot_idx)"""
+    return Topic.objects.filter(status=Topic.APPROVED).select_related('author', 'category').order_by('-hot_score')
+
+
+class HotTopicsView(ListView):
+    """Гарячі теми: найактивніші за останній час"""
+    template_name = 'forum/hot.html'
+    context_object_name = 'topics'
+    paginate_by = 20
+    paginator_class = EstimatedCountPaginator
+
+    def get_queryset(self):
+        return annotate_unread(get_hot_topics(), self.request.user)
+
+
 class CategoryDetailView(DetailView):
     model = Category
     template_name = 'forum/category_detail.html'
     context_object_name = 'category'
+    paginate_by = 20
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         user = self.request.user
 
         # Фільтрація топіків за статусом
-        topics_qs = self.object.topics.select_related('author').prefetch_related('posts')
+        topics_qs = annotate_unread(
+            Topic.objects.filter(category=self.object).visible_to(user)
+            .select_related('author').prefetch_related('posts'),
+            user
+        )
+        page = EstimatedCountPaginator(topics_qs, self.paginate_by).get_page(self.request.GET.get('page'))
+        context['page_obj'] = page
+        context['topics'] = page.object_list
 
-        if user.is_authenticated:
-            if hasattr(user, 'profile') and user.profile.has_permission('can_moderate_topics'):
-                # Модератори бачать всі топіки
-                context['topics'] = topics_qs
-            else:
-                # Звичайні користувачі бачать approved + свої
-                context['topics'] = topics_qs.filter(
-                    Q(status=Topic.APPROVED) | Q(author=user)
-                )
-        else:
-            # Анонімні користувачі бачать тільки approved
-            context['topics'] = topics_qs.filter(status=Topic.APPROVED)
+        context['is_subscribed'] = user.is_authenticated and Subscription.objects.filter(
+            user=user, category=self.object
+        ).exists()
 
         # Підкатегорії поточної категорії
         context['subcategories'] = self.object.subcategories.all()
@@ -83,54 +107,55 @@ class TopicDetailView(DetailView):
 
     def dispatch(self, request, *args, **kwargs):
         topic = self.get_object()
-        user = request.user
-
-        # Перевірка доступу на основі статусу теми
-        if topic.status == Topic.APPROVED:
-            # Всі можуть переглядати схвалені теми
-            pass
-        elif topic.status in [Topic.PENDING, Topic.REJECTED]:
-            # Тільки автор та модератори можуть переглядати pending/rejected
-            if not user.is_authenticated:
-                from django.contrib import messages
-                messages.error(request, 'Ця тема ще не опублікована.')
-                return redirect('forum:home')
-
-            is_author = user == topic.author
-            is_moderator = (hasattr(user, 'profile') and
-                           user.profile.has_permission('can_moderate_topics'))
-
-            if not (is_author or is_moderator):
-                from django.contrib import messages
-                messages.error(request, 'Ця тема ще не опублікована.')
-                return redirect('forum:home')
+
+        # Pending/rejected теми бачать тільки автор та модератори
+        if not topic.is_visible_to(request.user):
+            from django.contrib import messages
+            messages.error(request, 'Ця тема ще не опублікована.')
+            return redirect('forum:home')
 
         return super().dispatch(request, *args, **kwargs)
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['posts'] = self.object.posts.select_related('author').all()
+        context['posts'] = list(self.object.get_posts().select_related('author__profile__role'))
 
-        # Показуємо форму тільки якщо тема схвалена
-        if self.object.status == Topic.APPROVED:
-            if self.request.user.is_authenticated:
-                if not (hasattr(self.request.user, 'profile') and self.request.user.profile.is_banned()):
-                    context['form'] = PostCreateForm()
-            else:
-                context['form'] = PostCreateForm()
+        # Форма відповіді (з віджетом CKEditor) створюється лише для тих, хто може відповісти:
+        # тема схвалена, не закрита й не в архіві, користувач увійшов і не заблокований
+        user = self.request.user
+        if (
+            self.object.status == Topic.APPROVED
+            and not self.object.is_closed
+            and not self.object.is_archived
+            and user.is_authenticated
+            and not (hasattr(user, 'profile') and user.profile.is_banned())
+        ):
+            context['form'] = PostCreateForm()
 
-        # Інкрементуємо перегляди тільки для схвалених тем
+        if user.is_authenticated:
+            context['is_subscribed'] = Subscription.objects.filter(user=user, topic=self.object).exists()
+            # Сповіщення по темі стають прочитаними при її відкритті (UPDATE тільки якщо є непрочитані)
+            if get_unread_count(user):
+                mark_read(user, topic=self.object)
+            if context['posts']:
+                mark_topic_read(user, self.object, max(post.pk for post in context['posts']))
+
+        # Інкрементуємо перегляди тільки для схвалених тем (разом з рейтингом - одним UPDATE)
         if self.object.status == Topic.APPROVED:
+            Topic.objects.filter(pk=self.object.pk).update(
+                views=F('views') + 1,
+                hot_score=bump_expression(VIEW_WEIGHT),
+            )
             self.object.views += 1
-            self.object.save(update_fields=['views'])
 
         return context
 
 
-class TopicCreateView(LoginRequiredMixin, CreateView):
+class TopicCreateView(LoginRequiredMixin, RateLimitMixin, CreateView):
     model = Topic
     form_class = TopicCreateForm
     template_name = 'forum/topic_create.html'
+    ratelimit_scope = 'topic_create'
 
     def dispatch(self, request, *args, **kwargs):
         # Перевірка чи не заблокований користувач
@@ -141,18 +166,13 @@ class TopicCreateView(LoginRequiredMixin, CreateView):
         return super().dispatch(request, *args, **kwargs)
 
     def form_valid(self, form):
-        form.instance.author = self.request.user
-        form.instance.status = Topic.PENDING  # Встановити статус очікування модерації
-        response = super().form_valid(form)
-
-        # Create first post with the content from form
-        post_content = form.cleaned_data.get('content', '')
-        if post_content:
-            Post.objects.create(
-                topic=self.object,
-                author=self.request.user,
-                content=post_content
-            )
+        # Тема з першим повідомленням і підпискою - одна транзакція (статус очікування модерації)
+        self.object = create_topic(
+            author=self.request.user,
+            category=form.cleaned_data['category'],
+            title=form.cleaned_data['title'],
+            content=form.cleaned_data.get('content', ''),
+        )
 
         # Повідомлення для користувача
         from django.contrib import messages
@@ -161,13 +181,14 @@ class TopicCreateView(LoginRequiredMixin, CreateView):
             'Тему створено! Вона буде опублікована після перевірки модератором.'
         )
 
-        return response
+        return redirect(self.get_success_url())
 
 
-class PostCreateView(LoginRequiredMixin, CreateView):
+class PostCreateView(LoginRequiredMixin, RateLimitMixin, CreateView):
     model = Post
     form_class = PostCreateForm
     template_name = 'forum/post_create.html'
+    ratelimit_scope = 'post_create'
 
     def dispatch(self, request, *args, **kwargs):
         # Перевірка чи не заблокований користувач
@@ -185,7 +206,18 @@ class PostCreateView(LoginRequiredMixin, CreateView):
 
         form.instance.topic = topic
         form.instance.author = self.request.user
-        return super().form_valid(form)
+        # Повідомлення, лічильники автора та рейтинг теми - одна транзакція
+        with transaction.atomic():
+            response = super().form_valid(form)
+            Topic.objects.filter(pk=topic.pk).update(hot_score=bump_expression(POST_WEIGHT))
+
+            # Сповіщення підписникам розсилаються у фоні після коміту
+            enqueue_on_commit(
+                fanout_post_notifications,
+                {'post_id': self.object.pk},
+                key=f'fanout:{self.object.pk}'
+            )
+        return response
 
     def get_success_url(self):
         return self.object.topic.get_absolute_url()
@@ -210,10 +242,44 @@ class PostUpdateView(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
             return True
         return False
 
+    def form_valid(self, form):
+        # Блокування повідомлення, збереження та версія - одна транзакція
+        save_post_edit(self.object, form.cleaned_data['content'], self.request.user)
+        return redirect(self.get_success_url())
+
     def get_success_url(self):
         return self.object.topic.get_absolute_url()
 
 
+class PostHistoryView(LoginRequiredMixin, UserPassesTestMixin, DetailView):
+    """Історія редагувань повідомлення (для модераторів)"""
+    model = Post
+    template_name = 'forum/post_history.html'
+    context_object_name = 'post'
+
+    def test_func(self):
+        if not hasattr(self.request.user, 'profile'):
+            return False
+        return self.request.user.profile.has_permission('can_moderate_topics')
+
+    def get_queryset(self):
+        return Post.objects.select_related('topic', 'author')
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        history = get_revision_history(self.object)
+        versions = []
+        for index, (revision, content) in enumerate(history):
+            previous = history[index + 1][1] if index + 1 < len(history) else None
+            versions.append({
+                'revision': revision,
+                'content': content,
+                'diff': mark_safe(render_diff(previous, content)) if previous is not None else None,
+            })
+        context['versions'] = versions
+        return context
+
+
 class PostDeleteView(LoginRequiredMixin, UserPassesTestMixin, DeleteView):
     model = Post
     template_name = 'forum/post_delete.html'
@@ -227,32 +293,34 @@ class PostDeleteView(LoginRequiredMixin, UserPassesTestMixin, DeleteView):
             return True
         return False
 
+    def form_valid(self, form):
+        # М'яке видалення: рядок фізично видаляє purge_deleted
+        self.object.soft_delete()
+        return redirect(self.get_success_url())
+
     def get_success_url(self):
         return self.object.topic.get_absolute_url()
 
 
-class SearchView(ListView):
+class SearchView(RateLimitMixin, ListView):
     model = Topic
     template_name = 'forum/search.html'
     context_object_name = 'topics'
     paginate_by = 20
+    # Кількість результатів пошуку (DISTINCT з JOIN по повідомленнях) не рахується
+    paginator_class = NextPreviousPaginator
+    ratelimit_scope = 'search'
+
+    def should_rate_limit(self, request):
+        # Рахуємо тільки реальні пошукові запити
+        return bool(request.GET.get('q'))
 
     def get_queryset(self):
         query = self.request.GET.get('q', '')
         if query:
-            topics_qs = Topic.objects.filter(
+            return Topic.objects.visible_to(self.request.user).filter(
                 Q(title__icontains=query) | Q(posts__content__icontains=query)
             ).distinct().select_related('author', 'category')
-
-            # Фільтрація за статусом
-            user = self.request.user
-            if user.is_authenticated:
-                if hasattr(user, 'profile') and user.profile.has_permission('can_moderate_topics'):
-                    return topics_qs
-                else:
-                    return topics_qs.filter(Q(status=Topic.APPROVED) | Q(author=user))
-            else:
-                return topics_qs.filter(status=Topic.APPROVED)
         return Topic.objects.none()
 
     def get_context_data(self, **kwargs):
@@ -264,7 +332,7 @@ class SearchView(ListView):
 class TopicUpdateView(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
     """Редагування теми (тільки title та category)"""
     model = Topic
-    fields = ['title', 'category']
+    form_class = TopicUpdateForm
     template_name = 'forum/topic_update.html'
 
     def test_func(self):
@@ -314,6 +382,7 @@ class ModerationQueueView(LoginRequiredMixin, UserPassesTestMixin, ListView):
     template_name = 'forum/moderation_queue.html'
     context_object_name = 'topics'
     paginate_by = 20
+    paginator_class = EstimatedCountPaginator
 
     def test_func(self):
         # Тільки користувачі з правом can_moderate_topics
@@ -329,7 +398,8 @@ class ModerationQueueView(LoginRequiredMixin, UserPassesTestMixin, ListView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['pending_count'] = Topic.objects.filter(status=Topic.PENDING).count()
+        # Та сама кількість, що вже порахував пагінатор (понад поріг - оцінка, is_estimated)
+        context['pending_count'] = context['paginator'].count
         return context
 
 
@@ -350,12 +420,16 @@ class TopicApproveView(LoginRequiredMixin, UserPassesTestMixin, View):
         topic.moderation_comment = ''  # Очищаємо попередній коментар
         topic.save()
 
-        # Створюємо запис в історії модерації
-        ModerationAction.objects.create(
-            topic=topic,
-            moderator=request.user,
-            action=ModerationAction.APPROVE,
-            comment=''
+        # Запис в історії модерації створюється у фоні після коміту
+        enqueue_on_commit(
+            record_moderation_actions,
+            {
+                'topic_ids': [topic.pk],
+                'moderator_id': request.user.pk,
+                'action': ModerationAction.APPROVE,
+                'comment': '',
+            },
+            key=f'moderation:{topic.pk}:{topic.moderated_at.isoformat()}'
         )
 
         from django.contrib import messages
@@ -388,15 +462,77 @@ class TopicRejectView(LoginRequiredMixin, UserPassesTestMixin, View):
         topic.moderation_comment = comment
         topic.save()
 
-        # Створюємо запис в історії модерації
-        ModerationAction.objects.create(
-            topic=topic,
-            moderator=request.user,
-            action=ModerationAction.REJECT,
-            comment=comment
+        # Запис в історії модерації створюється у фоні після коміту
+        enqueue_on_commit(
+            record_moderation_actions,
+            {
+                'topic_ids': [topic.pk],
+                'moderator_id': request.user.pk,
+                'action': ModerationAction.REJECT,
+                'comment': comment,
+            },
+            key=f'moderation:{topic.pk}:{topic.moderated_at.isoformat()}'
         )
 
         from django.contrib import messages
         messages.success(request, f'Тему "{topic.title}" відхилено.')
 
         return redirect('forum:moderation_queue')
+
+
+class SubscriptionToggleView(LoginRequiredMixin, View):
+    """Підписка / відписка від теми або категорії"""
+    http_method_names = ['post']
+    target = None  # 'topic' або 'category'
+
+    def post(self, request, pk):
+        from django.contrib import messages
+        # Підписатися можна лише на тему, яку користувач бачить (не на чужу на модерації)
+        if self.target == 'topic':
+            obj = get_object_or_404(Topic.objects.visible_to(request.user), pk=pk)
+        else:
+            obj = get_object_or_404(Category, pk=pk)
+
+        deleted, _ = Subscription.objects.filter(user=request.user, **{self.target: obj}).delete()
+        if deleted:
+            messages.success(request, 'Ви відписалися від оновлень.')
+        else:
+            Subscription.objects.create(user=request.user, **{self.target: obj})
+            messages.success(request, 'Ви підписалися на оновлення.')
+
+        return redirect(obj.get_absolute_url())
+
+
+class CategoryMarkReadView(LoginRequiredMixin, View):
+    """Позначити всі теми категорії (та підкатегорій) прочитаними"""
+    http_method_names = ['post']
+
+    def post(self, request, pk):
+        from django.contrib import messages
+        category = get_object_or_404(Category, pk=pk)
+        mark_category_read(request.user, category)
+        messages.success(request, 'Всі теми категорії позначено прочитаними.')
+        return redirect(category.get_absolute_url())
+
+
+class NotificationListView(LoginRequiredMixin, ListView):
+    """Сповіщення поточного користувача"""
+    model = Notification
+    template_name = 'forum/notifications.html'
+    context_object_name = 'notifications'
+    paginate_by = 20
+    paginator_class = EstimatedCountPaginator
+
+    def get_queryset(self):
+        return Notification.objects.filter(
+            user=self.request.user
+        ).select_related('topic', 'last_post__author').order_by('is_read', '-updated_at')
+
+
+class NotificationReadAllView(LoginRequiredMixin, View):
+    """Позначити всі сповіщення прочитаними"""
+    http_method_names = ['post']
+
+    def post(self, request):
+        mark_read(request.user)
+        return redirect('forum:notifications')
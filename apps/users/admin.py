@@ -1,7 +1,10 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.contrib.auth.models import User
+from apps.core.taskqueue import enqueue_on_commit
+from apps.forum.tasks import delete_user_content_task
 from .models import Profile, Role
+from .services import assign_role
 
 
 @admin.register(Role)
@@ -29,6 +32,18 @@ class ProfileInline(admin.StackedInline):
 
 class UserAdmin(BaseUserAdmin):
     inlines = (ProfileInline,)
+    actions = ['delete_with_content']
+
+    @admin.action(description='Видалити з усім вмістом (у фоні, пакетами)', permissions=['delete'])
+    def delete_with_content(self, request, queryset):
+        # Каскад від User по всіх темах і повідомленнях користувача - одна довга транзакція
+        user_ids = list(queryset.exclude(pk=request.user.pk).values_list('pk', flat=True))
+        for user_id in user_ids:
+            enqueue_on_commit(
+                delete_user_content_task, {'user_id': user_id, 'delete_user': True},
+                key=f'delete-user-content:{user_id}',
+            )
+        self.message_user(request, f'{len(user_ids)} користувачів поставлено в чергу на видалення')
 
 
 admin.site.unregister(User)
@@ -46,24 +61,20 @@ class ProfileAdmin(admin.ModelAdmin):
 
     @admin.action(description='Призначити роль: Учасник')
     def assign_member_role(self, request, queryset):
-        member_role = Role.objects.get(name=Role.MEMBER)
-        count = queryset.update(role=member_role)
+        count = assign_role(queryset, Role.MEMBER)
         self.message_user(request, f'Роль "Учасник" призначена {count} профілям')
 
     @admin.action(description='Призначити роль: VIP')
     def assign_vip_role(self, request, queryset):
-        vip_role = Role.objects.get(name=Role.VIP)
-        count = queryset.update(role=vip_role)
+        count = assign_role(queryset, Role.VIP)
         self.message_user(request, f'Роль "VIP" призначена {count} профілям')
 
     @admin.action(description='Призначити роль: Модератор')
     def assign_moderator_role(self, request, queryset):
-        moderator_role = Role.objects.get(name=Role.MODERATOR)
-        count = queryset.update(role=moderator_role)
+        count = assign_role(queryset, Role.MODERATOR)
         self.message_user(request, f'Роль "Модератор" призначена {count} профілям')
 
     @admin.action(description='Заблокувати користувачів')
     def assign_banned_role(self, request, queryset):
-        banned_role = Role.objects.get(name=Role.BANNED)
-        count = queryset.update(role=banned_role)
+        count = assign_role(queryset, Role.BANNED)
         self.message_user(request, f'{count} користувачів заблоковано')
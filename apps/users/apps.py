@@ -8,3 +8,5 @@ class UsersConfig(AppConfig):
 
     def ready(self):
         import apps.users.models
+        # Скидання кешу користувачів для автентифікації
+        import apps.users.backends
@@ -0,0 +1,94 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.core.cache import TieredCache
+from .models import Profile, Role
+from .services import roles_changed
+
+UserModel = get_user_model()
+
+# Дані для request.user на кожен запит; скидаються при будь-якій зміні користувача,
+# профілю чи ролі (в інших процесах - через LOCAL_CACHE_TIMEOUT)
+auth_user_cache = TieredCache('users:auth', timeout=5 * 60)
+
+# Поля профілю, потрібні на кожній сторінці (роль, аватар). Лічильники активності
+# та bio не кешуються: вони змінюються через UPDATE без сигналів і читаються окремо
+PROFILE_AUTH_FIELDS = ('id', 'user_id', 'role_id', 'avatar', 'avatar_small', 'avatar_large',
+                       'location', 'website', 'joined_date')
+
+
+def load_auth_user(user_id):
+    """
+    Значення полів користувача (крім хешу пароля), профілю та роль для кешу.
+    Замість хешу пароля зберігається похідний хеш сесії (get_session_auth_hash).
+    """
+    user = UserModel._default_manager.select_related('profile__role').filter(pk=user_id).first()
+    if user is None:
+        return None
+    profile = getattr(user, 'profile', None)
+    return {
+        'user': {field.attname: getattr(user, field.attname)
+                 for field in UserModel._meta.concrete_fields if field.attname != 'password'},
+        'session_hash': user.get_session_auth_hash(),
+        'profile': {name: getattr(profile, name) for name in PROFILE_AUTH_FIELDS} if profile else None,
+        'role': profile.role if profile else None,
+    }
+
+
+def build_auth_user(data):
+    """
+    Користувач і профіль з кешованих значень. Решта полів відкладені (deferred):
+    читаються з БД при зверненні, а save() записує лише завантажені поля.
+    """
+    user = UserModel.from_db(DEFAULT_DB_ALIAS, list(data['user']), list(data['user'].values()))
+    session_hash = data['session_hash']
+    user.get_session_auth_hash = lambda: session_hash
+    if data['profile'] is not None:
+        profile = Profile.from_db(DEFAULT_DB_ALIAS, list(data['profile']), list(data['profile'].values()))
+        Profile.role.field.set_cached_value(profile, data['role'])
+        Profile.user.field.set_cached_value(profile, user)
+        UserModel.profile.related.set_cached_value(user, profile)
+    return user
+
+
+def invalidate_auth_users(user_ids):
+    auth_user_cache.delete_many(user_ids)
+
+
+class ProfileModelBackend(ModelBackend):
+    """
+    ModelBackend, що завантажує користувача разом з профілем і роллю одним запитом
+    і кешує значення полів: request.user.profile.has_permission(...) та is_banned()
+    не роблять окремих запитів.
+    """
+
+    def get_user(self, user_id):
+        data = auth_user_cache.get_or_set(user_id, lambda: load_auth_user(user_id))
+        if data is None:
+            return None
+        user = build_auth_user(data)
+        return user if self.user_can_authenticate(user) else None
+
+
+@receiver(post_save, sender=UserModel)
+@receiver(post_delete, sender=UserModel)
+def invalidate_cached_user(sender, instance, **kwargs):
+    invalidate_auth_users([instance.pk])
+
+
+@receiver(post_save, sender=Profile)
+def invalidate_cached_profile_user(sender, instance, **kwargs):
+    invalidate_auth_users([instance.user_id])
+
+
+@receiver(post_save, sender=Role)
+def invalidate_cached_role_users(sender, **kwargs):
+    auth_user_cache.invalidate()
+
+
+@receiver(roles_changed)
+def invalidate_role_change(sender, user_ids, **kwargs):
+    invalidate_auth_users(user_ids)
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from apps.core.taskqueue import enqueue
+from apps.users.models import Profile
+from apps.users.tasks import generate_avatar_thumbnails
+
+
+class Command(BaseCommand):
+    help = 'Ставить в чергу генерацію мініатюр для аватарів, у яких їх ще немає'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help='Перегенерувати мініатюри для всіх аватарів')
+
+    def handle(self, *args, **options):
+        profiles = Profile.objects.exclude(Q(avatar='') | Q(avatar__isnull=True))
+        if not options['all']:
+            profiles = profiles.filter(Q(avatar_small='') | Q(avatar_small__isnull=True))
+        count = 0
+        for pk, avatar_name in profiles.values_list('pk', 'avatar').iterator():
+            enqueue(generate_avatar_thumbnails, {'profile_id': pk, 'avatar_name': avatar_name},
+                    key=f'avatar-thumbnails:{avatar_name}')
+            count += 1
+        self.stdout.write(self.style.SUCCESS(f'Поставлено в чергу: {count}'))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from apps.users.stats import recount_profile_stats
+
+
+class Command(BaseCommand):
+    help = 'Перерахунок агрегатів профілів (кількість тем і повідомлень, активність)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        updated = recount_profile_stats(batch_size=options['batch_size'])
+        self.stdout.write(
+            self.style.SUCCESS(f'Оновлено профілів: {updated}')
+        )
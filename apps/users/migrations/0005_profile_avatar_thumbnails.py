@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0004_role_can_moderate_topics'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='avatar_large',
+            field=models.ImageField(blank=True, editable=False, null=True, upload_to='avatars/thumbs/', verbose_name='Аватар (великий)'),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='avatar_small',
+            field=models.ImageField(blank=True, editable=False, null=True, upload_to='avatars/thumbs/', verbose_name='Аватар (малий)'),
+        ),
+    ]
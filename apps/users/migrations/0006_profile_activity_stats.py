@@ -0,0 +1,69 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:34
+
+from django.db import migrations, models
+from django.db.models import Count, Max, Min, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Greatest, Least
+
+
+def fill_profile_stats(apps, schema_editor):
+    """
+    Початкове заповнення агрегатів (далі вони оновлюються інкрементно).
+    Історичні моделі замість apps.users.stats: міграція не залежить від поточного коду.
+    """
+    Profile = apps.get_model('users', 'Profile')
+    Post = apps.get_model('forum', 'Post')
+    Topic = apps.get_model('forum', 'Topic')
+    ArchivedPost = apps.get_model('forum', 'ArchivedPost')
+    # Історичні менеджери не приховують м'яко видалені записи
+    posts = Post.objects.filter(is_deleted=False)
+    topics = Topic.objects.filter(is_deleted=False)
+    archived = ArchivedPost.objects.all()
+
+    def aggregate(queryset, function):
+        return Subquery(
+            queryset.filter(author=OuterRef('user_id')).order_by().values('author')
+            .annotate(value=function).values('value')
+        )
+
+    def either(function, first, second):
+        # Least/Greatest у SQLite повертають NULL, якщо хоч один аргумент NULL
+        return function(Coalesce(first, second), Coalesce(second, first))
+
+    Profile.objects.update(
+        posts_count=Coalesce(aggregate(posts, Count('pk')), 0) + Coalesce(aggregate(archived, Count('pk')), 0),
+        topics_count=Coalesce(aggregate(topics, Count('pk')), 0),
+        first_post_at=either(Least, aggregate(posts, Min('created_at')), aggregate(archived, Min('created_at'))),
+        last_active_at=either(Greatest, aggregate(posts, Max('created_at')), aggregate(archived, Max('created_at'))),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forum', '0012_post_author_index'),
+        ('users', '0005_profile_avatar_thumbnails'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='first_post_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Перше повідомлення'),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='last_active_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Остання активність'),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='posts_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Кількість повідомлень'),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='topics_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Кількість тем'),
+        ),
+        migrations.RunPython(fill_profile_stats, migrations.RunPython.noop),
+    ]
@@ -50,11 +50,20 @@ class Profile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='profile', verbose_name="Користувач")
     role = models.ForeignKey(Role, on_delete=models.SET_NULL, null=True, blank=True, related_name='users', verbose_name="Роль")
     avatar = models.ImageField(upload_to='avatars/', blank=True, null=True, verbose_name="Аватар")
+    # Мініатюри генеруються фоновою задачею users.generate_avatar_thumbnails
+    avatar_small = models.ImageField(upload_to='avatars/thumbs/', blank=True, null=True, editable=False, verbose_name="Аватар (малий)")
+    avatar_large = models.ImageField(upload_to='avatars/thumbs/', blank=True, null=True, editable=False, verbose_name="Аватар (великий)")
     bio = CKEditor5Field(blank=True, verbose_name="Про себе", config_name='simple')
     location = models.CharField(max_length=100, blank=True, verbose_name="Місцезнаходження")
     website = models.URLField(blank=True, verbose_name="Веб-сайт")
     joined_date = models.DateTimeField(auto_now_add=True, verbose_name="Дата реєстрації")
 
+    # Агрегати активності, оновлюються інкрементно (див. apps.users.stats)
+    posts_count = models.PositiveIntegerField(default=0, verbose_name="Кількість повідомлень")
+    topics_count = models.PositiveIntegerField(default=0, verbose_name="Кількість тем")
+    first_post_at = models.DateTimeField(null=True, blank=True, verbose_name="Перше повідомлення")
+    last_active_at = models.DateTimeField(null=True, blank=True, verbose_name="Остання активність")
+
     class Meta:
         verbose_name = "Профіль"
         verbose_name_plural = "Профілі"
@@ -62,11 +71,22 @@ class Profile(models.Model):
     def __str__(self):
         return f"Профіль {self.user.username}"
 
+    @property
+    def avatar_small_url(self):
+        """URL малої мініатюри; поки її не згенеровано - оригінал"""
+        image = self.avatar_small or self.avatar
+        return image.url if image else ''
+
+    @property
+    def avatar_large_url(self):
+        image = self.avatar_large or self.avatar
+        return image.url if image else ''
+
     def get_posts_count(self):
-        return self.user.posts.count()
+        return self.posts_count
 
     def get_topics_count(self):
-        return self.user.topics.count()
+        return self.topics_count
 
     def has_permission(self, permission):
         """Перевірка наявності конкретного права"""
@@ -96,32 +116,40 @@ def create_user_profile(sender, instance, created, **kwargs):
 
 
 @receiver(post_save, sender=User)
-def save_user_profile(sender, instance, **kwargs):
-    instance.profile.save()
+def sync_user_staff_status_on_save(sender, instance, created, **kwargs):
+    """Збереження користувача (наприклад, в адмінці) не змінює is_staff всупереч ролі"""
+    if created:
+        # Профіль щойно створено в create_user_profile, його post_save уже синхронізував права
+        return
+    role = Role.objects.filter(users__user=instance).first()
+    sync_staff_status(instance, role)
 
 
 @receiver(post_save, sender=Profile)
 def update_user_staff_status(sender, instance, **kwargs):
+    sync_staff_status(instance.user, instance.role)
+
+
+def sync_staff_status(user, role):
     """
     Автоматично оновлює is_staff та is_superuser для користувачів
     в залежності від їх ролі
     """
     from django.contrib.auth.models import User as UserModel
 
-    user = instance.user
-    if instance.role:
+    if role:
         update_needed = False
         new_is_staff = user.is_staff
         new_is_superuser = user.is_superuser
 
         # Власник отримує superuser права
-        if instance.role.name == Role.OWNER:
+        if role.name == Role.OWNER:
             if not user.is_superuser or not user.is_staff:
                 new_is_superuser = True
                 new_is_staff = True
                 update_needed = True
         # Адміністратор отримує staff права
-        elif instance.role.name == Role.ADMINISTRATOR:
+        elif role.name == Role.ADMINISTRATOR:
             if not user.is_staff or user.is_superuser:
                 new_is_staff = True
                 new_is_superuser = False
@@ -0,0 +1,60 @@
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.dispatch import Signal
+
+from .models import Role
+
+# Надсилається після масової зміни ролей.
+# Аргументи: role - нова роль, user_ids - список id користувачів, яких це стосується.
+# Кеші прав доступу мають підписуватись на цей сигнал та скидати свої записи.
+roles_changed = Signal()
+
+
+def get_staff_flags_update(role):
+    """
+    Повертає (додатковий фільтр, значення) для User.objects.update(),
+    що відповідають правилам update_user_staff_status для ролі
+    """
+    # Власник отримує superuser права
+    if role.name == Role.OWNER:
+        return {}, {'is_staff': True, 'is_superuser': True}
+    # Адміністратор отримує staff права
+    if role.name == Role.ADMINISTRATOR:
+        return {}, {'is_staff': True, 'is_superuser': False}
+    # Інші ролі не мають доступу до admin (superuser без ролі власника не чіпаємо)
+    return {'is_superuser': False, 'is_staff': True}, {'is_staff': False}
+
+
+def assign_role(profiles, role):
+    """
+    Призначає роль усім профілям з queryset.
+
+    Виконує фіксовану кількість SQL-запитів незалежно від кількості профілів:
+    один UPDATE для auth_user (is_staff/is_superuser) та один UPDATE для профілів.
+    Сигнали post_save не викликаються, тому is_staff/is_superuser
+    перераховуються тут за тими ж правилами, що й update_user_staff_status.
+    Повертає кількість оновлених профілів.
+    """
+    if isinstance(role, str):
+        role = Role.objects.get(name=role)
+
+    user_ids = None
+    if roles_changed.has_listeners():
+        user_ids = list(profiles.values_list('user_id', flat=True))
+
+    extra_filter, flags = get_staff_flags_update(role)
+
+    with transaction.atomic():
+        # Спочатку оновлюємо користувачів: queryset профілів може фільтрувати
+        # за старою роллю і після зміни ролі вже не знайде ті самі рядки
+        User.objects.filter(
+            pk__in=profiles.values('user_id'), **extra_filter
+        ).update(**flags)
+        count = profiles.update(role=role)
+
+        if user_ids is not None:
+            transaction.on_commit(
+                lambda: roles_changed.send(sender=Role, role=role, user_ids=user_ids)
+            )
+
+    return count
@@ -0,0 +1,84 @@
+"""
+Агрегати профілю: кількість тем і повідомлень, перше повідомлення, остання активність.
+
+Лічильники оновлюються інкрементно (одним UPDATE при створенні/видаленні вмісту),
+а recount_profile_stats перераховує їх з нуля - після масових операцій
+і періодично командою recount_profile_stats для виправлення розбіжностей.
+"""
+from django.db.models import Count, F, Max, Min, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest, Least
+
+from .models import Profile
+
+
+def record_post(user_id, created_at):
+    Profile.objects.filter(user_id=user_id).update(
+        posts_count=F('posts_count') + 1,
+        first_post_at=Coalesce(F('first_post_at'), Value(created_at)),
+        last_active_at=Value(created_at),
+    )
+
+
+def record_topic(user_id, created_at):
+    Profile.objects.filter(user_id=user_id).update(
+        topics_count=F('topics_count') + 1,
+        last_active_at=Value(created_at),
+    )
+
+
+def record_post_removed(user_id):
+    Profile.objects.filter(user_id=user_id).update(posts_count=Greatest(F('posts_count') - 1, 0))
+
+
+def _count_subquery(queryset, field='author'):
+    return Coalesce(Subquery(
+        queryset.filter(**{field: OuterRef('user_id')}).order_by().values(field)
+        .annotate(total=Count('pk')).values('total')
+    ), 0)
+
+
+def _aggregate_subquery(queryset, aggregate):
+    return Subquery(
+        queryset.filter(author=OuterRef('user_id')).order_by().values('author')
+        .annotate(value=aggregate).values('value')
+    )
+
+
+def _either(function, first, second):
+    """Least/Greatest, що ігнорує NULL (у SQLite вони повертають NULL, якщо хоч один аргумент NULL)"""
+    return function(Coalesce(first, second), Coalesce(second, first))
+
+
+def recount_profile_stats(user_ids=None, batch_size=1000):
+    """
+    Перераховує агрегати профілів (усіх або user_ids) корельованими підзапитами,
+    пакетами по batch_size профілів. Повертає кількість оновлених профілів.
+    """
+    from apps.forum.models import ArchivedPost, Post, Topic
+
+    values = {
+        'posts_count': _count_subquery(Post.objects.all()) + _count_subquery(ArchivedPost.objects.all()),
+        'topics_count': _count_subquery(Topic.objects.all()),
+        'first_post_at': _either(
+            Least,
+            _aggregate_subquery(Post.objects.all(), Min('created_at')),
+            _aggregate_subquery(ArchivedPost.objects.all(), Min('created_at')),
+        ),
+        'last_active_at': _either(
+            Greatest,
+            _aggregate_subquery(Post.objects.all(), Max('created_at')),
+            _aggregate_subquery(ArchivedPost.objects.all(), Max('created_at')),
+        ),
+    }
+    profiles = Profile.objects.all()
+    if user_ids is not None:
+        return profiles.filter(user_id__in=user_ids).update(**values)
+
+    updated = 0
+    last_pk = 0
+    while True:
+        pks = list(profiles.filter(pk__gt=last_pk).order_by('pk').values_list('pk', flat=True)[:batch_size])
+        if not pks:
+            return updated
+        updated += Profile.objects.filter(pk__in=pks).update(**values)
+        last_pk = pks[-1]
@@ -0,0 +1,31 @@
+from apps.core.images import get_extension, get_thumbnail_format, hashed_name, make_square_thumbnail, save_bytes
+from apps.core.taskqueue import task
+from .backends import invalidate_auth_users
+from .models import Profile
+
+AVATAR_THUMBNAIL_DIR = 'avatars/thumbs'
+# Поле профілю -> розмір сторони (2x від розміру на сторінці)
+AVATAR_THUMBNAIL_SIZES = {'avatar_small': 100, 'avatar_large': 300}
+
+
+@task('users.generate_avatar_thumbnails')
+def generate_avatar_thumbnails(profile_id, avatar_name):
+    """Генерує мініатюри аватара (повторний запуск нічого не змінює)"""
+    profile = Profile.objects.filter(pk=profile_id).only('avatar', 'user_id').first()
+    # Аватар могли змінити ще раз, поки задача чекала в черзі
+    if profile is None or profile.avatar.name != avatar_name:
+        return
+
+    storage = profile.avatar.storage
+    image_format = get_thumbnail_format()
+    extension = get_extension(image_format)
+    names = {}
+    with storage.open(avatar_name, 'rb') as source:
+        for field, size in AVATAR_THUMBNAIL_SIZES.items():
+            data = make_square_thumbnail(source, size, image_format)
+            names[field] = save_bytes(
+                storage, hashed_name(AVATAR_THUMBNAIL_DIR, data, extension, suffix=f'-{size}'), data
+            )
+
+    if Profile.objects.filter(pk=profile_id, avatar=avatar_name).update(**names):
+        invalidate_auth_users([profile.user_id])
@@ -9,6 +9,8 @@ urlpatterns = [
     path('logout/', views.UserLogoutView.as_view(), name='logout'),
     path('profile/edit/', views.ProfileUpdateView.as_view(), name='profile_update'),
     path('profile/<str:username>/toggle-ban/', views.ToggleBanView.as_view(), name='toggle_ban'),
+    path('profile/<str:username>/ban-purge/', views.BanAndPurgeView.as_view(), name='ban_purge'),
+    path('profile/<str:username>/activity/', views.ProfileActivityView.as_view(), name='activity'),
     path('profile/<str:username>/', views.ProfileView.as_view(), name='profile'),
 ]
 
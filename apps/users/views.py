@@ -5,16 +5,37 @@ from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.auth.models import User
 from django.contrib.messages.views import SuccessMessageMixin
 from django.contrib import messages
+from django.db.models import Count, Q
 from django.urls import reverse_lazy
+from apps.core.ratelimit import RateLimitMixin
+from apps.core.taskqueue import enqueue_on_commit
+from apps.forum.models import Topic
+from apps.forum.moderation import ban_and_purge
 from .forms import UserRegisterForm, UserLoginForm, ProfileUpdateForm, UserUpdateForm
 from .models import Profile, Role
+from .services import assign_role
+from .tasks import generate_avatar_thumbnails
 
+ACTIVITY_PAGE_SIZE = 10
 
-class RegisterView(SuccessMessageMixin, CreateView):
+
+def get_activity_posts(user, viewer):
+    """
+    Повідомлення user, новіші першими, лише в темах, які бачить viewer
+    (без тем на модерації, відхилених та видалених, зокрема прихованих ban_and_purge)
+    """
+    return (
+        user.posts.filter(topic__in=Topic.objects.visible_to(viewer))
+        .select_related('topic').order_by('-id')
+    )
+
+
+class RegisterView(SuccessMessageMixin, RateLimitMixin, CreateView):
     form_class = UserRegisterForm
     template_name = 'users/register.html'
     success_url = reverse_lazy('users:login')
     success_message = "Ваш акаунт успішно створено! Тепер ви можете увійти."
+    ratelimit_scope = 'register'
 
     def dispatch(self, request, *args, **kwargs):
         if request.user.is_authenticated:
@@ -47,11 +68,48 @@ class ProfileView(DetailView):
     slug_field = 'username'
     slug_url_kwarg = 'username'
 
+    def get_queryset(self):
+        return User.objects.select_related('profile__role')
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        user = self.get_object()
-        context['topics'] = user.topics.select_related('category').prefetch_related('posts')[:10]
-        context['posts'] = user.posts.select_related('topic')[:10]
+        user = self.object
+        # Лічильники беруться з агрегатів профілю, списки - обмежені вибірки по індексах автора
+        context['topics'] = (
+            Topic.objects.filter(author=user).visible_to(self.request.user)
+            .select_related('category')
+            .annotate(posts_total=Count('posts', filter=Q(posts__is_deleted=False)))
+            .order_by('-created_at')[:10]
+        )
+        posts = list(get_activity_posts(user, self.request.user)[:ACTIVITY_PAGE_SIZE + 1])
+        context['posts'] = posts[:ACTIVITY_PAGE_SIZE]
+        context['next_cursor'] = posts[ACTIVITY_PAGE_SIZE - 1].pk if len(posts) > ACTIVITY_PAGE_SIZE else None
+        return context
+
+
+class ProfileActivityView(DetailView):
+    """
+    Стрічка повідомлень користувача з пагінацією по курсору (?before=<id>),
+    тому вартість сторінки не залежить від загальної кількості повідомлень
+    """
+    model = User
+    template_name = 'users/activity.html'
+    context_object_name = 'profile_user'
+    slug_field = 'username'
+    slug_url_kwarg = 'username'
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        posts = get_activity_posts(self.object, self.request.user)
+        try:
+            before = int(self.request.GET.get('before', ''))
+        except ValueError:
+            before = None
+        if before:
+            posts = posts.filter(pk__lt=before)
+        posts = list(posts[:ACTIVITY_PAGE_SIZE + 1])
+        context['posts'] = posts[:ACTIVITY_PAGE_SIZE]
+        context['next_cursor'] = posts[ACTIVITY_PAGE_SIZE - 1].pk if len(posts) > ACTIVITY_PAGE_SIZE else None
         return context
 
 
@@ -62,7 +120,8 @@ class ProfileUpdateView(LoginRequiredMixin, SuccessMessageMixin, UpdateView):
     success_message = "Ваш профіль успішно оновлено!"
 
     def get_object(self):
-        return self.request.user.profile
+        # Свіжий профіль з БД: request.user.profile зібраний з кешу і містить не всі поля
+        return Profile.objects.get(user=self.request.user)
 
     def get_success_url(self):
         return reverse_lazy('users:profile', kwargs={'username': self.request.user.username})
@@ -81,7 +140,24 @@ class ProfileUpdateView(LoginRequiredMixin, SuccessMessageMixin, UpdateView):
 
         if user_form.is_valid():
             user_form.save()
-            return super().form_valid(form)
+            # Зберігаються лише поля форми: лічильники активності профілю оновлюються
+            # окремими UPDATE і не мають перезаписуватись значеннями зі сторінки редагування
+            self.object = form.save(commit=False)
+            update_fields = list(form.fields)
+            if 'avatar' in form.changed_data:
+                # Старі мініатюри більше не відповідають аватару; нові згенеруються у фоні
+                self.object.avatar_small = None
+                self.object.avatar_large = None
+                update_fields += ['avatar_small', 'avatar_large']
+            self.object.save(update_fields=update_fields)
+            if 'avatar' in form.changed_data and self.object.avatar:
+                enqueue_on_commit(
+                    generate_avatar_thumbnails,
+                    {'profile_id': self.object.pk, 'avatar_name': self.object.avatar.name},
+                    key=f'avatar-thumbnails:{self.object.avatar.name}',
+                )
+            messages.success(self.request, self.get_success_message(form.cleaned_data))
+            return redirect(self.get_success_url())
         else:
             return self.form_invalid(form)
 
@@ -113,17 +189,43 @@ class ToggleBanView(LoginRequiredMixin, View):
             return redirect('users:profile', username=username)
 
         # Перемикаємо стан блокування
+        target_profiles = Profile.objects.filter(user=target_user)
         if target_user.profile.is_banned():
             # Розблокувати - призначити роль "Користувач"
-            member_role = Role.objects.filter(name=Role.MEMBER).first()
-            target_user.profile.role = member_role
-            target_user.profile.save()
+            assign_role(target_profiles, Role.MEMBER)
             messages.success(request, f"Користувача {username} успішно розблоковано.")
         else:
             # Заблокувати - призначити роль "Заблокований"
-            banned_role = Role.objects.filter(name=Role.BANNED).first()
-            target_user.profile.role = banned_role
-            target_user.profile.save()
+            assign_role(target_profiles, Role.BANNED)
             messages.success(request, f"Користувача {username} успішно заблоковано.")
 
         return redirect('users:profile', username=username)
+
+
+class BanAndPurgeView(LoginRequiredMixin, View):
+    """
+    Блокування користувача з приховуванням усіх його тем і повідомлень.
+    Доступно користувачам з правами can_ban_users та can_delete_any_post
+    """
+    http_method_names = ['post']
+
+    def post(self, request, username):
+        profile = request.user.profile
+        if not (profile.has_permission('can_ban_users') and profile.has_permission('can_delete_any_post')):
+            messages.error(request, "У вас немає прав для цієї дії.")
+            return redirect('forum:home')
+
+        target_user = get_object_or_404(User.objects.select_related('profile__role'), username=username)
+        if target_user == request.user:
+            messages.error(request, "Ви не можете заблокувати самого себе.")
+            return redirect('users:profile', username=username)
+        if target_user.profile.role and target_user.profile.role.level >= profile.role.level:
+            messages.error(request, "Ви не можете заблокувати користувача з такою ж або вищою роллю.")
+            return redirect('users:profile', username=username)
+
+        topics, posts = ban_and_purge(target_user, request.user)
+        messages.success(
+            request,
+            f"Користувача {username} заблоковано. Приховано тем: {topics}, повідомлень: {posts}."
+        )
+        return redirect('users:profile', username=username)
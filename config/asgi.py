@@ -14,3 +14,10 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
 application = get_asgi_application()
+
+# Прогрів до першого запиту (під gunicorn з preload_app - один раз у майстер-процесі)
+from django.conf import settings  # noqa: E402
+
+if settings.WARMUP_ON_STARTUP:
+    from apps.core.warmup import warm_up  # noqa: E402
+    warm_up()
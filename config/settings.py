@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/6.0/ref/settings/
 """
 
 from pathlib import Path
+from urllib.parse import urlsplit
 from environs import Env
 
 # Initialize environment variables
@@ -45,16 +46,23 @@ INSTALLED_APPS = [
 
     'django_ckeditor_5',
 
+    'apps.core',
     'apps.forum',
     'apps.users',
 ]
 
 MIDDLEWARE = [
+    # /healthz, /readyz та /metrics - до сесій, автентифікації та перевірки ALLOWED_HOSTS
+    'apps.core.monitoring.HealthCheckMiddleware',
+    'apps.core.monitoring.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'apps.core.staticfiles.StaticFilesMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    # Підключається лише при PROFILING_ENABLED=True
+    'apps.core.profiling.ProfilingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -72,6 +80,7 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'apps.forum.context_processors.notifications',
             ],
         },
     },
@@ -86,6 +95,54 @@ WSGI_APPLICATION = 'config.wsgi.application'
 DATABASES = {
     'default': env.dj_db_url("DATABASE_URL")
 }
+# Транзакція на кожен запит. Вимкнено: операції запису самі групують свої запити
+# в transaction.atomic (див. apps.forum.posting), а читання не тримають транзакцій
+DATABASES['default']['ATOMIC_REQUESTS'] = env.bool('ATOMIC_REQUESTS', False)
+
+
+# Cache
+# CACHE_URL: redis://host:6379/0, memcached://host:11211, file:///var/tmp/forum-cache, locmem://
+# Спільний кеш потрібен при кількох процесах (сесії cached_db, лічильники rate limiting).
+# Перед ним - локальний LRU кожного процесу (apps.core.cache).
+CACHE_BACKENDS = {
+    'redis': 'django.core.cache.backends.redis.RedisCache',
+    'rediss': 'django.core.cache.backends.redis.RedisCache',
+    'memcached': 'django.core.cache.backends.memcached.PyMemcacheCache',
+    'file': 'django.core.cache.backends.filebased.FileBasedCache',
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+}
+
+
+def cache_from_url(url):
+    parts = urlsplit(url)
+    if parts.scheme not in CACHE_BACKENDS:
+        raise ValueError(f'Unsupported CACHE_URL scheme: {parts.scheme}')
+    if parts.scheme in ('redis', 'rediss'):
+        location = url
+    elif parts.scheme == 'file':
+        location = parts.path
+    else:
+        location = parts.netloc
+    config = {
+        'BACKEND': CACHE_BACKENDS[parts.scheme],
+        'LOCATION': location,
+        'KEY_PREFIX': env.str('CACHE_KEY_PREFIX', 'djangoforum'),
+    }
+    if parts.scheme in ('file', 'locmem'):
+        config['OPTIONS'] = {'MAX_ENTRIES': env.int('CACHE_MAX_ENTRIES', 10000)}
+    return config
+
+
+CACHES = {
+    'default': cache_from_url(env.str('CACHE_URL', 'locmem://')),
+}
+
+# Локальний рівень: кількість записів LRU і час життя запису (секунди)
+LOCAL_CACHE_MAX_ENTRIES = env.int('LOCAL_CACHE_MAX_ENTRIES', 1000)
+LOCAL_CACHE_TIMEOUT = env.int('LOCAL_CACHE_TIMEOUT', 5)
+
+# Пагінація: понад стільки результатів кількість сторінок оцінюється (PostgreSQL), а не рахується
+PAGINATION_EXACT_COUNT_LIMIT = env.int('PAGINATION_EXACT_COUNT_LIMIT', 1000)
 
 
 # Password validation
@@ -126,6 +183,20 @@ STATIC_URL = 'static/'
 STATICFILES_DIRS = [BASE_DIR / 'static']
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 
+# collectstatic додає хеш вмісту до імен файлів і записує стиснені копії .gz/.br
+# (brotli - якщо встановлено пакет brotli)
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'apps.core.staticfiles.CompressedManifestStaticFilesStorage',
+    },
+}
+
+# Роздача статики самим застосунком (розгортання в одному контейнері без nginx)
+SERVE_STATIC = env.bool('SERVE_STATIC', False)
+
 MEDIA_URL = 'media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
@@ -137,8 +208,115 @@ LOGIN_REDIRECT_URL = 'forum:home'
 LOGOUT_REDIRECT_URL = 'forum:home'
 LOGIN_URL = 'users:login'
 
+# Користувач завантажується разом з профілем і роллю одним запитом.
+# ModelBackend залишено для сесій, створених до його заміни (інакше їх буде розлогінено).
+AUTHENTICATION_BACKENDS = [
+    'apps.users.backends.ProfileModelBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
+
+# Сесії: cached_db (кеш + запис у БД) або signed_cookies (без таблиці django_session).
+# Для cached_db з кількома процесами кеш має бути спільним (див. CACHES).
+# Прострочені сесії видаляє `manage.py clearsessions` (cron).
+SESSION_ENGINE = 'django.contrib.sessions.backends.' + env.str('SESSION_BACKEND', 'cached_db')
+# Повідомлення (messages) лише в cookie: анонімні запити не створюють сесій
+MESSAGE_STORAGE = 'django.contrib.messages.storage.cookie.CookieStorage'
+
+# Rate limiting (apps.core.ratelimit)
+# Ліміти за роллю (Role.name), 'default' - інші авторизовані, 'anonymous' - анонімні.
+# None - без обмежень.
+RATE_LIMIT_TRUST_X_FORWARDED_FOR = env.bool('RATE_LIMIT_TRUST_X_FORWARDED_FOR', False)
+
+RATE_LIMITS = {
+    'post_create': {
+        'default': '6/m',
+        'vip': '20/m',
+        'moderator': None,
+        'administrator': None,
+        'owner': None,
+    },
+    'topic_create': {
+        'default': '3/10m',
+        'vip': '10/10m',
+        'moderator': None,
+        'administrator': None,
+        'owner': None,
+    },
+    'register': {
+        'anonymous': '5/h',
+    },
+    'search': {
+        'anonymous': '10/m',
+        'default': '30/m',
+        'vip': '60/m',
+        'moderator': None,
+        'administrator': None,
+        'owner': None,
+    },
+    'api': {
+        'anonymous': '60/m',
+        'default': '120/m',
+        'moderator': None,
+        'administrator': None,
+        'owner': None,
+    },
+}
+
+# Фонові задачі (apps.core.taskqueue)
+# 'thread' - пул потоків у процесі, 'database' - черга в БД + `manage.py run_worker`,
+# 'immediate' - синхронне виконання
+TASK_QUEUE_BACKEND = env.str('TASK_QUEUE_BACKEND', 'thread')
+TASK_QUEUE_THREADS = env.int('TASK_QUEUE_THREADS', 4)
+
+# Позначки "нове": повідомлення, старші за цю кількість днів, вважаються прочитаними
+READ_TRACKING_DAYS = env.int('READ_TRACKING_DAYS', 30)
+
+# Історія редагувань: кожна N-та версія повідомлення зберігається повністю, решта - дельтами
+POST_REVISION_SNAPSHOT_EVERY = env.int('POST_REVISION_SNAPSHOT_EVERY', 10)
+
+# М'яко видалені теми й повідомлення фізично видаляються `manage.py purge_deleted` через N днів;
+# закриті теми без активності переносяться в архів `manage.py archive_topics`
+PURGE_DELETED_AFTER_DAYS = env.int('PURGE_DELETED_AFTER_DAYS', 30)
+ARCHIVE_TOPICS_AFTER_DAYS = env.int('ARCHIVE_TOPICS_AFTER_DAYS', 365)
+
+# Гарячі теми: вага події зменшується вдвічі за HOT_SCORE_HALF_LIFE_HOURS;
+# `manage.py refresh_hot_scores` перераховує рейтинг тем з активністю за HOT_SCORE_REFRESH_DAYS
+HOT_SCORE_HALF_LIFE_HOURS = env.int('HOT_SCORE_HALF_LIFE_HOURS', 24)
+HOT_SCORE_REFRESH_DAYS = env.int('HOT_SCORE_REFRESH_DAYS', 7)
+
+# Профілювання запитів (apps.core.profiling): персонал з ?profile=1 та частка
+# PROFILING_SAMPLE_RATE (0..1) усіх запитів; режим cprofile або sampling (інтервал у мс).
+# Для кожного представлення зберігаються останні PROFILING_KEEP профілів (0 - без обмеження)
+PROFILING_ENABLED = env.bool('PROFILING_ENABLED', False)
+PROFILING_MODE = env.str('PROFILING_MODE', 'sampling')
+PROFILING_SAMPLE_RATE = env.float('PROFILING_SAMPLE_RATE', 0.0)
+PROFILING_SAMPLE_INTERVAL = env.int('PROFILING_SAMPLE_INTERVAL', 5)
+PROFILING_DIR = env.str('PROFILING_DIR', str(BASE_DIR / 'profiles'))
+PROFILING_KEEP = env.int('PROFILING_KEEP', 200)
+
+# Метрики Prometheus на /metrics (apps.core.monitoring). METRICS_DIR - спільний каталог для
+# знімків метрик воркерів (кілька процесів gunicorn); без нього /metrics показує лише свій процес.
+# METRICS_TOKEN - /metrics вимагає "Authorization: Bearer <token>"; поза DEBUG без токена
+# ендпоінт закритий (403). За замовчуванням метрики вимкнені.
+METRICS_ENABLED = env.bool('METRICS_ENABLED', False)
+METRICS_DIR = env.str('METRICS_DIR', '')
+METRICS_FLUSH_INTERVAL = env.int('METRICS_FLUSH_INTERVAL', 5)
+METRICS_TOKEN = env.str('METRICS_TOKEN', '')
+
+# Прогрів процесу в config/wsgi.py та config/asgi.py (apps.core.warmup): URLconf, шаблони
+# та модулі, які інакше імпортувались би на перших запитах воркера
+WARMUP_ON_STARTUP = env.bool('WARMUP_ON_STARTUP', not DEBUG)
+WARMUP_IMPORTS = [
+    'PIL.Image',
+    'PIL.ImageOps',
+    'django_ckeditor_5.widgets',
+]
+
 # CKEditor 5 settings
 CKEDITOR_5_UPLOAD_PATH = "uploads/"
+# Завантаження з редактора: імена за хешем вмісту + фонове зменшення великих зображень
+CKEDITOR_5_FILE_STORAGE = 'apps.core.storage.UploadImageStorage'
+UPLOAD_IMAGE_MAX_SIZE = env.int('UPLOAD_IMAGE_MAX_SIZE', 1600)
 
 customColorPalette = [
     {'color': 'hsl(4, 90%, 58%)', 'label': 'Red'},
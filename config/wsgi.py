@@ -15,4 +15,11 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
 application = get_wsgi_application()
 
+# Прогрів до першого запиту (під gunicorn з preload_app - один раз у майстер-процесі)
+from django.conf import settings  # noqa: E402
+
+if settings.WARMUP_ON_STARTUP:
+    from apps.core.warmup import warm_up  # noqa: E402
+    warm_up()
+
 app = application
@@ -22,8 +22,9 @@ echo -e "${GREEN}✅ Application synchronized${NC}"
 echo ""
 
 # Step 1: Collect static files
+# Імена з хешем вмісту (staticfiles.json) + стиснені копії .gz/.br поряд з файлами
 echo -e "${BLUE}📦 Step 1/3: Collecting static files...${NC}"
-python manage.py collectstatic --noinput
+python manage.py collectstatic --noinput --clear
 echo -e "${GREEN}✅ Static files collected${NC}"
 echo ""
 
@@ -0,0 +1,42 @@
+"""
+Конфігурація gunicorn (підхоплюється автоматично з робочого каталогу):
+
+    gunicorn config.wsgi:application
+
+Застосунок завантажується та прогрівається (apps.core.warmup) один раз у майстер-процесі
+(preload_app), воркери створюються через fork уже з імпортованими модулями, URLconf
+та скомпільованими шаблонами - новий воркер починає обслуговувати запити одразу,
+а спільна пам'ять не копіюється, доки її не змінюють (copy-on-write).
+"""
+import gc
+import multiprocessing
+import os
+from pathlib import Path
+
+bind = os.environ.get('GUNICORN_BIND', f"0.0.0.0:{os.environ.get('PORT', '8000')}")
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.environ.get('GUNICORN_THREADS', '1'))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', '30'))
+# Перезапуск воркерів після N запитів (з розкидом), щоб обмежити ріст пам'яті
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', '1000'))
+max_requests_jitter = max_requests // 10
+
+preload_app = True
+os.environ.setdefault('WARMUP_ON_STARTUP', 'True')
+
+
+def on_starting(server):
+    # Знімки метрик попереднього запуску (apps.core.metrics): лише <pid>.json, archive.json
+    # та .lock - решту вмісту каталогу (він може бути спільним) не чіпаємо
+    metrics_dir = os.environ.get('METRICS_DIR')
+    if not metrics_dir or not os.path.isdir(metrics_dir):
+        return
+    for path in Path(metrics_dir).iterdir():
+        if (path.suffix == '.json' and path.stem.isdigit()) or path.name in ('archive.json', '.lock'):
+            path.unlink(missing_ok=True)
+
+
+def when_ready(server):
+    # Об'єкти, створені при завантаженні, більше не обходить збирач сміття:
+    # інакше він торкається їх у воркерах і сторінки пам'яті копіюються
+    gc.freeze()